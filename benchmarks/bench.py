@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+
+from statistics import median
+from tempfile import TemporaryDirectory
+from threading import Thread
+from time import monotonic, sleep
+
+# ---------------------------------------------------------------------------------------------------------------------
+# j2sc benchmark suite
+#
+# Runs j2sc against mockjackdbus.py on a private dbus-daemon (so nothing touches the user session or a real JACK),
+# and reports wall time plus the number of jackdbus calls for each scenario. Qt runs on the offscreen platform.
+#
+# Usage: python3 benchmarks/bench.py [--latency MS] [--repeat N] [--idle-seconds S] [--json FILE] [scenario ...]
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR   = os.path.join(os.path.dirname(BENCH_DIR), "src")
+
+BUS_CONFIG = """<!DOCTYPE busconfig PUBLIC "-//freedesktop//DTD D-Bus Bus Configuration 1.0//EN"
+ "http://www.freedesktop.org/standards/dbus/1.0/busconfig.dtd">
+<busconfig>
+  <type>session</type>
+  <listen>unix:dir=%s</listen>
+  <policy context="default">
+    <allow send_destination="*" eavesdrop="true"/>
+    <allow eavesdrop="true"/>
+    <allow own="*"/>
+  </policy>
+</busconfig>
+"""
+
+STARTUP_TIMEOUT = 30.0
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Environment: private bus, mock jackdbus and throwaway config/data dirs
+
+class BenchEnvironment(object):
+    def __init__(self, latency):
+        self.fTempDir = TemporaryDirectory(prefix="j2sc-bench-")
+        self.fDaemon  = None
+        self.fMock    = None
+
+        tmpPath   = self.fTempDir.name
+        configDir = os.path.join(tmpPath, "config")
+        dataDir   = os.path.join(tmpPath, "data")
+        os.mkdir(configDir)
+        os.mkdir(dataDir)
+
+        busConfig = os.path.join(tmpPath, "bus.conf")
+        with open(busConfig, "w") as fd:
+            fd.write(BUS_CONFIG % tmpPath)
+
+        self.fDaemon = subprocess.Popen(["dbus-daemon", "--nofork", "--print-address=1", "--config-file=" + busConfig],
+                                        stdout=subprocess.PIPE, text=True)
+        address = self.fDaemon.stdout.readline().strip()
+
+        if not address:
+            raise RuntimeError("dbus-daemon did not start")
+
+        os.environ["DBUS_SESSION_BUS_ADDRESS"] = address
+        os.environ["XDG_CONFIG_HOME"] = configDir
+        os.environ["XDG_DATA_HOME"] = dataDir
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+        self.fMock = subprocess.Popen([sys.executable, os.path.join(BENCH_DIR, "mockjackdbus.py"), "--latency", str(latency)])
+
+        import dbus
+        self.fBus = dbus.SessionBus()
+
+        startTime = monotonic()
+        while not self.fBus.name_has_owner("org.jackaudio.service"):
+            if monotonic() - startTime > STARTUP_TIMEOUT or self.fMock.poll() is not None:
+                raise RuntimeError("mock jackdbus did not start")
+            sleep(0.01)
+
+        self.fBench   = dbus.Interface(self.fBus.get_object("org.jackaudio.service", "/org/jackaudio/Controller"), "org.j2sc.Benchmark")
+        self.fControl = dbus.Interface(self.fBus.get_object("org.jackaudio.service", "/org/jackaudio/Controller"), "org.jackaudio.JackControl")
+
+    def getTempPath(self):
+        return self.fTempDir.name
+
+    def getBus(self):
+        return self.fBus
+
+    def resetCallCounts(self):
+        self.fBench.ResetCallCounts()
+
+    def getCallCounts(self):
+        return dict((str(method), int(count)) for method, count in self.fBench.GetCallCounts().items())
+
+    def setJackStarted(self, started):
+        if bool(self.fControl.IsStarted()) != started:
+            if started:
+                self.fControl.StartServer()
+            else:
+                self.fControl.StopServer()
+
+    def close(self):
+        for proc in (self.fMock, self.fDaemon):
+            if proc is not None and proc.poll() is None:
+                proc.terminate()
+                proc.wait()
+
+        self.fTempDir.cleanup()
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Measurement of a single scenario run
+
+class ScenarioRun(object):
+    def __init__(self, env):
+        self.fEnv      = env
+        self.fStart    = 0.0
+        self.wallTime  = 0.0
+        self.callCount = {}
+        self.extra     = {}
+
+    def __enter__(self):
+        self.fEnv.resetCallCounts()
+        self.fStart = monotonic()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.wallTime  = monotonic() - self.fStart
+        self.callCount = self.fEnv.getCallCounts()
+        return False
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Helpers for running j2sc.py as a separate process
+
+# debug mode prints the startup timings, DBus tracing stays off so it does not add to them
+def startMainWindow(args=()):
+    env = dict(os.environ)
+    env["PYTHONUNBUFFERED"] = "1"
+    return subprocess.Popen([sys.executable, os.path.join(SRC_DIR, "j2sc.py"), "--debug", "--no-dbus-trace"] + list(args),
+                            cwd=SRC_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+
+# returns (time until line was seen, the line)
+def waitForLine(proc, prefix, startTime):
+    for line in proc.stdout:
+        if line.startswith(prefix):
+            return (monotonic() - startTime, line.strip())
+
+    raise RuntimeError("j2sc exited before printing '%s'" % prefix)
+
+# keep reading the output in the background, so a full pipe never blocks j2sc
+def drainOutput(proc):
+    Thread(target=proc.stdout.read, daemon=True).start()
+
+def stopMainWindow(proc):
+    proc.send_signal(signal.SIGTERM)
+
+    try:
+        proc.wait(5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+def getProcessTimes(pid):
+    with open("/proc/%i/stat" % pid) as fd:
+        fields = fd.read().rsplit(")", 1)[1].split()
+
+    cpuTime = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    switches = 0
+
+    for task in os.listdir("/proc/%i/task" % pid):
+        try:
+            with open("/proc/%i/task/%s/status" % (pid, task)) as fd:
+                for line in fd:
+                    if line.startswith(("voluntary_ctxt_switches", "nonvoluntary_ctxt_switches")):
+                        switches += int(line.split()[1])
+        except OSError:
+            pass
+
+    return (cpuTime, switches)
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Scenarios
+
+def scenarioStartup(env, args):
+    env.setJackStarted(False)
+
+    with ScenarioRun(env) as run:
+        startTime = monotonic()
+        proc = startMainWindow()
+        firstPaint, line = waitForLine(proc, "Startup: first paint", startTime)
+        dbusReady, line = waitForLine(proc, "Startup: DBus set up", startTime)
+        jackReady, line = waitForLine(proc, "Startup: jackdbus answered", startTime)
+        drainOutput(proc)
+
+        # let the async replies come in, so they are counted
+        sleep(0.5)
+        stopMainWindow(proc)
+
+    run.wallTime = firstPaint
+    run.extra["dbusReadyMs"] = dbusReady * 1000
+    run.extra["jackReadyMs"] = jackReady * 1000
+    return run
+
+def scenarioSettingsOpen(env, args):
+    import jackcontrol
+    import settings
+
+    with ScenarioRun(env) as run:
+        # cold cache, as after connecting to jackdbus
+        jackcontrol.initBus(env.getBus())
+        dialog = settings.JackSettingsW(None)
+
+    dialog.close()
+    dialog.deleteLater()
+    return run
+
+def scenarioDriverSwitch(env, args):
+    import jackcontrol
+    import settings
+
+    jackcontrol.initBus(env.getBus())
+    dialog = settings.JackSettingsW(None)
+    table  = dialog.ui.obj_server_driver
+    rows   = dict((table.item(i, 0).text().lower(), i) for i in range(table.rowCount()))
+
+    with ScenarioRun(env) as run:
+        table.setCurrentCell(rows["dummy"], 0)
+        table.setCurrentCell(rows["alsa"], 0)
+
+    dialog.close()
+    dialog.deleteLater()
+    return run
+
+def scenarioSettingsSave(env, args):
+    import jackcontrol
+    import settings
+
+    jackcontrol.initBus(env.getBus())
+    dialog = settings.JackSettingsW(None)
+    dialog.ui.obj_server_realtime.toggle()
+    dialog.ui.obj_driver_nperiods.setValue(dialog.ui.obj_driver_nperiods.value() + 1)
+
+    with ScenarioRun(env) as run:
+        dialog.slot_saveJackSettings()
+
+    dialog.close()
+    dialog.deleteLater()
+    return run
+
+# j2sc's main window, in this process, with its own connection on the Qt main loop as when running j2sc.
+# Only connects to jackdbus, the stats store and sampler thread of slot_deferredInit() would add calls of their own.
+gMainWindow = None
+
+def getMainWindow():
+    global gMainWindow
+
+    if gMainWindow is not None:
+        return gMainWindow
+
+    import dbus.bus
+    import j2sc
+
+    from PyQt6.QtWidgets import QApplication
+
+    j2sc.gDBus.loop = j2sc.DBusMainLoop()
+    j2sc.gDBus.bus  = dbus.bus.BusConnection(os.environ["DBUS_SESSION_BUS_ADDRESS"], mainloop=j2sc.gDBus.loop)
+
+    gMainWindow = j2sc.CadenceMainW()
+    gMainWindow.m_deferredInitDone = True
+    gMainWindow.DBusAddSignalReceivers()
+    gMainWindow.DBusReconnect()
+
+    startTime = monotonic()
+    while gMainWindow.label_jack_status.text() == "Connecting...":
+        if monotonic() - startTime > STARTUP_TIMEOUT:
+            raise RuntimeError("j2sc did not get an answer from mock jackdbus")
+        QApplication.processEvents()
+        sleep(0.001)
+
+    return gMainWindow
+
+def scenarioForceRestart(env, args):
+    import j2sc
+
+    from PyQt6.QtWidgets import QMessageBox
+    from shared import getDataDir
+
+    # copies of sleep under unique names, so only our own dummy processes get terminated
+    binDir = os.path.join(env.getTempPath(), "bin")
+    os.makedirs(binDir, exist_ok=True)
+
+    names = ("j2sc-bench-term", "j2sc-bench-kill")
+    for name in names:
+        if not os.path.exists(os.path.join(binDir, name)):
+            shutil.copy(shutil.which("sleep"), os.path.join(binDir, name))
+
+    j2sc.AUDIO_PROCS_TERM = [names[0]]
+    j2sc.AUDIO_PROCS_KILL = [names[1]]
+
+    # says yes to the confirmation, and skips the result message box
+    j2sc.CustomMessageBox = lambda *args: QMessageBox.StandardButton.Yes
+
+    window = getMainWindow()
+    env.setJackStarted(True)
+
+    procs = [subprocess.Popen([os.path.join(binDir, name), "60"]) for name in names for i in range(4)]
+
+    # the whole ForceWaitDialog sequence: Exit, kill, reconnect, StartServer, a2j (not available on the private bus)
+    with ScenarioRun(env) as run:
+        window.forceRestart(True)
+
+    for proc in procs:
+        proc.wait()
+
+    with open(os.path.join(getDataDir(), "restart-history.jsonl")) as fd:
+        entry = json.loads(fd.readlines()[-1])
+
+    if not entry["started"]:
+        raise RuntimeError("force restart did not start mock jackdbus again")
+
+    for phase, seconds in entry["phases"].items():
+        run.extra["%s ms" % phase] = seconds * 1000
+
+    return run
+
+def scenarioIdle(env, args):
+    env.setJackStarted(True)
+
+    startTime = monotonic()
+    proc = startMainWindow()
+    waitForLine(proc, "Startup: DBus set up", startTime)
+    drainOutput(proc)
+    sleep(1.0)
+
+    cpuStart, switchesStart = getProcessTimes(proc.pid)
+
+    with ScenarioRun(env) as run:
+        sleep(args.idle_seconds)
+
+    cpuEnd, switchesEnd = getProcessTimes(proc.pid)
+    stopMainWindow(proc)
+    env.setJackStarted(False)
+
+    run.extra["cpuPercent"] = (cpuEnd - cpuStart) * 100.0 / run.wallTime
+    run.extra["wakeupsPerSecond"] = (switchesEnd - switchesStart) / run.wallTime
+    run.extra["callsPerSecond"] = sum(run.callCount.values()) / run.wallTime
+    return run
+
+SCENARIOS = [
+    ("startup",       scenarioStartup),
+    ("settings-open", scenarioSettingsOpen),
+    ("driver-switch", scenarioDriverSwitch),
+    ("settings-save", scenarioSettingsSave),
+    ("force-restart", scenarioForceRestart),
+    ("idle",          scenarioIdle),
+]
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Report
+
+def summarize(name, runs):
+    calls   = [sum(run.callCount.values()) for run in runs]
+    methods = {}
+
+    for run in runs:
+        for method, count in run.callCount.items():
+            methods[method] = methods.get(method, 0) + count
+
+    summary = {
+        "scenario": name,
+        "runs": len(runs),
+        "wallMsMedian": median(run.wallTime for run in runs) * 1000,
+        "wallMsMin": min(run.wallTime for run in runs) * 1000,
+        "callsMedian": median(calls),
+        "callsPerMethod": dict((method, count / len(runs)) for method, count in sorted(methods.items())),
+    }
+
+    for key in runs[0].extra:
+        summary[key] = median(run.extra[key] for run in runs)
+
+    return summary
+
+def printSummary(summary):
+    print("%-14s %4i runs %9.1f ms (min %9.1f ms) %7g DBus calls" % (summary["scenario"], summary["runs"],
+          summary["wallMsMedian"], summary["wallMsMin"], summary["callsMedian"]))
+
+    for key, value in summary.items():
+        if key not in ("scenario", "runs", "wallMsMedian", "wallMsMin", "callsMedian", "callsPerMethod"):
+            print("    %-20s %.2f" % (key, value))
+
+    for method, count in summary["callsPerMethod"].items():
+        print("    %-20s %g" % (method, count))
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Main
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark j2sc against a mock jackdbus")
+    parser.add_argument("scenarios", nargs="*", metavar="scenario",
+                        help="scenarios to run, from: %s (default: all)" % ", ".join(name for name, func in SCENARIOS))
+    parser.add_argument("-l", "--latency", type=float, default=1.0, help="added latency per jackdbus call, in ms (default: 1)")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="runs per scenario (default: 5)")
+    parser.add_argument("--idle-seconds", type=float, default=10.0, help="duration of the idle scenario (default: 10)")
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    for name in args.scenarios:
+        if name not in dict(SCENARIOS):
+            parser.error("unknown scenario '%s'" % name)
+
+    env = BenchEnvironment(args.latency)
+    sys.path.insert(0, SRC_DIR)
+
+    try:
+        from PyQt6.QtWidgets import QApplication
+        app = QApplication(sys.argv[:1])
+        app.setOrganizationName("falkTX")
+
+        print("# latency per call: %g ms" % args.latency)
+
+        results = []
+
+        for name, func in SCENARIOS:
+            if args.scenarios and name not in args.scenarios:
+                continue
+
+            runs = []
+            for i in range(1 if name == "idle" else args.repeat):
+                runs.append(func(env, args))
+                app.processEvents()
+
+            summary = summarize(name, runs)
+            printSummary(summary)
+            results.append(summary)
+
+        if args.json:
+            with open(args.json, "w") as fd:
+                json.dump({ "latencyMs": args.latency, "results": results }, fd, indent=2)
+
+    finally:
+        env.close()
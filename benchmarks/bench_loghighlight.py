@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+import argparse
+import os
+import random
+import sys
+
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Custom Stuff)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from logtext import JACK_HIGHLIGHT_RULES, LOG_NORMAL, LogIndex
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Log highlighting benchmark
+#
+# Measures the cost of a full rehighlight (what Qt asks for on resize, scroll or palette change) of a synthetic
+# jackdbus.log, comparing the string scanning QSyntaxHighlighter.highlightBlock() used to do for every line against the
+# lookup of the kind and column precomputed by LogIndex while indexing.
+# With --qt (needs PyQt6), also times QSyntaxHighlighter.rehighlight() on a QTextDocument holding the whole log against
+# repainting the log view, which only paints visible lines. Qt runs on the offscreen platform.
+#
+# Usage: python3 benchmarks/bench_loghighlight.py [--lines N] [--repeat N] [--qt]
+
+LOG_MESSAGES = (
+    "\x1b[1m\x1b[31mERROR: Cannot lock down 82280346 byte memory area (Cannot allocate memory)\x1b[0m",
+    "\x1b[1m\x1b[33mWARNING: JACK compiled with System V SHM support\x1b[0m",
+    "------------------",
+    "Connecting 'system:capture_1' to 'PulseAudio JACK Source:front-left'",
+    "Disconnecting 'PulseAudio JACK Sink:front-left' from 'system:playback_1'",
+    "Jack: JackPosixThread::StartImp : create non RT thread",
+    "Jack: JackDriver::Open capture_driver_name = hw:PCH",
+    "New client 'a2j' with PID 4242",
+    "Starting jack server...",
+    "Loading driver \"alsa\"...",
+)
+
+# what highlightBlock() did for each line, returns (kind, column)
+def scanHighlight(text, rules):
+    for match, start, kind in rules:
+        if match in text:
+            return (kind, text.find(start))
+
+    return (LOG_NORMAL, 0)
+
+def writeLog(path, lineCount):
+    rand = random.Random(1234)
+
+    with open(path, "w") as fd:
+        for i in range(lineCount):
+            fd.write("Sat Oct 18 12:%02i:%02i 2025: %s\n" % (rand.randrange(60), rand.randrange(60), rand.choice(LOG_MESSAGES)))
+
+def timeBest(func, repeat):
+    best = None
+
+    for _ in range(repeat):
+        startTime = perf_counter()
+        func()
+        duration = perf_counter() - startTime
+
+        if best is None or duration < best:
+            best = duration
+
+    return best
+
+def printResult(name, duration, lineCount, baseline):
+    print("%-42s %9.2f ms  %7.3f us/line  %7.1fx" % (name, duration * 1000, duration * 1e6 / lineCount, baseline / duration))
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Without Qt, highlight lookup for every line
+
+def benchLookups(index, lineCount, repeat):
+    lines = [index.getLine(line) for line in range(lineCount)]
+
+    def scanAll():
+        for text in lines:
+            scanHighlight(text, JACK_HIGHLIGHT_RULES)
+
+    def lookupAll():
+        getHighlight = index.getHighlight
+        for line in range(lineCount):
+            getHighlight(line)
+
+    baseline = timeBest(scanAll, repeat)
+    printResult("string scan per line (old highlightBlock)", baseline, lineCount, baseline)
+    printResult("precomputed lookup per line", timeBest(lookupAll, repeat), lineCount, baseline)
+
+# ---------------------------------------------------------------------------------------------------------------------
+# With Qt, full rehighlight of a QTextDocument against repainting the log view
+
+def benchQt(index, path, lineCount, repeat):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtGui import QColor, QSyntaxHighlighter, QTextDocument
+    from PyQt6.QtWidgets import QApplication, QListView
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    from logs import LogItemDelegate, LogModel
+
+    class OldHighlighter(QSyntaxHighlighter):
+        def highlightBlock(self, text):
+            kind, column = scanHighlight(text, JACK_HIGHLIGHT_RULES)
+            if kind != LOG_NORMAL:
+                self.setFormat(column, len(text), QColor(Qt.GlobalColor.red))
+
+    document = QTextDocument()
+    document.setPlainText("\n".join(index.getLine(line) for line in range(lineCount)))
+    highlighter = OldHighlighter(document)
+
+    view = QListView()
+    view.setUniformItemSizes(True)
+    view.resize(900, 600)
+
+    model    = LogModel(view, index)
+    delegate = LogItemDelegate(view)
+    view.setModel(model)
+    view.setItemDelegate(delegate)
+    model.refresh()
+    view.show()
+    app.processEvents()
+
+    def repaintView():
+        view.viewport().grab()
+
+    def repaintViewScrolled():
+        scrollBar = view.verticalScrollBar()
+        for step in range(10):
+            scrollBar.setValue(scrollBar.maximum() * step // 9)
+            view.viewport().grab()
+
+    baseline = timeBest(highlighter.rehighlight, repeat)
+    printResult("QSyntaxHighlighter.rehighlight()", baseline, lineCount, baseline)
+    printResult("log view repaint", timeBest(repaintView, repeat), lineCount, baseline)
+    printResult("log view repaint, 10 scroll positions", timeBest(repaintViewScrolled, repeat), lineCount, baseline)
+
+    view.close()
+
+# ---------------------------------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark log highlighting")
+    parser.add_argument("-l", "--lines", type=int, default=200000, help="log lines (default: 200000)")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="runs per variant, best is reported (default: 5)")
+    parser.add_argument("--qt", action="store_true", help="also benchmark Qt rehighlight against the log view")
+    args = parser.parse_args()
+
+    with TemporaryDirectory(prefix="j2sc-bench-") as tmpPath:
+        path = os.path.join(tmpPath, "jackdbus.log")
+        writeLog(path, args.lines)
+
+        index = LogIndex(path, JACK_HIGHLIGHT_RULES)
+
+        startTime = perf_counter()
+        while index.update()[1]:
+            pass
+        indexTime = perf_counter() - startTime
+
+        print("%i lines, %.1f MB, indexed and classified in %.2f ms, best of %i runs\n" % (args.lines, os.path.getsize(path) / 1048576.0,
+                                                                                          indexTime * 1000, args.repeat))
+
+        benchLookups(index, args.lines, args.repeat)
+
+        if args.qt:
+            print()
+            benchQt(index, path, args.lines, args.repeat)
+
+        index.close()
+
+if __name__ == '__main__':
+    main()
+
+# ---------------------------------------------------------------------------------------------------------------------
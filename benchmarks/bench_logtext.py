@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+import argparse
+import os
+import random
+import sys
+
+from time import perf_counter
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Custom Stuff)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from logtext import stripAnsi
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Log text micro-benchmark
+#
+# Strips terminal escape sequences from a synthetic jackdbus.log chunk, comparing the previous chain of str.replace
+# calls against the single-pass stripAnsi(), on str and on bytes (decoding included in both cases).
+# Does not need Qt or DBus.
+#
+# Usage: python3 benchmarks/bench_logtext.py [--size MB] [--repeat N]
+
+LOG_MESSAGES = (
+    "\x1b[1m\x1b[31mERROR: Cannot lock down 82280346 byte memory area (Cannot allocate memory)\x1b[0m",
+    "\x1b[1m\x1b[33mWARNING: JACK compiled with System V SHM support, jackd not started\x1b[0m",
+    "\x1b[31mERROR: ALSA: cannot set hardware parameters for playback\x1b[0m",
+    "\x1b[33mWARNING: Failed to open server\x1b[0m",
+    "\x1b[1;34mNew client 'a2j' with PID 4242\x1b[0m",
+    "\x1b[2K\x1b[1GXRun detected, recovering",
+    "Connecting 'system:capture_1' to 'a2j:Midi Through [14] (capture): Midi Through Port-0'",
+    "Disconnecting 'PulseAudio JACK Sink:front-left' from 'system:playback_1'",
+    "Starting jack server...",
+    "Loading driver \"alsa\"...",
+    "------------------",
+)
+
+# the str.replace chain fixLogText() used before
+def stripChain(text):
+    return text.replace("\x1b[1m\x1b[31m", "").replace("\x1b[1m\x1b[33m", "").replace("\x1b[31m", "").replace("\x1b[33m", "").replace("\x1b[0m", "")
+
+def makeLogChunk(size):
+    rand  = random.Random(1234)
+    lines = []
+    total = 0
+
+    while total < size:
+        line = "Sat Oct 18 12:%02i:%02i 2025: %s\n" % (rand.randrange(60), rand.randrange(60), rand.choice(LOG_MESSAGES))
+        lines.append(line)
+        total += len(line)
+
+    return "".join(lines)
+
+def timeBest(func, arg, repeat):
+    best = None
+
+    for _ in range(repeat):
+        startTime = perf_counter()
+        ret = func(arg)
+        duration = perf_counter() - startTime
+
+        if best is None or duration < best:
+            best = duration
+
+    return (best, ret)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark log text escape sequence stripping")
+    parser.add_argument("-s", "--size", type=float, default=8.0, help="log chunk size, in MB (default: 8)")
+    parser.add_argument("-r", "--repeat", type=int, default=10, help="runs per variant, best is reported (default: 10)")
+    args = parser.parse_args()
+
+    text = makeLogChunk(int(args.size * 1024 * 1024))
+    data = text.encode("utf-8")
+
+    variants = (
+        ("str.replace chain",         lambda arg: stripChain(arg.decode("utf-8")), data),
+        ("stripAnsi, str",            lambda arg: stripAnsi(arg.decode("utf-8")),  data),
+        ("stripAnsi, bytes + decode", lambda arg: stripAnsi(arg).decode("utf-8"),  data),
+    )
+
+    print("%.1f MB chunk, %i lines, best of %i runs (decoding included)\n" % (len(data) / 1048576.0, text.count("\n"), args.repeat))
+
+    baseline = None
+
+    for name, func, arg in variants:
+        duration, ret = timeBest(func, arg, args.repeat)
+
+        if baseline is None:
+            baseline = duration
+
+        print("%-26s %8.2f ms  %6.1f MB/s  %5.2fx  %i escape chars left" % (name, duration * 1000, len(data) / 1048576.0 / duration,
+                                                                          baseline / duration, ret.count("\x1b")))
+
+if __name__ == '__main__':
+    main()
+
+# ---------------------------------------------------------------------------------------------------------------------
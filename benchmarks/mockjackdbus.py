@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+import argparse
+
+from random import random
+from time import sleep
+
+import dbus
+import dbus.service
+
+from dbus.mainloop.glib import DBusGMainLoop
+from gi.repository import GLib
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Stand-in for jackdbus, meant to run on a private session bus
+#
+# Implements the org.jackaudio.Configure and org.jackaudio.JackControl calls used by j2sc, with a fixed latency added
+# to every call. Calls are counted per method and can be read back through the org.j2sc.Benchmark interface.
+# No audio is involved, starting the server only flips a flag. Exit stops the server but keeps the service around,
+# as there is no DBus activation on the private bus to bring it back.
+
+SERVICE_NAME    = "org.jackaudio.service"
+OBJECT_PATH     = "/org/jackaudio/Controller"
+IFACE_CONFIGURE = "org.jackaudio.Configure"
+IFACE_CONTROL   = "org.jackaudio.JackControl"
+IFACE_BENCHMARK = "org.j2sc.Benchmark"
+
+# (name, type, default value)
+ENGINE_PARAMETERS = [
+    ("driver",            's', "alsa"),
+    ("name",              's', "default"),
+    ("realtime",          'b', True),
+    ("realtime-priority", 'i', 10),
+    ("temporary",         'b', False),
+    ("verbose",           'b', False),
+    ("client-timeout",    'i', 0),
+    ("clock-source",      'u', 0),
+    ("port-max",          'u', 2048),
+    ("replace-registry",  'b', False),
+    ("sync",              'b', False),
+    ("self-connect-mode", 'c', " "),
+]
+
+DRIVER_PARAMETERS = {
+    "alsa": [
+        ("capture",        's', "none"),
+        ("playback",       's', "none"),
+        ("device",         's', "hw:0"),
+        ("rate",           'u', 48000),
+        ("period",         'u', 1024),
+        ("nperiods",       'u', 2),
+        ("hwmon",          'b', False),
+        ("hwmeter",        'b', False),
+        ("duplex",         'b', True),
+        ("softmode",       'b', False),
+        ("monitor",        'b', False),
+        ("dither",         'c', "n"),
+        ("inchannels",     'u', 0),
+        ("outchannels",    'u', 0),
+        ("shorts",         'b', False),
+        ("input-latency",  'u', 0),
+        ("output-latency", 'u', 0),
+        ("midi-driver",    's', "none"),
+    ],
+    "dummy": [
+        ("capture",        'u', 2),
+        ("playback",       'u', 2),
+        ("monitor",        'b', False),
+        ("rate",           'u', 48000),
+        ("period",         'u', 1024),
+        ("wait",           'u', 21333),
+    ],
+}
+
+DEVICE_CONSTRAINTS = [
+    ("hw:0", "Mock Audio Device"),
+    ("hw:1", "Mock USB Audio Device"),
+]
+
+def makeValue(paramType, value):
+    if paramType == 'b':
+        return dbus.Boolean(value)
+    if paramType == 'c':
+        return dbus.Byte(value.encode("utf-8"))
+    if paramType == 'i':
+        return dbus.Int32(value)
+    if paramType == 'u':
+        return dbus.UInt32(value)
+    return dbus.String(value)
+
+class MockParameter(object):
+    __slots__ = [
+        'type',
+        'default',
+        'value',
+        'isSet',
+    ]
+
+    def __init__(self, paramType, default):
+        self.type    = paramType
+        self.default = makeValue(paramType, default)
+        self.value   = self.default
+        self.isSet   = False
+
+def makeContainer(parameters):
+    return dict((name, MockParameter(paramType, default)) for name, paramType, default in parameters)
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Service object
+
+class MockJackDBus(dbus.service.Object):
+    def __init__(self, bus, latency):
+        dbus.service.Object.__init__(self, bus, OBJECT_PATH)
+
+        self.fLatency    = latency
+        self.fCallCounts = {}
+        self.fStarted    = False
+        self.fXruns      = 0
+        self.fEngine     = makeContainer(ENGINE_PARAMETERS)
+        self.fDrivers    = dict((name, makeContainer(parameters)) for name, parameters in DRIVER_PARAMETERS.items())
+
+    def call(self, method):
+        self.fCallCounts[method] = self.fCallCounts.get(method, 0) + 1
+
+        if self.fLatency > 0.0:
+            sleep(self.fLatency)
+
+    def getContainer(self, container):
+        if container == "engine":
+            return self.fEngine
+        if container == "driver":
+            return self.fDrivers[str(self.fEngine["driver"].value)]
+        raise dbus.DBusException("Invalid container '%s'" % container, name="org.jackaudio.Error.InvalidArgs")
+
+    def getParameter(self, path):
+        if len(path) != 2:
+            raise dbus.DBusException("Invalid parameter path", name="org.jackaudio.Error.InvalidArgs")
+
+        parameter = self.getContainer(str(path[0])).get(str(path[1]))
+
+        if parameter is None:
+            raise dbus.DBusException("Unknown parameter '%s'" % path[1], name="org.jackaudio.Error.InvalidArgs")
+
+        return parameter
+
+    def getDriverParameter(self, name):
+        return self.getContainer("driver")[name].value
+
+    # -----------------------------------------------------------------
+    # org.jackaudio.Configure
+
+    @dbus.service.method(IFACE_CONFIGURE, in_signature="as", out_signature="bas")
+    def ReadContainer(self, path):
+        self.call("ReadContainer")
+
+        if list(path) == ["drivers"]:
+            return (False, list(self.fDrivers))
+
+        return (True, list(self.getContainer(str(path[0]))))
+
+    @dbus.service.method(IFACE_CONFIGURE, in_signature="as", out_signature="(ysss)")
+    def GetParameterInfo(self, path):
+        self.call("GetParameterInfo")
+        parameter = self.getParameter(path)
+        return (dbus.Byte(parameter.type.encode("utf-8")), str(path[1]), "", "")
+
+    @dbus.service.method(IFACE_CONFIGURE, in_signature="as", out_signature="bbba(vs)")
+    def GetParameterConstraint(self, path):
+        self.call("GetParameterConstraint")
+        self.getParameter(path)
+
+        if str(path[1]) == "device":
+            return (False, False, False, [(dbus.String(value), description) for value, description in DEVICE_CONSTRAINTS])
+
+        return (False, False, False, dbus.Array([], signature="(vs)"))
+
+    @dbus.service.method(IFACE_CONFIGURE, in_signature="as", out_signature="bvv")
+    def GetParameterValue(self, path):
+        self.call("GetParameterValue")
+        parameter = self.getParameter(path)
+        return (parameter.isSet, parameter.default, parameter.value)
+
+    @dbus.service.method(IFACE_CONFIGURE, in_signature="asv", out_signature="")
+    def SetParameterValue(self, path, value):
+        self.call("SetParameterValue")
+        parameter = self.getParameter(path)
+
+        if list(path) == ["engine", "driver"] and str(value) not in self.fDrivers:
+            raise dbus.DBusException("Unknown driver '%s'" % value, name="org.jackaudio.Error.InvalidArgs")
+
+        parameter.value = makeValue(parameter.type, chr(int(value)) if parameter.type == 'c' else value)
+        parameter.isSet = True
+
+    @dbus.service.method(IFACE_CONFIGURE, in_signature="as", out_signature="")
+    def ResetParameterValue(self, path):
+        self.call("ResetParameterValue")
+        parameter = self.getParameter(path)
+        parameter.value = parameter.default
+        parameter.isSet = False
+
+    # -----------------------------------------------------------------
+    # org.jackaudio.JackControl
+
+    @dbus.service.method(IFACE_CONTROL, in_signature="", out_signature="b")
+    def IsStarted(self):
+        self.call("IsStarted")
+        return self.fStarted
+
+    @dbus.service.method(IFACE_CONTROL, in_signature="", out_signature="")
+    def StartServer(self):
+        self.call("StartServer")
+
+        if self.fStarted:
+            raise dbus.DBusException("Server is already started", name="org.jackaudio.Error.Generic")
+
+        self.fStarted = True
+        self.fXruns   = 0
+        self.ServerStarted()
+
+    @dbus.service.method(IFACE_CONTROL, in_signature="", out_signature="")
+    def StopServer(self):
+        self.call("StopServer")
+
+        if not self.fStarted:
+            raise dbus.DBusException("Server is not started", name="org.jackaudio.Error.Generic")
+
+        self.fStarted = False
+        self.ServerStopped()
+
+    @dbus.service.method(IFACE_CONTROL, in_signature="", out_signature="")
+    def SwitchMaster(self):
+        self.call("SwitchMaster")
+
+    @dbus.service.method(IFACE_CONTROL, in_signature="", out_signature="")
+    def Exit(self):
+        self.call("Exit")
+
+        if self.fStarted:
+            self.fStarted = False
+            self.ServerStopped()
+
+    @dbus.service.method(IFACE_CONTROL, in_signature="", out_signature="d")
+    def GetLoad(self):
+        self.call("GetLoad")
+        # small jitter, below what j2sc considers a change
+        return 5.0 + random() * 0.5 if self.fStarted else 0.0
+
+    @dbus.service.method(IFACE_CONTROL, in_signature="", out_signature="u")
+    def GetXruns(self):
+        self.call("GetXruns")
+        return self.fXruns
+
+    @dbus.service.method(IFACE_CONTROL, in_signature="", out_signature="u")
+    def GetSampleRate(self):
+        self.call("GetSampleRate")
+        return self.getDriverParameter("rate")
+
+    @dbus.service.method(IFACE_CONTROL, in_signature="", out_signature="u")
+    def GetBufferSize(self):
+        self.call("GetBufferSize")
+        return self.getDriverParameter("period")
+
+    @dbus.service.method(IFACE_CONTROL, in_signature="", out_signature="d")
+    def GetLatency(self):
+        self.call("GetLatency")
+        return float(self.getDriverParameter("period")) * 1000.0 / float(self.getDriverParameter("rate"))
+
+    @dbus.service.method(IFACE_CONTROL, in_signature="", out_signature="b")
+    def IsRealtime(self):
+        self.call("IsRealtime")
+        return bool(self.fEngine["realtime"].value)
+
+    @dbus.service.method(IFACE_CONTROL, in_signature="", out_signature="")
+    def ResetXruns(self):
+        self.call("ResetXruns")
+        self.fXruns = 0
+
+    @dbus.service.signal(IFACE_CONTROL, signature="")
+    def ServerStarted(self):
+        pass
+
+    @dbus.service.signal(IFACE_CONTROL, signature="")
+    def ServerStopped(self):
+        pass
+
+    # -----------------------------------------------------------------
+    # org.j2sc.Benchmark, not counted
+
+    @dbus.service.method(IFACE_BENCHMARK, in_signature="", out_signature="a{su}")
+    def GetCallCounts(self):
+        return dbus.Dictionary(self.fCallCounts, signature="su")
+
+    @dbus.service.method(IFACE_BENCHMARK, in_signature="", out_signature="")
+    def ResetCallCounts(self):
+        self.fCallCounts = {}
+
+    # in ms, same as --latency
+    @dbus.service.method(IFACE_BENCHMARK, in_signature="d", out_signature="")
+    def SetLatency(self, latency):
+        self.fLatency = float(latency) / 1000.0
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Main
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Mock jackdbus service for benchmarking j2sc")
+    parser.add_argument("-l", "--latency", type=float, default=0.0, help="added latency per call, in ms (default: 0)")
+    args = parser.parse_args()
+
+    DBusGMainLoop(set_as_default=True)
+
+    bus  = dbus.SessionBus()
+    name = dbus.service.BusName(SERVICE_NAME, bus, do_not_queue=True)
+    mock = MockJackDBus(bus, args.latency / 1000.0)
+
+    GLib.MainLoop().run()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+import argparse
+import sys
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Custom Stuff)
+
+from jackcontrol import (
+    initBus, getParameterTree, getParameterValue, getParameterType, setParameterValue, resetParameterValue,
+    parseParameterValue, formatParameterValue, readJackStats,
+)
+from shared import VERSION
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Try Import DBus
+
+try:
+    import dbus
+except:
+    dbus = None
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Headless control of jackdbus, no Qt involved
+
+EXIT_OK      = 0
+EXIT_ERROR   = 1
+EXIT_STOPPED = 3 # for "status", same as systemctl
+
+def getJackControl(bus):
+    return dbus.Interface(bus.get_object("org.jackaudio.service", "/org/jackaudio/Controller"),
+                          "org.jackaudio.JackControl")
+
+def cmdStatus(bus, args):
+    # do not trigger DBus activation just to ask for the status
+    if not bus.name_has_owner("org.jackaudio.service"):
+        print("stopped (jackdbus not running)")
+        return EXIT_STOPPED
+
+    stats = readJackStats(getJackControl(bus))
+
+    if not stats.started:
+        print("stopped")
+        return EXIT_STOPPED
+
+    driverTry = getParameterValue("engine", "driver")
+
+    print("started")
+    print("driver:      %s" % (formatParameterValue(driverTry[2]) if driverTry is not None else "unknown"))
+    print("realtime:    %s" % ("yes" if stats.realtime else "no"))
+    print("dsp load:    %.2f%%" % stats.dspLoad)
+    print("xruns:       %i" % stats.xruns)
+    print("buffer size: %i" % stats.bufferSize)
+    print("sample rate: %i" % stats.sampleRate)
+    print("latency:     %.1f ms" % stats.latency)
+    return EXIT_OK
+
+def cmdStart(bus, args):
+    jack = getJackControl(bus)
+
+    if not jack.IsStarted():
+        jack.StartServer()
+
+    return EXIT_OK
+
+def cmdStop(bus, args):
+    jack = getJackControl(bus)
+
+    if jack.IsStarted():
+        jack.StopServer()
+
+    return EXIT_OK
+
+def cmdRestart(bus, args):
+    jack = getJackControl(bus)
+
+    if jack.IsStarted():
+        jack.StopServer()
+
+    jack.StartServer()
+    return EXIT_OK
+
+def cmdGet(bus, args):
+    features = getParameterTree(args.container).features
+
+    if args.parameter is not None:
+        valueTry = getParameterValue(args.container, args.parameter)
+
+        if valueTry is None:
+            print("%s: unknown %s parameter '%s'" % (sys.argv[0], args.container, args.parameter), file=sys.stderr)
+            return EXIT_ERROR
+
+        print(formatParameterValue(valueTry[2]))
+        return EXIT_OK
+
+    # list all, marking the ones that are not set to their default value
+    for parameter in features:
+        valueTry = getParameterValue(args.container, parameter)
+
+        if valueTry is None:
+            continue
+
+        print("%s %-20s %s" % ("*" if valueTry[0] else " ", parameter, formatParameterValue(valueTry[2])))
+
+    return EXIT_OK
+
+def cmdSet(bus, args):
+    paramType = getParameterType(args.container, args.parameter)
+
+    if paramType is None:
+        print("%s: unknown %s parameter '%s'" % (sys.argv[0], args.container, args.parameter), file=sys.stderr)
+        return EXIT_ERROR
+
+    try:
+        value = parseParameterValue(paramType, args.value)
+    except ValueError as error:
+        print("%s: %s" % (sys.argv[0], error), file=sys.stderr)
+        return EXIT_ERROR
+
+    return EXIT_OK if setParameterValue(args.container, args.parameter, value) else EXIT_ERROR
+
+def cmdReset(bus, args):
+    if getParameterValue(args.container, args.parameter) is None:
+        print("%s: unknown %s parameter '%s'" % (sys.argv[0], args.container, args.parameter), file=sys.stderr)
+        return EXIT_ERROR
+
+    return EXIT_OK if resetParameterValue(args.container, args.parameter) else EXIT_ERROR
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Command-line parsing
+
+def getArgParser():
+    parser = argparse.ArgumentParser(prog="j2sc-ctl", description="Control JACK2 through jackdbus, without a GUI")
+    parser.add_argument("-V", "--version", action="version", version="%(prog)s " + VERSION)
+
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    command = commands.add_parser("status", help="show server status (exits with 3 if stopped)")
+    command.set_defaults(func=cmdStatus)
+
+    command = commands.add_parser("start", help="start the server")
+    command.set_defaults(func=cmdStart)
+
+    command = commands.add_parser("stop", help="stop the server")
+    command.set_defaults(func=cmdStop)
+
+    command = commands.add_parser("restart", help="stop the server if running, then start it")
+    command.set_defaults(func=cmdRestart)
+
+    command = commands.add_parser("get", help="show a parameter value, or all of them")
+    command.add_argument("container", choices=("engine", "driver"))
+    command.add_argument("parameter", nargs="?")
+    command.set_defaults(func=cmdGet)
+
+    command = commands.add_parser("set", help="change a parameter value")
+    command.add_argument("container", choices=("engine", "driver"))
+    command.add_argument("parameter")
+    command.add_argument("value")
+    command.set_defaults(func=cmdSet)
+
+    command = commands.add_parser("reset", help="reset a parameter to its default value")
+    command.add_argument("container", choices=("engine", "driver"))
+    command.add_argument("parameter")
+    command.set_defaults(func=cmdReset)
+
+    return parser
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Main
+
+def main(argv):
+    args = getArgParser().parse_args(argv)
+
+    if dbus is None:
+        print("%s: DBus is not available, cannot continue" % sys.argv[0], file=sys.stderr)
+        return EXIT_ERROR
+
+    try:
+        bus = dbus.SessionBus()
+    except dbus.DBusException as error:
+        print("%s: cannot connect to the session bus: %s" % (sys.argv[0], error), file=sys.stderr)
+        return EXIT_ERROR
+
+    # status must not activate jackdbus, everything else goes through the configure interface
+    if args.func is not cmdStatus or bus.name_has_owner("org.jackaudio.service"):
+        if initBus(bus):
+            print("%s: jackdbus is not available" % sys.argv[0], file=sys.stderr)
+            return EXIT_ERROR
+
+    try:
+        return args.func(bus, args)
+    except dbus.DBusException as error:
+        print("%s: %s" % (sys.argv[0], error.get_dbus_message()), file=sys.stderr)
+        return EXIT_ERROR
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+import json
+import os
+import sys
+
+from bisect import bisect_left
+from collections import deque
+from threading import Lock, current_thread, main_thread
+from time import perf_counter, time
+
+# ---------------------------------------------------------------------------------------------------------------------
+# DBus call tracing
+#
+# Proxies returned by traceProxy() record every method call made through them: name, arguments, duration, whether it
+# blocked the main thread, the function that made the call and the slot/event handler it originated from.
+# Blocking calls are timed around the call itself, async calls (with reply_handler) until their reply arrives.
+# Tracing is off unless enableTracing() is called, in which case traceProxy() returns the given proxy untouched.
+
+# histogram bucket upper bounds, in ms (last bucket is everything above)
+HISTOGRAM_BOUNDS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0)
+
+MAX_RECENT_CALLS = 1000
+MAX_ARGS_LENGTH  = 120
+
+# files whose frames are never reported as the caller
+SKIPPED_FILES = ("dbustrace.py", "jackcontrol.py")
+SKIPPED_FUNCS = ("callAsync", "replyHandler", "errorHandler")
+
+class MethodStats(object):
+    __slots__ = [
+        'count',
+        'blocking',
+        'errors',
+        'totalTime',
+        'blockingTime',
+        'maxTime',
+        'histogram',
+    ]
+
+    def __init__(self):
+        self.count        = 0
+        self.blocking     = 0
+        self.errors       = 0
+        self.totalTime    = 0.0
+        self.blockingTime = 0.0
+        self.maxTime      = 0.0
+        self.histogram    = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+
+    def toDict(self):
+        return {
+            "count": self.count,
+            "blocking": self.blocking,
+            "errors": self.errors,
+            "totalMs": self.totalTime * 1000,
+            "blockingMs": self.blockingTime * 1000,
+            "maxMs": self.maxTime * 1000,
+            "histogram": self.histogram,
+        }
+
+class DBusTracer(object):
+    def __init__(self):
+        self.fLock    = Lock()
+        self.fMethods = {}
+        self.fOrigins = {}
+        self.fRecent  = deque(maxlen=MAX_RECENT_CALLS)
+        self.fStart   = time()
+
+    def reset(self):
+        with self.fLock:
+            self.fMethods.clear()
+            self.fOrigins.clear()
+            self.fRecent.clear()
+            self.fStart = time()
+
+    def record(self, method, args, duration, blocking, caller, origin, error):
+        durationMs = duration * 1000
+
+        with self.fLock:
+            for key, stats in ((method, self.fMethods), (origin, self.fOrigins)):
+                entry = stats.get(key)
+
+                if entry is None:
+                    entry = stats[key] = MethodStats()
+
+                entry.count     += 1
+                entry.totalTime += duration
+                entry.maxTime    = max(entry.maxTime, duration)
+                entry.histogram[bisect_left(HISTOGRAM_BOUNDS, durationMs)] += 1
+
+                if blocking:
+                    entry.blocking     += 1
+                    entry.blockingTime += duration
+                if error:
+                    entry.errors += 1
+
+            self.fRecent.append((time(), method, args, durationMs, blocking, caller, origin, error))
+
+    # returns a copy of (methods, origins, recent calls), safe to use outside the lock
+    def getSnapshot(self):
+        with self.fLock:
+            return (dict((key, entry.toDict()) for key, entry in self.fMethods.items()),
+                    dict((key, entry.toDict()) for key, entry in self.fOrigins.items()),
+                    list(self.fRecent))
+
+    def toJson(self):
+        methods, origins, recent = self.getSnapshot()
+
+        return json.dumps({
+            "start": self.fStart,
+            "end": time(),
+            "histogramBoundsMs": HISTOGRAM_BOUNDS,
+            "methods": methods,
+            "origins": origins,
+            "recent": [{
+                "time": when,
+                "method": method,
+                "args": args,
+                "durationMs": durationMs,
+                "blocking": blocking,
+                "caller": caller,
+                "origin": origin,
+                "error": error,
+            } for when, method, args, durationMs, blocking, caller, origin, error in recent],
+        }, indent=2)
+
+    def dump(self, path):
+        try:
+            with open(path, "w") as fd:
+                fd.write(self.toJson())
+        except OSError as error:
+            print("DBusTracer::dump() - Failed to write '%s': %s" % (path, error))
+            return False
+
+        return True
+
+gTracer = None
+
+def enableTracing():
+    global gTracer
+
+    if gTracer is None:
+        gTracer = DBusTracer()
+
+    return gTracer
+
+def getTracer():
+    return gTracer
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Caller detection
+
+def getFrameName(frame):
+    code = frame.f_code
+    self_ = frame.f_locals.get("self")
+
+    if self_ is not None:
+        return "%s.%s" % (type(self_).__name__, code.co_name)
+
+    return code.co_name
+
+# Returns (caller, origin).
+# The caller is the first function outside the tracing helpers, the origin is the outermost slot, event handler or
+# constructor in the stack (what the user or a timer actually triggered), falling back to the caller.
+def getCallerAndOrigin():
+    frame  = sys._getframe(2)
+    caller = None
+    origin = None
+
+    while frame is not None:
+        name = frame.f_code.co_name
+
+        if os.path.basename(frame.f_code.co_filename) not in SKIPPED_FILES and name not in SKIPPED_FUNCS:
+            if caller is None:
+                caller = getFrameName(frame)
+            if name.startswith("slot_") or name.endswith("Event") or name == "__init__":
+                origin = getFrameName(frame)
+
+        frame = frame.f_back
+
+    if caller is None:
+        caller = "?"
+
+    return (caller, origin or caller)
+
+def formatArgs(args):
+    text = ", ".join(repr(arg) for arg in args)
+
+    if len(text) > MAX_ARGS_LENGTH:
+        text = text[:MAX_ARGS_LENGTH - 3] + "..."
+
+    return text
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Proxy wrappers
+
+class TracedMethod(object):
+    def __init__(self, method, name):
+        self.fMethod = method
+        self._method_name = name
+
+    def __call__(self, *args, **kwargs):
+        tracer = gTracer
+        name   = self._method_name
+        caller, origin = getCallerAndOrigin()
+        argsText  = formatArgs(args)
+        startTime = perf_counter()
+
+        replyHandler = kwargs.get("reply_handler")
+        errorHandler = kwargs.get("error_handler")
+
+        if replyHandler is not None or errorHandler is not None:
+            def tracedReply(*ret):
+                tracer.record(name, argsText, perf_counter() - startTime, False, caller, origin, False)
+                if replyHandler is not None:
+                    replyHandler(*ret)
+
+            def tracedError(error):
+                tracer.record(name, argsText, perf_counter() - startTime, False, caller, origin, True)
+                if errorHandler is not None:
+                    errorHandler(error)
+
+            kwargs["reply_handler"] = tracedReply
+            kwargs["error_handler"] = tracedError
+            return self.fMethod(*args, **kwargs)
+
+        blocking = bool(current_thread() is main_thread())
+
+        try:
+            ret = self.fMethod(*args, **kwargs)
+        except:
+            tracer.record(name, argsText, perf_counter() - startTime, blocking, caller, origin, True)
+            raise
+
+        tracer.record(name, argsText, perf_counter() - startTime, blocking, caller, origin, False)
+        return ret
+
+class TracedProxy(object):
+    def __init__(self, proxy, name):
+        self.fProxy = proxy
+        self.fName  = name
+
+    def __getattr__(self, attr):
+        value = getattr(self.fProxy, attr)
+
+        # regular proxy methods (connect_to_signal, get_dbus_method, etc) are not DBus calls
+        if attr.startswith("_") or hasattr(type(self.fProxy), attr):
+            return value
+
+        return TracedMethod(value, "%s.%s" % (self.fName, attr))
+
+def traceProxy(proxy, name):
+    if gTracer is None or proxy is None:
+        return proxy
+
+    return TracedProxy(proxy, name)
+
+# ---------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+from PyQt6.QtCore import Qt, QRect
+from PyQt6.QtGui import QPainter, QPalette, QPixmap
+from PyQt6.QtWidgets import QWidget
+
+# ---------------------------------------------------------------------------------------------------------------------
+# DSP load history graph
+#
+# Draws into a backing pixmap. A new sample scrolls the pixmap and only draws its own small segment,
+# the full history is only redrawn on resize.
+
+class DspLoadGraph(QWidget):
+    SAMPLE_WIDTH = 2 # pixels per sample
+
+    def __init__(self, parent):
+        QWidget.__init__(self, parent)
+
+        self.fHistory = None
+        self.fPixmap  = QPixmap()
+
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+
+    def setHistory(self, history):
+        self.fHistory = history
+        self.redrawAll()
+
+    def sampleToY(self, dspLoad):
+        height = self.fPixmap.height()
+        return height - 1 - int(min(max(dspLoad, 0.0), 100.0) * (height - 1) / 100.0)
+
+    def drawSample(self, painter, x, previous, current):
+        if previous is not None and current[2] > previous[2]:
+            painter.setPen(Qt.GlobalColor.red)
+            painter.drawLine(x + self.SAMPLE_WIDTH - 1, 0, x + self.SAMPLE_WIDTH - 1, self.fPixmap.height())
+
+        y = self.sampleToY(current[1])
+        painter.setPen(self.palette().color(QPalette.ColorRole.Highlight))
+        painter.drawLine(x, self.sampleToY(previous[1]) if previous is not None else y, x + self.SAMPLE_WIDTH - 1, y)
+
+    def redrawAll(self):
+        if self.width() <= 0 or self.height() <= 0:
+            return
+
+        self.fPixmap = QPixmap(self.size())
+        self.fPixmap.fill(self.palette().color(QPalette.ColorRole.Base))
+
+        if self.fHistory is not None and len(self.fHistory) != 0:
+            samples = self.fHistory.getLastSamples(self.width() // self.SAMPLE_WIDTH + 1)
+            x = self.width() - len(samples) * self.SAMPLE_WIDTH
+
+            painter = QPainter(self.fPixmap)
+            previous = None
+            for sample in samples:
+                self.drawSample(painter, x, previous, sample)
+                previous = sample
+                x += self.SAMPLE_WIDTH
+            painter.end()
+
+        self.update()
+
+    def sampleAdded(self):
+        if self.fPixmap.isNull() or self.fHistory is None or len(self.fHistory) == 0:
+            return
+
+        width = self.fPixmap.width()
+        x     = width - self.SAMPLE_WIDTH
+
+        self.fPixmap.scroll(-self.SAMPLE_WIDTH, 0, self.fPixmap.rect())
+
+        painter = QPainter(self.fPixmap)
+        painter.fillRect(QRect(x, 0, self.SAMPLE_WIDTH, self.fPixmap.height()), self.palette().color(QPalette.ColorRole.Base))
+        self.drawSample(painter, x, self.fHistory.getSample(-2) if len(self.fHistory) > 1 else None, self.fHistory.getSample(-1))
+        painter.end()
+
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.drawPixmap(event.rect(), self.fPixmap, event.rect())
+
+    def resizeEvent(self, event):
+        QWidget.resizeEvent(self, event)
+        self.redrawAll()
+
+# ---------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+import os
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from tempfile import NamedTemporaryFile
+from threading import Thread
+from time import monotonic
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Metrics exporter
+#
+# Publishes the last sampled JACK stats snapshot as OpenMetrics text, either through a small HTTP server on localhost
+# or by (atomically) writing a file for node_exporter's textfile collector (in the older Prometheus text format).
+# Scrapes only read the last snapshot, they never cause DBus calls by themselves.
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+TEXTFILE_MIN_INTERVAL = 5.0 # seconds
+
+def formatMetrics(stats, openMetrics=True):
+    if stats is None:
+        return "# EOF\n" if openMetrics else ""
+
+    metrics = (
+        ("jack_up",                    "gauge",   "Whether the JACK server is started",       int(stats.started)),
+        ("jack_realtime",              "gauge",   "Whether JACK runs in realtime mode",       int(stats.realtime)),
+        ("jack_dsp_load_percent",      "gauge",   "JACK DSP load, in percent",                "%f" % stats.dspLoad),
+        ("jack_xruns",                 "counter", "Number of xruns since the server started", stats.xruns),
+        ("jack_buffer_size_frames",    "gauge",   "JACK buffer size",                         stats.bufferSize),
+        ("jack_sample_rate_hertz",     "gauge",   "JACK sample rate",                         stats.sampleRate),
+        ("jack_latency_seconds",       "gauge",   "JACK latency",                             "%f" % (stats.latency / 1000.0)),
+        ("jack_last_sample_timestamp", "gauge",   "When these stats were sampled, unix time", "%f" % stats.time),
+    )
+
+    lines = []
+
+    for name, metricType, description, value in metrics:
+        sampleName = name + "_total" if metricType == "counter" else name
+
+        # OpenMetrics describes counters without their "_total" suffix, the older Prometheus format does not
+        if not openMetrics:
+            name = sampleName
+
+        lines.append("# TYPE %s %s" % (name, metricType))
+        lines.append("# HELP %s %s" % (name, description))
+        lines.append("%s %s" % (sampleName, value))
+
+    if openMetrics:
+        lines.append("# EOF")
+
+    return "\n".join(lines) + "\n"
+
+# ---------------------------------------------------------------------------------------------------------------------
+# HTTP server
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+
+        body = formatMetrics(self.server.fExporter.getStats()).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Exporter
+
+class MetricsExporter(object):
+    def __init__(self, port=None, textfile=None, host="127.0.0.1"):
+        self.fStats        = None
+        self.fServer       = None
+        self.fTextfile     = textfile
+        self.fLastTextfile = 0.0
+
+        if port is not None:
+            self.fServer = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+            self.fServer.daemon_threads = True
+            self.fServer.fExporter = self
+            Thread(target=self.fServer.serve_forever, name="j2sc-metrics", daemon=True).start()
+
+    def getStats(self):
+        return self.fStats
+
+    def setStats(self, stats):
+        # snapshots are immutable, so a plain reference swap is enough for the server thread
+        self.fStats = stats
+
+        if self.fTextfile is not None and monotonic() - self.fLastTextfile >= TEXTFILE_MIN_INTERVAL:
+            self.fLastTextfile = monotonic()
+            self.writeTextfile()
+
+    def writeTextfile(self):
+        textfileDir = os.path.dirname(os.path.abspath(self.fTextfile))
+
+        try:
+            with NamedTemporaryFile("w", dir=textfileDir, prefix=".j2sc-", suffix=".tmp", delete=False) as fd:
+                fd.write(formatMetrics(self.fStats, False))
+            os.chmod(fd.name, 0o644)
+            os.replace(fd.name, self.fTextfile)
+        except OSError as error:
+            print("MetricsExporter::writeTextfile() - Failed to write '%s': %s" % (self.fTextfile, error))
+
+    def close(self):
+        if self.fServer is not None:
+            self.fServer.shutdown()
+            self.fServer.server_close()
+            self.fServer = None
+
+# ---------------------------------------------------------------------------------------------------------------------
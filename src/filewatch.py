@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+
+# ---------------------------------------------------------------------------------------------------------------------
+# inotify based file watcher (Linux only)
+#
+# Each file is watched for writes, moves and deletion, and its parent directory for files being created or moved in,
+# so log rotation and files (re)appearing later are noticed too. wait() blocks without any CPU use until something
+# happens or wakeUp() is called from another thread.
+# createFileWatcher() returns None where inotify is not available, callers are expected to fall back to polling.
+
+IN_MODIFY      = 0x00000002
+IN_MOVED_TO    = 0x00000080
+IN_CREATE      = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF   = 0x00000800
+IN_IGNORED     = 0x00008000
+IN_NONBLOCK    = 0o0004000
+IN_CLOEXEC     = 0o2000000
+
+FILE_EVENTS = IN_MODIFY | IN_MOVE_SELF | IN_DELETE_SELF
+DIR_EVENTS  = IN_CREATE | IN_MOVED_TO
+
+EVENT_HEADER = struct.Struct("iIII")
+
+try:
+    gLibC = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    gLibC.inotify_init1.argtypes = [ctypes.c_int]
+    gLibC.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    gLibC.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+except (OSError, AttributeError):
+    gLibC = None
+
+class FileWatcher(object):
+    def __init__(self):
+        self.fFd = gLibC.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+
+        if self.fFd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+        self.fWakeRead, self.fWakeWrite = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+
+        self.fFileWatches = {} # wd -> path
+        self.fDirWatches  = {} # wd -> (dir, set of watched basenames)
+
+        self.fPoller = select.poll()
+        self.fPoller.register(self.fFd, select.POLLIN)
+        self.fPoller.register(self.fWakeRead, select.POLLIN)
+
+    def addWatch(self, path, mask):
+        wd = gLibC.inotify_add_watch(self.fFd, os.fsencode(path), mask)
+
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), path)
+
+        return wd
+
+    def watchFile(self, path):
+        for wd, watchedPath in list(self.fFileWatches.items()):
+            if watchedPath == path:
+                gLibC.inotify_rm_watch(self.fFd, wd)
+                del self.fFileWatches[wd]
+
+        try:
+            self.fFileWatches[self.addWatch(path, FILE_EVENTS)] = path
+        except OSError as error:
+            # not there right now, the directory watch will tell when it shows up
+            if error.errno != errno.ENOENT:
+                raise
+
+    def addFile(self, path):
+        path = os.path.abspath(path)
+        dirname, basename = os.path.split(path)
+
+        wd = self.addWatch(dirname, DIR_EVENTS)
+        self.fDirWatches.setdefault(wd, (dirname, set()))[1].add(basename)
+
+        self.watchFile(path)
+
+    def wakeUp(self):
+        try:
+            os.write(self.fWakeWrite, b"\0")
+        except BlockingIOError:
+            pass
+
+    # Returns a dict of path -> replaced, for files that changed.
+    # "replaced" means the file was moved, deleted or (re)created, so it needs to be opened again.
+    # Empty when woken up or timed out (timeout in ms, None waits forever).
+    def wait(self, timeout=None):
+        changes = {}
+
+        for fd, event in self.fPoller.poll(timeout):
+            if fd == self.fWakeRead:
+                try:
+                    while os.read(self.fWakeRead, 64):
+                        pass
+                except BlockingIOError:
+                    pass
+                continue
+
+            try:
+                data = os.read(self.fFd, 64 * 1024)
+            except BlockingIOError:
+                continue
+
+            offset = 0
+
+            while offset < len(data):
+                wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b"\0")
+                offset += EVENT_HEADER.size + length
+
+                if wd in self.fDirWatches:
+                    dirname, basenames = self.fDirWatches[wd]
+                    name = os.fsdecode(name)
+
+                    if name in basenames:
+                        path = os.path.join(dirname, name)
+                        self.watchFile(path)
+                        changes[path] = True
+
+                elif wd in self.fFileWatches:
+                    path = self.fFileWatches[wd]
+
+                    if mask & (IN_MOVE_SELF | IN_DELETE_SELF | IN_IGNORED):
+                        if mask & IN_IGNORED:
+                            del self.fFileWatches[wd]
+                        else:
+                            self.watchFile(path)
+                        changes[path] = True
+                    else:
+                        changes.setdefault(path, False)
+
+        return changes
+
+    def close(self):
+        if self.fFd < 0:
+            return
+
+        os.close(self.fFd)
+        os.close(self.fWakeRead)
+        os.close(self.fWakeWrite)
+        self.fFd = -1
+
+def createFileWatcher(paths):
+    if gLibC is None or not hasattr(gLibC, "inotify_init1"):
+        return None
+
+    try:
+        watcher = FileWatcher()
+    except OSError as error:
+        print("createFileWatcher() - inotify not available: %s" % error)
+        return None
+
+    try:
+        for path in paths:
+            watcher.addFile(path)
+    except OSError as error:
+        print("createFileWatcher() - Failed to watch '%s': %s" % (error.filename, error))
+        watcher.close()
+        return None
+
+    return watcher
+
+# ---------------------------------------------------------------------------------------------------------------------
@@ -5,25 +5,31 @@
 # ------------------------------------------------------------------------------------------------------------
 # Imports (Global)
 
+import json
 import os
 import sys
 
-from time import sleep
+from signal import SIGKILL, SIGTERM
+from time import monotonic, strftime
 
-from PyQt6.QtCore import pyqtSignal, pyqtSlot, Qt, QMetaObject, QProcess, QSemaphore, QSettings, QThread, QTimer
-from PyQt6.QtGui import QIcon
+# startup is measured from here, before loading Qt
+STARTUP_TIME = monotonic()
+
+from PyQt6.QtCore import pyqtSignal, pyqtSlot, Qt, QEvent, QMetaObject, QSettings, QThread, QTimer
+from PyQt6.QtGui import QIcon, QKeySequence, QShortcut
 from PyQt6.QtWidgets import QDialog, QMainWindow, QMessageBox
 
 # ------------------------------------------------------------------------------------------------------------
 # Imports (Custom Stuff)
 
-from logs import LogsW
-from shared import VERSION, setUpSignals
+# NOTE: logs, settings, statsdb, exporter, procs and the force-restart dialog UI are imported on first use
+
+from dbustrace import enableTracing, getTracer, traceProxy
+from jackcontrol import initBus
+from shared import VERSION, getDataDir, setUpSignals
+from stats import JackStatsHistory, JackStatsSampler
 
-import settings
 import ui_j2sc
-import ui_j2sc_tb_a2j
-import ui_j2sc_rwait
 
 # ------------------------------------------------------------------------------------------------------------
 # Try Import DBus
@@ -46,38 +52,23 @@ except:
 DEBUG = bool("-d" in sys.argv or "-debug" in sys.argv or "--debug" in sys.argv)
 
 # ------------------------------------------------------------------------------------------------------------
-# Get Process list
-
-def getProcList():
-    retProcs = []
-
-    process = QProcess()
-    process.start("ps", ["-u", str(os.getuid())])
-    process.waitForFinished()
+# Get value of a command-line option, as in "--option value"
 
-    processDump = process.readAllStandardOutput().split(b"\n")
+def getArgValue(option):
+    try:
+        return sys.argv[sys.argv.index(option) + 1]
+    except (ValueError, IndexError):
+        return None
 
-    for i in range(len(processDump)):
-        if (i == 0): continue
-        dumpTest = str(processDump[i], encoding="utf-8").rsplit(":", 1)[-1].split(" ")
-        if len(dumpTest) > 1 and dumpTest[1]:
-            retProcs.append(dumpTest[1])
+# ------------------------------------------------------------------------------------------------------------
+# Timeout for calls that start or stop the server, in seconds (driver init can be slow)
 
-    return retProcs
+DBUS_START_TIMEOUT = 120
 
 # ------------------------------------------------------------------------------------------------------------
-# Stop all audio processes, used for force-restart
+# Time allowed from process start until the main window is painted, in seconds (only checked with --debug)
 
-def waitProcsEnd(procs, tries):
-    for x in range(tries):
-        procsList = getProcList()
-        for proc in procs:
-            if proc in procsList:
-                break
-            else:
-                sleep(0.1)
-        else:
-            break
+STARTUP_BUDGET = 0.5
 
 # ------------------------------------------------------------------------------------------------------------
 # Cleanly close the jack dbus service
@@ -94,23 +85,23 @@ def tryCloseJackDBus():
 # ------------------------------------------------------------------------------------------------------------
 # Stop all audio processes, used for force-restart
 
+AUDIO_PROCS_TERM = ["a2j", "a2jmidid", "artsd", "jackd", "jackdmp", "knotify4", "lash", "ladishd", "ladiappd", "ladiconfd", "jmcore"]
+AUDIO_PROCS_KILL = ["jackdbus", "pulseaudio"]
+
 def stopAllAudioProcesses(tryCloseJack = True):
+    from procs import terminateProcs
+
     if tryCloseJack:
         tryCloseJackDBus()
 
-    process = QProcess()
-
-    procsTerm = ["a2j", "a2jmidid", "artsd", "jackd", "jackdmp", "knotify4", "lash", "ladishd", "ladiappd", "ladiconfd", "jmcore"]
-    procsKill = ["jackdbus", "pulseaudio"]
-    tries     = 20
+    report  = terminateProcs(AUDIO_PROCS_TERM, SIGTERM)
+    report += terminateProcs(AUDIO_PROCS_KILL, SIGKILL)
 
-    process.start("killall", procsTerm)
-    process.waitForFinished()
-    waitProcsEnd(procsTerm, tries)
+    if DEBUG:
+        for name, pid, result, seconds in report:
+            print("stopAllAudioProcesses() - %s (%i) %s after %.3fs" % (name, pid, result, seconds))
 
-    process.start("killall", ["-KILL"] + procsKill)
-    process.waitForFinished()
-    waitProcsEnd(procsKill, tries)
+    return report
 
 # ------------------------------------------------------------------------------------------------------------
 # Custom MessageBox
@@ -142,128 +133,240 @@ gDBus.bus = None
 gDBus.a2j = None
 gDBus.jack = None
 
+# ------------------------------------------------------------------------------------------------------------
+# Non-blocking DBus calls
+#
+# The reply (or error) is delivered later from the main loop, so the GUI never waits on jackdbus or a2j.
+# Needs a DBus main loop integration, which is always set up when running j2sc.
+
+def callAsync(method, *args, callback=None, errback=None, timeout=-1):
+    def replyHandler(*ret):
+        if callback is not None:
+            callback(*ret)
+
+    def errorHandler(error):
+        if DEBUG: print("DBus call '%s' failed: %s" % (getattr(method, "_method_name", "?"), error))
+        if errback is not None:
+            errback(error)
+
+    method(*args, reply_handler=replyHandler, error_handler=errorHandler, timeout=timeout)
+
+# The bus daemon replies with these when a service is not installed, or failed to be activated
+def isServiceMissing(error):
+    name = error.get_dbus_name() or ""
+    return name == "org.freedesktop.DBus.Error.ServiceUnknown" or name.startswith("org.freedesktop.DBus.Error.Spawn.")
+
 # ---------------------------------------------------------------------
 
-# Wait while JACK restarts
+# Kill all audio processes, in a separate thread so the GUI keeps going
 class ForceRestartThread(QThread):
-    progressChanged = pyqtSignal(int)
-
     def __init__(self, parent):
         QThread.__init__(self, parent)
 
-        self.m_wasStarted = False
+        self.m_report = []
 
-        self.pendingCall = None
-        self.pendingWaiter = QSemaphore(0)
+    def getReport(self):
+        return self.m_report
 
-    def wasJackStarted(self):
-        return self.m_wasStarted
+    def run(self):
+        self.m_report = stopAllAudioProcesses(False)
 
-    def startA2J(self):
-        if not gDBus.a2j.get_hw_export() and QSettings().value("A2J/AutoExport", True, type=bool):
-            gDBus.a2j.set_hw_export(True)
-        gDBus.a2j.start()
+# Force Restart Dialog
+# Each restart step is started by the event that ends the previous one (DBus replies, jackdbus appearing on the bus,
+# the JackControl ServerStarted signal, kill thread finished), so there is no polling involved.
+class ForceWaitDialog(QDialog):
+    STATE_EXIT    = 0
+    STATE_KILL    = 1
+    STATE_WAIT    = 2
+    STATE_START   = 3
+    STATE_A2J     = 4
+    STATE_DONE    = 5
 
-    def runInMainThread(self, call):
-        self.pendingCall = call
-        self.pendingWaiter.acquire()
+    def __init__(self, parent):
+        import ui_j2sc_rwait
 
-    def run(self):
-        # Not started yet
+        QDialog.__init__(self, parent)
+        self.ui = ui_j2sc_rwait.Ui_Dialog()
+        self.ui.setupUi(self)
+        self.setWindowFlags(Qt.WindowType.Dialog|Qt.WindowType.WindowCloseButtonHint)
+
+        self.m_state = self.STATE_EXIT
         self.m_wasStarted = False
-        self.progressChanged.emit(0)
+        self.m_finished = False
 
-        # Stop JACK safely first, if possible
-        self.runInMainThread(tryCloseJackDBus)
-        self.progressChanged.emit(20)
+        self.m_phaseName  = None
+        self.m_phaseStart = 0.0
+        self.m_phaseTimes = []
 
-        # Kill All
-        stopAllAudioProcesses(False)
-        self.progressChanged.emit(30)
+        self.rThread = ForceRestartThread(self)
+        self.rThread.finished.connect(self.slot_rThreadFinished)
 
-        # Connect to jackdbus
-        self.runInMainThread(self.parent().DBusReconnect)
+        parent.DBusJackServiceAppearedCallback.connect(self.slot_jackServiceAppeared)
+        parent.DBusJackServerStartedCallback.connect(self.slot_jackServerStarted)
 
-        if not gDBus.jack:
-            return
+        QTimer.singleShot(0, self.stepExit)
 
-        for x in range(30):
-            self.progressChanged.emit(30 + x * 2)
-            procsList = getProcList()
-            if "jackdbus" in procsList:
-                break
-            else:
-                sleep(0.1)
+    def wasJackStarted(self):
+        return self.m_wasStarted
 
-        self.progressChanged.emit(90)
+    # -----------------------------------------------------------------
+    # Phase timing
 
-        # Start it
-        self.runInMainThread(gDBus.jack.StartServer)
-        self.progressChanged.emit(93)
+    def beginPhase(self, name):
+        now = monotonic()
 
-        # If we made it this far, then JACK is started
-        self.m_wasStarted = True
+        if self.m_phaseName is not None:
+            self.m_phaseTimes.append((self.m_phaseName, now - self.m_phaseStart))
+            self.ui.label_phases.setText(self.getPhasesText())
 
-        # Start bridges according to user settings
+        self.m_phaseName  = name
+        self.m_phaseStart = now
 
-        self.progressChanged.emit(94)
+    def getPhasesText(self):
+        lines = ["%s: %i ms" % (name, seconds * 1000) for name, seconds in self.m_phaseTimes]
+        lines.append("Total: %i ms" % (sum(seconds for name, seconds in self.m_phaseTimes) * 1000))
+        return "\n".join(lines)
 
-        # ALSA-MIDI
-        if QSettings().value("A2J/AutoStart", True, type=bool) and gDBus.a2j and not bool(gDBus.a2j.is_started()):
-            self.runInMainThread(self.startA2J)
+    def saveHistory(self):
+        entry = {
+            "time": strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "host": os.uname().nodename,
+            "version": VERSION,
+            "started": self.m_wasStarted,
+            "phases": dict(self.m_phaseTimes),
+        }
 
-        self.progressChanged.emit(100)
+        try:
+            with open(os.path.join(getDataDir(), "restart-history.jsonl"), "a") as fd:
+                fd.write(json.dumps(entry) + "\n")
+        except OSError as error:
+            print("ForceWaitDialog::saveHistory() - Failed to write restart history: %s" % error)
 
-# Force Restart Dialog
-class ForceWaitDialog(QDialog, ui_j2sc_rwait.Ui_Dialog):
-    def __init__(self, parent):
-        QDialog.__init__(self, parent)
-        self.setupUi(self)
-        self.setWindowFlags(Qt.WindowType.Dialog|Qt.WindowType.WindowCloseButtonHint)
+    # -----------------------------------------------------------------
+    # Restart steps
 
-        self.pendingTimer = self.startTimer(100)
+    # Stop JACK safely first, if possible
+    def stepExit(self):
+        self.ui.progressBar.setValue(0)
+        self.beginPhase("DBus Exit")
 
-        self.rThread = ForceRestartThread(self)
-        self.rThread.progressChanged.connect(self.progressBar.setValue)
-        self.rThread.finished.connect(self.slot_rThreadFinished)
+        if gDBus.jack:
+            callAsync(gDBus.jack.Exit, callback=self.stepKill, errback=self.stepKill, timeout=5)
+        else:
+            self.stepKill()
+
+    # Kill All
+    def stepKill(self, *ignored):
+        if self.m_state != self.STATE_EXIT:
+            return
+
+        self.m_state = self.STATE_KILL
+        self.ui.progressBar.setValue(20)
+        self.beginPhase("Kill")
         self.rThread.start()
 
-    def DBusReconnect(self):
+    @pyqtSlot()
+    def slot_rThreadFinished(self):
+        if self.m_state != self.STATE_KILL:
+            return
+
+        self.ui.progressBar.setValue(30)
+        self.m_state = self.STATE_WAIT
+
+        # Reconnecting only creates the proxies, DBus activation is triggered by the first call made through them,
+        # so the time until jackdbus shows up on the bus is all activation
+        self.beginPhase("jackdbus activation")
         self.parent().DBusReconnect()
 
+        if not gDBus.jack:
+            self.finish()
+            return
+
+        # Either NameOwnerChanged or this reply tells us jackdbus is up, whatever comes first
+        callAsync(gDBus.jack.IsStarted, callback=lambda started: self.slot_jackServiceAppeared(), errback=lambda error: self.finish())
+        self.ui.progressBar.setValue(60)
+
+    # Start it
     @pyqtSlot()
-    def slot_rThreadFinished(self):
+    def slot_jackServiceAppeared(self):
+        if self.m_state != self.STATE_WAIT:
+            return
+
+        self.m_state = self.STATE_START
+        self.ui.progressBar.setValue(90)
+        self.beginPhase("StartServer")
+
+        callAsync(gDBus.jack.StartServer, callback=self.slot_jackServerStarted, errback=lambda error: self.finish(),
+                  timeout=DBUS_START_TIMEOUT)
+
+    # Start bridges according to user settings
+    @pyqtSlot()
+    def slot_jackServerStarted(self):
+        if self.m_state != self.STATE_START:
+            return
+
+        # If we made it this far, then JACK is started
+        self.m_wasStarted = True
+        self.m_state = self.STATE_A2J
+        self.ui.progressBar.setValue(94)
+
+        # ALSA-MIDI
+        if QSettings().value("A2J/AutoStart", True, type=bool) and gDBus.a2j:
+            self.beginPhase("a2j start")
+            callAsync(gDBus.a2j.is_started, callback=self.a2jStateReceived, errback=lambda error: self.finish())
+        else:
+            self.finish()
+
+    def a2jStateReceived(self, started):
+        if started:
+            self.finish()
+        elif QSettings().value("A2J/AutoExport", True, type=bool):
+            callAsync(gDBus.a2j.get_hw_export, callback=self.a2jExportReceived, errback=lambda error: self.finish())
+        else:
+            callAsync(gDBus.a2j.start, callback=self.finish, errback=lambda error: self.finish())
+
+    def a2jExportReceived(self, exported):
+        if not exported:
+            callAsync(gDBus.a2j.set_hw_export, True)
+        callAsync(gDBus.a2j.start, callback=self.finish, errback=lambda error: self.finish())
+
+    def finish(self):
+        if self.m_state == self.STATE_DONE:
+            return
+
+        self.m_state = self.STATE_DONE
+        self.m_finished = True
+        self.ui.progressBar.setValue(100)
+        self.beginPhase(None)
+        self.saveHistory()
         self.close()
 
-        if self.rThread.wasJackStarted():
-            QMessageBox.information(self, self.tr("Info"), self.tr("JACK was re-started sucessfully"))
+    # Run by the main window once the dialog is closed
+    def showResult(self):
+        if not self.m_finished:
+            return
+
+        if self.m_wasStarted:
+            CustomMessageBox(self, QMessageBox.Icon.Information, self.tr("Info"), self.tr("JACK was re-started sucessfully"),
+                             self.getPhasesText(), QMessageBox.StandardButton.Ok, QMessageBox.StandardButton.Ok)
         else:
-            QMessageBox.critical(self, self.tr("Error"), self.tr("Could not start JACK!"))
+            CustomMessageBox(self, QMessageBox.Icon.Critical, self.tr("Error"), self.tr("Could not start JACK!"),
+                             self.getPhasesText(), QMessageBox.StandardButton.Ok, QMessageBox.StandardButton.Ok)
 
     def closeEvent(self, event):
-        self.killTimer(self.pendingTimer)
+        self.m_state = self.STATE_DONE
+
+        self.parent().DBusJackServiceAppearedCallback.disconnect(self.slot_jackServiceAppeared)
+        self.parent().DBusJackServerStartedCallback.disconnect(self.slot_jackServerStarted)
 
         if self.rThread.isRunning():
             self.rThread.terminate()
 
         QDialog.closeEvent(self, event)
 
-    def timerEvent(self, event):
-        if event.timerId() == self.pendingTimer and self.rThread.pendingCall is not None:
-            try:
-                self.rThread.pendingCall()
-            except:
-                try:
-                    self.rThread.pendingCall()
-                except:
-                    pass
-            self.rThread.pendingCall = None
-            self.rThread.pendingWaiter.release()
-
-        QDialog.timerEvent(self, event)
-
 # Main Window
 class CadenceMainW(QMainWindow, ui_j2sc.Ui_CadenceMainW):
+    DBusJackServiceAppearedCallback = pyqtSignal()
     DBusJackServerStartedCallback = pyqtSignal()
     DBusJackServerStoppedCallback = pyqtSignal()
     DBusA2JBridgeStartedCallback = pyqtSignal()
@@ -311,88 +414,181 @@ class CadenceMainW(QMainWindow, ui_j2sc.Ui_CadenceMainW):
 
         # -------------------------------------------------------------
 
+        self.m_jackStarted = False
+
         self.m_last_dsp_load = None
         self.m_last_xruns    = None
         self.m_last_buffer_size = None
+        self.m_last_realtime = None
 
         self.m_logs = None
+        self.m_dbusTrace = None
+        self.m_forceRestarting = False
+
+        if getTracer() is not None:
+            QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.slot_showDBusTrace)
+            print("DBus tracing enabled, press Ctrl+Shift+D to show the trace panel")
+
+        self.m_history = JackStatsHistory()
+        self.graph_jack_dsp.setHistory(self.m_history)
+
+        # opened after the first paint, see slot_deferredInit
+        self.m_store = None
+
+        # Optional metrics exporter, enabled with --metrics-port and/or --metrics-textfile
+        metricsPort     = getArgValue("--metrics-port")
+        metricsTextfile = getArgValue("--metrics-textfile")
+
+        self.m_exporter = None
+
+        if metricsPort or metricsTextfile:
+            from exporter import MetricsExporter
+
+            # a bad port or one already in use should not keep j2sc from starting
+            try:
+                self.m_exporter = MetricsExporter(int(metricsPort) if metricsPort else None, metricsTextfile)
+            except (ValueError, OSError) as error:
+                print("CadenceMainW::__init__() - Failed to start metrics exporter, running without it: %s" % error)
+
+        self.m_sampler = JackStatsSampler(self)
+        self.m_sampler.statsChanged.connect(self.slot_statsChanged)
+
+        self.m_signalCount = 0
+
+        self.m_monitoring = True
+        self.m_exposeFilterInstalled = False
+
+        # -------------------------------------------------------------
+        # Connect to DBus only after the window got painted once
+
+        self.m_deferredInitDone = False
+        self.m_connectTime = None
 
-        self.m_timer500  = None
-        self.m_timer2000 = self.startTimer(2000)
+        self.label_jack_status.setText("Connecting...")
+        self.groupBox_jack.setEnabled(False)
+        self.toolBox_alsamidi.setEnabled(False)
 
+        # in case the window is never exposed (e.g. started minimized)
+        QTimer.singleShot(int(STARTUP_BUDGET * 2000), self.slot_deferredInit)
+
+    @pyqtSlot()
+    def slot_deferredInit(self):
+        if self.m_deferredInitDone:
+            return
+
+        self.m_deferredInitDone = True
+        paintTime = monotonic()
+
+        if DEBUG:
+            print("Startup: first paint after %i ms (budget is %i ms)" % ((paintTime - STARTUP_TIME) * 1000, STARTUP_BUDGET * 1000))
+            if paintTime - STARTUP_TIME > STARTUP_BUDGET:
+                print("Startup: over budget!")
+
+        try:
+            from statsdb import JackStatsStore
+            self.m_store = JackStatsStore()
+        except Exception as error:
+            print("Failed to open JACK stats store: %s" % error)
+            self.m_store = None
+
+        self.groupBox_jack.setEnabled(True)
+        self.toolBox_alsamidi.setEnabled(True)
+
+        if haveDBus:
+            self.DBusAddSignalReceivers()
+
+        # only sends the first calls, replies (and DBus activation of jackdbus) come later through the main loop
+        self.m_connectTime = monotonic()
         self.DBusReconnect()
 
         if haveDBus:
-            gDBus.bus.add_signal_receiver(self.DBusSignalReceiver, destination_keyword='dest', path_keyword='path',
-                member_keyword='member', interface_keyword='interface', sender_keyword='sender', )
+            self.m_sampler.start(QThread.Priority.LowPriority)
+
+        if DEBUG: print("Startup: DBus set up after %i ms" % ((monotonic() - paintTime) * 1000))
+
+    def startupConnected(self):
+        if self.m_connectTime is None:
+            return
 
-        # keep application responsive, otherwise Ctrl+C does nothing
-        self.startTimer(100)
+        if DEBUG: print("Startup: jackdbus answered after %i ms" % ((monotonic() - self.m_connectTime) * 1000))
+        self.m_connectTime = None
 
+    # Proxies follow name owner changes, so creating them does not wait for DBus activation.
+    # Activation gets triggered by the first call, missing services show up as errors in the replies.
     def DBusReconnect(self):
         if haveDBus:
             try:
-                gDBus.jack = gDBus.bus.get_object("org.jackaudio.service", "/org/jackaudio/Controller")
-                settings.initBus(gDBus.bus)
+                gDBus.jack = traceProxy(gDBus.bus.get_object("org.jackaudio.service", "/org/jackaudio/Controller",
+                                                             follow_name_owner_changes=True), "jack")
+                initBus(gDBus.bus, True)
             except:
                 gDBus.jack = None
 
             try:
-                gDBus.a2j = dbus.Interface(gDBus.bus.get_object("org.gna.home.a2jmidid", "/"), "org.gna.home.a2jmidid.control")
+                gDBus.a2j = traceProxy(dbus.Interface(gDBus.bus.get_object("org.gna.home.a2jmidid", "/", follow_name_owner_changes=True),
+                                                      "org.gna.home.a2jmidid.control"), "a2j")
             except:
                 gDBus.a2j = None
 
         if gDBus.jack:
-            if gDBus.jack.IsStarted():
-                self.jackStarted()
-
-            else:
-                self.jackStopped()
-                if settings.isRealtime():
-                    self.label_jack_realtime.setText("Yes")
-                    self.label_jack_realtime_ico.setPixmap(self.pix_apply)
-                else:
-                    self.label_jack_realtime.setText("No")
-                    self.label_jack_realtime_ico.setPixmap(self.pix_cancel)
+            callAsync(gDBus.jack.IsStarted, callback=self.jackStateReceived, errback=self.jackStateFailed)
         else:
-            self.jackStopped()
-            self.label_jack_status.setText("Unavailable")
-            self.label_jack_status_ico.setPixmap(self.pix_error)
-            self.label_jack_realtime.setText("Unknown")
-            self.label_jack_realtime_ico.setPixmap(self.pix_error)
-            self.groupBox_jack.setEnabled(False)
-            self.groupBox_jack.setTitle("-- jackdbus is not available --")
-            self.b_jack_start.setEnabled(False)
-            self.b_jack_stop.setEnabled(False)
-            self.b_jack_restart.setEnabled(False)
-            self.b_jack_configure.setEnabled(False)
-            self.b_jack_switchmaster.setEnabled(False)
-            self.toolBox_alsamidi.setEnabled(False)
+            self.jackUnavailable()
 
         if gDBus.a2j:
-            try:
-                started = gDBus.a2j.is_started()
-            except:
-                started = False
-
-            if started:
-                self.a2jStarted()
-            else:
-                self.a2jStopped()
+            callAsync(gDBus.a2j.is_started, callback=self.a2jStateReceived, errback=self.a2jStateFailed)
         else:
-            self.toolBox_alsamidi.setEnabled(False)
-            self.cb_a2j_autostart.setChecked(False)
-            self.cb_a2j_autoexport.blockSignals(True)
-            self.cb_a2j_autoexport.setChecked(False)
-            self.cb_a2j_autoexport.blockSignals(False)
-            self.label_bridge_a2j.setText("ALSA MIDI Bridge is not installed")
-            QSettings().setValue("A2J/AutoStart", False)
+            self.a2jUnavailable()
+
+    def jackUnavailable(self):
+        self.jackStopped()
+        self.label_jack_status.setText("Unavailable")
+        self.label_jack_status_ico.setPixmap(self.pix_error)
+        self.label_jack_realtime.setText("Unknown")
+        self.label_jack_realtime_ico.setPixmap(self.pix_error)
+        self.groupBox_jack.setEnabled(False)
+        self.groupBox_jack.setTitle("-- jackdbus is not available --")
+        self.b_jack_start.setEnabled(False)
+        self.b_jack_stop.setEnabled(False)
+        self.b_jack_restart.setEnabled(False)
+        self.b_jack_configure.setEnabled(False)
+        self.b_jack_switchmaster.setEnabled(False)
+        self.toolBox_alsamidi.setEnabled(False)
+
+    def a2jUnavailable(self):
+        self.toolBox_alsamidi.setEnabled(False)
+        self.cb_a2j_autostart.setChecked(False)
+        self.cb_a2j_autoexport.blockSignals(True)
+        self.cb_a2j_autoexport.setChecked(False)
+        self.cb_a2j_autoexport.blockSignals(False)
+        self.label_bridge_a2j.setText("ALSA MIDI Bridge is not installed")
+        QSettings().setValue("A2J/AutoStart", False)
+
+    # Only subscribe to what we care about, so the bus daemon filters everything else out for us
+    def DBusAddSignalReceivers(self):
+        keywords = { 'path_keyword': 'path', 'member_keyword': 'member', 'interface_keyword': 'interface' }
+
+        for busName in ("org.jackaudio.service", "org.gna.home.a2jmidid"):
+            gDBus.bus.add_signal_receiver(self.DBusSignalReceiver, "NameOwnerChanged", "org.freedesktop.DBus",
+                "org.freedesktop.DBus", "/org/freedesktop/DBus", arg0=busName, **keywords)
+
+        gDBus.bus.add_signal_receiver(self.DBusSignalReceiver, dbus_interface="org.jackaudio.JackControl",
+            path="/org/jackaudio/Controller", **keywords)
+        gDBus.bus.add_signal_receiver(self.DBusSignalReceiver, dbus_interface="org.gna.home.a2jmidid.control",
+            path="/", **keywords)
 
     def DBusSignalReceiver(self, *args, **kwds):
+        self.m_signalCount += 1
+        if DEBUG: print("DBus signal #%i: %s.%s" % (self.m_signalCount, kwds['interface'], kwds['member']))
+
         if kwds['interface'] == "org.freedesktop.DBus" and kwds['path'] == "/org/freedesktop/DBus" and kwds['member'] == "NameOwnerChanged":
             appInterface, appId, newId = args
 
-            if not newId:
+            if newId:
+                if appInterface == "org.jackaudio.service":
+                    self.DBusJackServiceAppearedCallback.emit()
+
+            else:
                 # Something crashed
                 if appInterface == "org.jackaudio.service":
                     QTimer.singleShot(0, self.slot_handleCrash_jack)
@@ -400,24 +596,59 @@ class CadenceMainW(QMainWindow, ui_j2sc.Ui_CadenceMainW):
                     QTimer.singleShot(0, self.slot_handleCrash_a2j)
 
         elif kwds['interface'] == "org.jackaudio.JackControl":
-            if DEBUG: print("org.jackaudio.JackControl", kwds['member'])
             if kwds['member'] == "ServerStarted":
                 self.DBusJackServerStartedCallback.emit()
             elif kwds['member'] == "ServerStopped":
                 self.DBusJackServerStoppedCallback.emit()
 
         elif kwds['interface'] == "org.gna.home.a2jmidid.control":
-            if DEBUG: print("org.gna.home.a2jmidid.control", kwds['member'])
             if kwds['member'] == "bridge_started":
                 self.DBusA2JBridgeStartedCallback.emit()
             elif kwds['member'] == "bridge_stopped":
                 self.DBusA2JBridgeStoppedCallback.emit()
 
-    def jackStarted(self):
-        self.m_last_dsp_load = gDBus.jack.GetLoad()
-        self.m_last_xruns    = int(gDBus.jack.GetXruns())
-        self.m_last_buffer_size = gDBus.jack.GetBufferSize()
+    def jackStateReceived(self, started):
+        self.startupConnected()
+
+        if started:
+            self.jackStarted()
+        else:
+            self.jackStopped()
+
+            # while stopped, show what the server is configured to use
+            callAsync(gDBus.jack.GetParameterValue, ["engine", "realtime"],
+                      callback=lambda isSet, default, value: self.setRealtimeLabel(bool(value)),
+                      errback=lambda error: self.setRealtimeLabel(False))
+
+    def a2jStateReceived(self, started):
+        if started:
+            self.a2jStarted()
+        else:
+            self.a2jStopped()
+
+    def jackStateFailed(self, error):
+        self.startupConnected()
+
+        if isServiceMissing(error):
+            self.jackUnavailable()
+        else:
+            self.jackStopped()
+
+    def a2jStateFailed(self, error):
+        if isServiceMissing(error):
+            self.a2jUnavailable()
+        else:
+            self.a2jStopped()
 
+    def setRealtimeLabel(self, realtime):
+        if realtime:
+            self.label_jack_realtime.setText("Yes")
+            self.label_jack_realtime_ico.setPixmap(self.pix_apply)
+        else:
+            self.label_jack_realtime.setText("No")
+            self.label_jack_realtime_ico.setPixmap(self.pix_cancel)
+
+    def jackStarted(self):
         self.b_jack_start.setEnabled(False)
         self.b_jack_stop.setEnabled(True)
         self.b_jack_switchmaster.setEnabled(True)
@@ -425,40 +656,82 @@ class CadenceMainW(QMainWindow, ui_j2sc.Ui_CadenceMainW):
         self.label_jack_status.setText("Started")
         self.label_jack_status_ico.setPixmap(self.pix_apply)
 
-        if gDBus.jack.IsRealtime():
-            self.label_jack_realtime.setText("Yes")
-            self.label_jack_realtime_ico.setPixmap(self.pix_apply)
+        # labels are filled in as soon as the sampler has fresh stats
+        self.m_jackStarted = True
+        self.m_last_dsp_load = None
+        self.m_last_xruns    = None
+        self.m_last_buffer_size = None
+        self.m_last_realtime = None
+        self.m_sampler.requestUpdate()
+
+        if gDBus.a2j:
+            callAsync(gDBus.a2j.is_started, callback=self.a2jAutoStartCheck)
+
+    def a2jAutoStartCheck(self, started):
+        if started or not gDBus.a2j:
+            return
+
+        settings = QSettings()
+
+        if not settings.value("A2J/AutoStart", True, type=bool):
+            self.b_a2j_start.setEnabled(True)
+            return
+
+        if settings.value("A2J/AutoExport", True, type=bool):
+            callAsync(gDBus.a2j.get_hw_export, callback=self.a2jAutoStartExport)
         else:
-            self.label_jack_realtime.setText("No")
-            self.label_jack_realtime_ico.setPixmap(self.pix_cancel)
+            callAsync(gDBus.a2j.start)
 
-        self.label_jack_dsp.setText("%.2f%%" % self.m_last_dsp_load)
-        self.label_jack_xruns.setText(str(self.m_last_xruns))
-        self.label_jack_bfsize.setText("%i samples" % self.m_last_buffer_size)
-        self.label_jack_srate.setText("%i Hz" % gDBus.jack.GetSampleRate())
-        self.label_jack_latency.setText("%.1f ms" % gDBus.jack.GetLatency())
-
-        self.m_timer500 = self.startTimer(500)
-
-        if gDBus.a2j and not gDBus.a2j.is_started():
-            portsExported = bool(gDBus.a2j.get_hw_export())
-            settings = QSettings()
-            if settings.value("A2J/AutoStart", True, type=bool):
-                if not portsExported and settings.value("A2J/AutoExport", True, type=bool):
-                    gDBus.a2j.set_hw_export(True)
-                    portsExported = True
-                gDBus.a2j.start()
-            else:
-                self.b_a2j_start.setEnabled(True)
+    def a2jAutoStartExport(self, portsExported):
+        if not portsExported:
+            callAsync(gDBus.a2j.set_hw_export, True)
+        callAsync(gDBus.a2j.start)
+
+    @pyqtSlot(object)
+    def slot_statsChanged(self, stats):
+        if self.m_exporter is not None:
+            self.m_exporter.setStats(stats)
+
+        # server state changes are handled through DBus signals, ignore stale stats
+        if not (self.m_jackStarted and stats.started):
+            return
+
+        self.m_history.append(stats)
+
+        if self.m_store is not None:
+            self.m_store.append(stats)
+
+        # nobody is looking, the graph and labels catch up once visible again
+        if not self.m_monitoring:
+            return
+
+        self.graph_jack_dsp.sampleAdded()
+
+        if self.m_last_dsp_load != stats.dspLoad:
+            self.m_last_dsp_load = stats.dspLoad
+            self.label_jack_dsp.setText("%.2f%%" % self.m_last_dsp_load)
+
+        if self.m_last_xruns != stats.xruns:
+            self.m_last_xruns = stats.xruns
+            self.label_jack_xruns.setText(str(self.m_last_xruns))
+
+        if self.m_last_buffer_size != stats.bufferSize:
+            self.m_last_buffer_size = stats.bufferSize
+            self.label_jack_bfsize.setText("%i samples" % self.m_last_buffer_size)
+            self.label_jack_srate.setText("%i Hz" % stats.sampleRate)
+            self.label_jack_latency.setText("%.1f ms" % stats.latency)
+
+        if self.m_last_realtime != stats.realtime:
+            self.m_last_realtime = stats.realtime
+            self.setRealtimeLabel(self.m_last_realtime)
 
     def jackStopped(self):
-        if self.m_timer500:
-            self.killTimer(self.m_timer500)
-            self.m_timer500 = None
+        self.m_jackStarted = False
 
         self.m_last_dsp_load = None
         self.m_last_xruns    = None
         self.m_last_buffer_size = None
+        self.m_last_realtime = None
 
         self.b_jack_start.setEnabled(True)
         self.b_jack_stop.setEnabled(False)
@@ -479,15 +752,19 @@ class CadenceMainW(QMainWindow, ui_j2sc.Ui_CadenceMainW):
     def a2jStarted(self):
         self.b_a2j_start.setEnabled(False)
         self.b_a2j_stop.setEnabled(True)
-        if bool(gDBus.a2j.get_hw_export()):
+        callAsync(gDBus.a2j.get_hw_export, callback=self.a2jExportReceived)
+
+    def a2jExportReceived(self, exported):
+        if bool(exported):
             self.label_bridge_a2j.setText(self.tr("ALSA MIDI Bridge is running, hardware ports are exported"))
         else :
             self.label_bridge_a2j.setText(self.tr("ALSA MIDI Bridge is running"))
 
     def a2jStopped(self):
-        jackRunning = bool(gDBus.jack and gDBus.jack.IsStarted())
-        self.b_a2j_start.setEnabled(jackRunning)
+        self.b_a2j_start.setEnabled(False)
         self.b_a2j_stop.setEnabled(False)
+        if gDBus.jack:
+            callAsync(gDBus.jack.IsStarted, callback=lambda started: self.b_a2j_start.setEnabled(bool(started)))
         self.label_bridge_a2j.setText(self.tr("ALSA MIDI Bridge is stopped"))
 
     @pyqtSlot()
@@ -509,30 +786,51 @@ class CadenceMainW(QMainWindow, ui_j2sc.Ui_CadenceMainW):
     @pyqtSlot()
     def slot_JackServerStart(self):
         self.saveSettings()
-        try:
-            gDBus.jack.StartServer()
-        except:
-            try:
-                gDBus.jack.StartServer()
-            except:
-                QMessageBox.warning(self, self.tr("Warning"), self.tr("Failed to start JACK, please check the logs for more information."))
+        self.b_jack_start.setEnabled(False)
+
+        def startFailed(error):
+            self.b_jack_start.setEnabled(True)
+            QTimer.singleShot(0, lambda: QMessageBox.warning(self, self.tr("Warning"),
+                                                             self.tr("Failed to start JACK, please check the logs for more information.")))
+
+        def retry(error):
+            callAsync(gDBus.jack.StartServer, errback=startFailed, timeout=DBUS_START_TIMEOUT)
+
+        callAsync(gDBus.jack.StartServer, errback=retry, timeout=DBUS_START_TIMEOUT)
 
     @pyqtSlot()
     def slot_JackServerStop(self):
-        if gDBus.a2j and bool(gDBus.a2j.is_started()):
-            gDBus.a2j.stop()
-        try:
-            gDBus.jack.StopServer()
-        except:
-            QMessageBox.warning(self, self.tr("Warning"), self.tr("Failed to stop JACK, please check the logs for more information."))
+        def stopFailed(error):
+            QTimer.singleShot(0, lambda: QMessageBox.warning(self, self.tr("Warning"),
+                                                             self.tr("Failed to stop JACK, please check the logs for more information.")))
+
+        def stopJack(*ignored):
+            callAsync(gDBus.jack.StopServer, errback=stopFailed, timeout=DBUS_START_TIMEOUT)
+
+        def stopA2J(started):
+            if started:
+                callAsync(gDBus.a2j.stop, callback=stopJack, errback=stopJack)
+            else:
+                stopJack()
+
+        if gDBus.a2j:
+            callAsync(gDBus.a2j.is_started, callback=stopA2J, errback=stopJack)
+        else:
+            stopJack()
 
     @pyqtSlot()
     def slot_JackServerConfigure(self):
+        import settings
         settings.JackSettingsW(self).exec()
 
+    # Dialogs are only run from the Qt event loop, never from inside DBus reply handlers
     @pyqtSlot()
     def slot_JackServerForceRestart(self):
-        if gDBus.jack.IsStarted():
+        callAsync(gDBus.jack.IsStarted, callback=lambda started: QTimer.singleShot(0, lambda: self.forceRestart(started)),
+                  errback=lambda error: QTimer.singleShot(0, lambda: self.forceRestart(False)))
+
+    def forceRestart(self, started):
+        if started:
             ask = CustomMessageBox(self, QMessageBox.Icon.Warning, self.tr("Warning"),
                                    self.tr("This will force kill all JACK applications!<br>Make sure to save your projects before continue."),
                                    self.tr("Are you sure you want to force the restart of JACK?"))
@@ -540,56 +838,69 @@ class CadenceMainW(QMainWindow, ui_j2sc.Ui_CadenceMainW):
             if ask != QMessageBox.StandardButton.Yes:
                 return
 
-        if self.m_timer500:
-            self.killTimer(self.m_timer500)
-            self.m_timer500 = None
-
         self.saveSettings()
-        ForceWaitDialog(self).exec()
+
+        self.m_forceRestarting = True
+        dialog = ForceWaitDialog(self)
+        dialog.exec()
+        self.m_forceRestarting = False
+
+        dialog.showResult()
 
     @pyqtSlot()
     def slot_showLogs(self):
         if self.m_logs is None:
+            from logs import LogsW
             self.m_logs = LogsW(None)
         self.m_logs.show()
 
+    @pyqtSlot()
+    def slot_showDBusTrace(self):
+        if self.m_dbusTrace is None:
+            from tracepanel import DBusTraceW
+            self.m_dbusTrace = DBusTraceW(self, getTracer())
+        self.m_dbusTrace.show()
+
     @pyqtSlot()
     def slot_JackServerSwitchMaster(self):
-        try:
-            gDBus.jack.SwitchMaster()
-        except:
-            QMessageBox.warning(self, self.tr("Warning"), self.tr("Failed to switch JACK master, please check the logs for more information."))
-            return
+        def switchFailed(error):
+            QTimer.singleShot(0, lambda: QMessageBox.warning(self, self.tr("Warning"),
+                                                             self.tr("Failed to switch JACK master, please check the logs for more information.")))
 
-        self.jackStarted()
+        callAsync(gDBus.jack.SwitchMaster, callback=self.jackStarted, errback=switchFailed, timeout=DBUS_START_TIMEOUT)
 
     @pyqtSlot()
     def slot_JackClearXruns(self):
         if gDBus.jack:
-            gDBus.jack.ResetXruns()
+            callAsync(gDBus.jack.ResetXruns)
 
     @pyqtSlot()
     def slot_A2JBridgeStart(self):
-        gDBus.a2j.start()
+        callAsync(gDBus.a2j.start)
 
     @pyqtSlot()
     def slot_A2JBridgeStop(self):
-        gDBus.a2j.stop()
+        callAsync(gDBus.a2j.stop)
 
     @pyqtSlot(int)
     def slot_A2JBridgeExportHW(self, state):
-        a2jWasStarted = bool(gDBus.a2j.is_started())
+        def setExport(a2jWasStarted):
+            # calls are queued in order on the same connection, no need to wait for each reply
+            if a2jWasStarted:
+                callAsync(gDBus.a2j.stop)
 
-        if a2jWasStarted:
-            gDBus.a2j.stop()
+            callAsync(gDBus.a2j.set_hw_export, bool(state))
 
-        gDBus.a2j.set_hw_export(bool(state))
+            if a2jWasStarted:
+                callAsync(gDBus.a2j.start)
 
-        if a2jWasStarted:
-            gDBus.a2j.start()
+        callAsync(gDBus.a2j.is_started, callback=setExport)
 
     @pyqtSlot()
     def slot_handleCrash_jack(self):
+        # expected during force-restart, which reconnects by itself
+        if self.m_forceRestarting:
+            return
         self.DBusReconnect()
 
     @pyqtSlot()
@@ -616,43 +927,90 @@ class CadenceMainW(QMainWindow, ui_j2sc.Ui_CadenceMainW):
         self.cb_a2j_autostart.setChecked(settings.value("A2J/AutoStart", True, type=bool))
         self.cb_a2j_autoexport.setChecked(settings.value("A2J/AutoExport", True, type=bool))
 
-    def timerEvent(self, event):
-        if event.timerId() == self.m_timer500:
-            if gDBus.jack and gDBus.jack.IsStarted() and self.m_last_dsp_load != None:
-                next_dsp_load = gDBus.jack.GetLoad()
-                next_xruns    = int(gDBus.jack.GetXruns())
+    # -----------------------------------------------------------------
+    # Only monitor while the window is actually visible
 
-                if self.m_last_dsp_load != next_dsp_load:
-                    self.m_last_dsp_load = next_dsp_load
-                    self.label_jack_dsp.setText("%.2f%%" % self.m_last_dsp_load)
+    def updateMonitoring(self):
+        windowHandle = self.windowHandle()
+        monitoring = bool(self.isVisible() and not self.isMinimized() and (windowHandle is None or windowHandle.isExposed()))
 
-                if self.m_last_xruns != next_xruns:
-                    self.m_last_xruns = next_xruns
-                    self.label_jack_xruns.setText(str(self.m_last_xruns))
+        if self.m_monitoring == monitoring:
+            return
 
-        elif event.timerId() == self.m_timer2000:
-            if gDBus.jack and gDBus.jack.IsStarted() and self.m_last_buffer_size != None:
-                next_buffer_size = gDBus.jack.GetBufferSize()
+        self.m_monitoring = monitoring
+        # keep sampling at the regular rate while exporting metrics, the stats store just gets sparser samples
+        self.m_sampler.setHidden(not monitoring and self.m_exporter is None)
 
-                if self.m_last_buffer_size != next_buffer_size:
-                    self.m_last_buffer_size = next_buffer_size
-                    self.label_jack_bfsize.setText("%i samples" % self.m_last_buffer_size)
-                    self.label_jack_latency.setText("%.1f ms" % gDBus.jack.GetLatency())
+        if monitoring:
+            self.graph_jack_dsp.redrawAll()
+            self.m_sampler.requestUpdate()
 
-            else:
-                self.update()
+        if DEBUG: print("Monitoring %s" % ("resumed" if monitoring else "paused"))
+
+    def eventFilter(self, obj, event):
+        # exposure changes cover being obscured, unmapped or moved to another workspace
+        if event.type() == QEvent.Type.Expose and obj is self.windowHandle():
+            self.updateMonitoring()
+
+            # the expose event gets painted right after this, so anything queued now runs after the first paint
+            if not self.m_deferredInitDone and obj.isExposed():
+                QTimer.singleShot(0, self.slot_deferredInit)
+
+        return QMainWindow.eventFilter(self, obj, event)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.updateMonitoring()
+
+        QMainWindow.changeEvent(self, event)
+
+    def showEvent(self, event):
+        QMainWindow.showEvent(self, event)
+
+        if not self.m_exposeFilterInstalled and self.windowHandle() is not None:
+            self.windowHandle().installEventFilter(self)
+            self.m_exposeFilterInstalled = True
 
-        QMainWindow.timerEvent(self, event)
+        self.updateMonitoring()
+
+    def hideEvent(self, event):
+        QMainWindow.hideEvent(self, event)
+        self.updateMonitoring()
 
     def closeEvent(self, event):
         self.saveSettings()
 
+        if self.m_sampler.isRunning():
+            self.m_sampler.closeNow()
+
+            if not self.m_sampler.wait(2000):
+                self.m_sampler.terminate()
+
+        if self.m_store is not None:
+            self.m_store.close()
+            self.m_store = None
+
+        if self.m_exporter is not None:
+            self.m_exporter.close()
+            self.m_exporter = None
+
+        if DEBUG: print("Handled %i DBus signals" % self.m_signalCount)
+
+        dbusTraceFile = getArgValue("--dbus-trace")
+
+        if dbusTraceFile and getTracer().dump(dbusTraceFile):
+            print("DBus trace written to '%s'" % dbusTraceFile)
+
 #--------------- main ------------------
 if __name__ == '__main__':
     # Additional imports
     from PyQt6.QtWidgets import QApplication
+    from profiling import startProfiling, stopProfiling
     from shared import VERSION, setUpSignals
 
+    # Profile the whole session with --profile [DIR]
+    startProfiling("j2sc")
+
     # App initialization
     app = QApplication(sys.argv)
     app.setApplicationName("J2SC")
@@ -661,13 +1019,34 @@ if __name__ == '__main__':
     app.setOrganizationName("falkTX")
     setUpSignals()
 
+    # Trace DBus calls when debugging, or when asked to write them to a file with --dbus-trace
+    # --no-dbus-trace keeps debug mode without the tracing overhead (used by the benchmarks for their timings)
+    if (DEBUG and "--no-dbus-trace" not in sys.argv) or getArgValue("--dbus-trace"):
+        enableTracing()
+
     if haveDBus:
         gDBus.loop = DBusMainLoop(set_as_default=True)
         gDBus.bus = dbus.SessionBus(mainloop=gDBus.loop)
 
+    # Watch for event loop stalls with --stall-monitor, or with a custom threshold through --stall-threshold
+    stallThreshold = getArgValue("--stall-threshold")
+    stallMonitor   = None
+
+    if "--stall-monitor" in sys.argv or stallThreshold:
+        from stallmon import DEFAULT_THRESHOLD, StallMonitor
+        stallMonitor = StallMonitor(app, int(stallThreshold) if stallThreshold else DEFAULT_THRESHOLD)
+        stallMonitor.start()
+
     # Show GUI
     gui = CadenceMainW()
     gui.show()
 
     # App-Loop
-    sys.exit(app.exec())
+    ret = app.exec()
+
+    if stallMonitor is not None:
+        stallMonitor.stop()
+        print(stallMonitor.getReport())
+
+    stopProfiling()
+    sys.exit(ret)
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+from collections import namedtuple
+from time import time
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Custom Stuff)
+
+from dbustrace import traceProxy
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Try Import DBus
+
+try:
+    import dbus
+except:
+    dbus = None
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Global object
+
+global gJackctl, gResetNeeded
+gJackctl     = None
+gResetNeeded = False
+
+# ---------------------------------------------------------------------------------------------------------------------
+# enum jack_timer_type_t
+
+JACK_TIMER_SYSTEM_CLOCK  = 0
+JACK_TIMER_CYCLE_COUNTER = 1
+JACK_TIMER_HPET          = 2
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Init DBus
+
+# Without followNameOwner, jackdbus gets activated right away, and initBus() fails if it is not available.
+# With it, nothing is waited for (calls trigger the activation), but the bus needs a main loop.
+def initBus(bus, followNameOwner=False):
+    global gJackctl
+
+    if not bus:
+        gJackctl = None
+        invalidateParameterTree()
+        return 1
+
+    try:
+        gJackctl = traceProxy(dbus.Interface(bus.get_object("org.jackaudio.service", "/org/jackaudio/Controller",
+                                                            follow_name_owner_changes=followNameOwner), "org.jackaudio.Configure"), "jackctl")
+        invalidateParameterTree()
+        return 0
+    except:
+        gJackctl = None
+        invalidateParameterTree()
+        return 1
+
+def needsInit():
+    global gJackctl
+    return bool(gJackctl is None)
+
+def isResetNeeded():
+    global gResetNeeded
+    return gResetNeeded
+
+def setResetNeeded(yesNo):
+    global gResetNeeded
+    gResetNeeded = yesNo
+
+def getDriverList():
+    if gJackctl is None:
+        return []
+    try:
+        return [str(driver) for driver in gJackctl.ReadContainer(["drivers"])[1]]
+    except:
+        return []
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Helper functions
+
+def getBufferSize():
+    return getDriverParameter("period", -1)
+
+def getSampleRate():
+    return getDriverParameter("rate", -1)
+
+def isRealtime():
+    return getEngineParameter("realtime", False)
+
+def setBufferSize(bsize):
+    return setDriverParameter("period", dbus.UInt32(bsize))
+
+def setSampleRate(srate):
+    return setDriverParameter("rate", dbus.UInt32(srate))
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Cached parameter tree
+#
+# Each container ("engine" and "driver") is read only once, together with the (isSet, default, value) of all its
+# parameters. Constraints are fetched on first use. A parameter entry is dropped when written or reset, and the whole
+# driver container is dropped when the engine driver changes.
+
+class ParameterTree(object):
+    __slots__ = [
+        'features',
+        'values',
+        'constraints',
+        'infos',
+    ]
+
+gParamTrees = {}
+
+def invalidateParameterTree(container=None):
+    if container is None:
+        gParamTrees.clear()
+    else:
+        gParamTrees.pop(container, None)
+
+def getParameterTree(container):
+    tree = gParamTrees.get(container)
+
+    if tree is not None:
+        return tree
+
+    tree = ParameterTree()
+    tree.features = ()
+    tree.values = {}
+    tree.constraints = {}
+    tree.infos = {}
+
+    if gJackctl is None:
+        return tree
+
+    try:
+        tree.features = tuple(str(feature) for feature in gJackctl.ReadContainer([container])[1])
+    except:
+        return tree
+
+    for feature in tree.features:
+        try:
+            tree.values[feature] = gJackctl.GetParameterValue([container, feature])
+        except:
+            pass
+
+    gParamTrees[container] = tree
+    return tree
+
+def getParameterValue(container, parameter):
+    tree = getParameterTree(container)
+
+    if parameter not in tree.features:
+        return None
+
+    valueTry = tree.values.get(parameter)
+
+    if valueTry is None:
+        try:
+            valueTry = gJackctl.GetParameterValue([container, parameter])
+        except:
+            return None
+        tree.values[parameter] = valueTry
+
+    return valueTry
+
+def getParameterConstraint(container, parameter):
+    tree = getParameterTree(container)
+
+    if parameter not in tree.features:
+        return None
+
+    if parameter not in tree.constraints:
+        try:
+            tree.constraints[parameter] = gJackctl.GetParameterConstraint([container, parameter])
+        except:
+            return None
+
+    return tree.constraints[parameter]
+
+# returns the jackdbus type character of a parameter ('b', 'c', 'i', 'u' or 's'), or None
+def getParameterType(container, parameter):
+    tree = getParameterTree(container)
+
+    if parameter not in tree.features:
+        return None
+
+    if parameter not in tree.infos:
+        try:
+            tree.infos[parameter] = gJackctl.GetParameterInfo([container, parameter])
+        except:
+            return None
+
+    return chr(int(tree.infos[parameter][0]))
+
+def parameterChanged(container, parameter):
+    tree = gParamTrees.get(container)
+
+    if tree is not None:
+        tree.values.pop(parameter, None)
+
+    if container == "engine" and parameter == "driver":
+        invalidateParameterTree("driver")
+
+# jackdbus replies with nothing, failures come as a DBus exception
+def setParameterValue(container, parameter, value):
+    try:
+        gJackctl.SetParameterValue([container, parameter], value)
+        return True
+    finally:
+        parameterChanged(container, parameter)
+
+def resetParameterValue(container, parameter):
+    try:
+        gJackctl.ResetParameterValue([container, parameter])
+        return True
+    finally:
+        parameterChanged(container, parameter)
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Batched parameter commit
+#
+# Takes a list of (parameter, value) pairs for a container, where a value of None means "reset to default".
+# Everything is diffed against the cached parameter tree first (so no reads go over DBus for an already loaded
+# container), then only the parameters that really differ are sent to jackdbus, in order.
+# Returns a list of (container, parameter, oldValue, newValue) for what was changed.
+
+def commitParameters(container, changes):
+    if gJackctl is None:
+        return []
+
+    pending = []
+
+    for parameter, value in changes:
+        valueTry = getParameterValue(container, parameter)
+
+        if valueTry is None:
+            continue
+
+        if value is None:
+            if bool(valueTry[0]):
+                pending.append((parameter, valueTry[2], None))
+        elif value != valueTry[2]:
+            pending.append((parameter, valueTry[2], value))
+
+    committed = []
+
+    for parameter, oldValue, newValue in pending:
+        try:
+            if newValue is None:
+                resetParameterValue(container, parameter)
+            else:
+                setParameterValue(container, parameter, newValue)
+        except:
+            print("commitParameters() - Failed to change %s '%s'" % (container, parameter))
+            continue
+
+        committed.append((container, parameter, oldValue, newValue))
+
+    return committed
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Helper functions (engine)
+
+def engineHasFeature(feature):
+    if gJackctl is None:
+        return False
+    return bool(feature in getParameterTree("engine").features)
+
+def getEngineParameter(parameter, fallback):
+    if gJackctl is None or not engineHasFeature(parameter):
+        return fallback
+    else:
+        valueTry = getParameterValue("engine", parameter)
+        if valueTry is None:
+            return fallback
+        return valueTry[2]
+
+def setEngineParameter(parameter, value, optional=True):
+    if not engineHasFeature(parameter):
+        return False
+    elif optional:
+        paramValueTry = getParameterValue("engine", parameter)
+        if paramValueTry is None:
+            return False
+        paramValue = paramValueTry[2]
+        if value != paramValue:
+            return setParameterValue("engine", parameter, value)
+        else:
+            return False
+    else:
+        return setParameterValue("engine", parameter, value)
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Helper functions (driver)
+
+def driverHasFeature(feature):
+    if gJackctl is None:
+        return False
+    return bool(feature in getParameterTree("driver").features)
+
+def getDriverParameter(parameter, fallback):
+    if gJackctl is None or not driverHasFeature(parameter):
+        return fallback
+    else:
+        valueTry = getParameterValue("driver", parameter)
+        if valueTry is None:
+            return fallback
+        return valueTry[2]
+
+def setDriverParameter(parameter, value, optional=True):
+    if not driverHasFeature(parameter):
+        return False
+    elif optional:
+        paramValueTry = getParameterValue("driver", parameter)
+        if paramValueTry is None:
+            return False
+        if value != paramValueTry[2]:
+            return setParameterValue("driver", parameter, value)
+        else:
+            return False
+    else:
+        return setParameterValue("driver", parameter, value)
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Parameter value conversion (from/to text)
+
+def parseParameterValue(paramType, text):
+    if paramType == 'b':
+        if text.lower() in ("1", "true", "yes", "on"):
+            return dbus.Boolean(True)
+        if text.lower() in ("0", "false", "no", "off"):
+            return dbus.Boolean(False)
+        raise ValueError("invalid boolean value '%s'" % text)
+
+    if paramType == 'c':
+        if len(text) != 1:
+            raise ValueError("invalid character value '%s'" % text)
+        return dbus.Byte(text.encode("utf-8"))
+
+    if paramType == 'i':
+        return dbus.Int32(int(text))
+
+    if paramType == 'u':
+        return dbus.UInt32(int(text))
+
+    return dbus.String(text)
+
+def formatParameterValue(value):
+    if isinstance(value, dbus.Boolean):
+        return "true" if value else "false"
+    if isinstance(value, dbus.Byte):
+        return chr(int(value))
+    return str(value)
+
+# ---------------------------------------------------------------------------------------------------------------------
+# JACK stats snapshot, immutable so it can be safely handed over between threads
+
+JackStats = namedtuple("JackStats", [
+    "time",       # wall-clock time, for storing
+    "started",
+    "realtime",
+    "dspLoad",
+    "xruns",
+    "bufferSize",
+    "sampleRate",
+    "latency",
+])
+
+def getStoppedStats():
+    return JackStats(time(), False, False, 0.0, 0, 0, 0, 0.0)
+
+# Read all stats in one go, `jack` being a org.jackaudio.JackControl interface.
+# Values that rarely change (buffer size, sample rate, latency, realtime) are only re-read when `full` is set,
+# otherwise they are taken from the `last` snapshot.
+def readJackStats(jack, last=None, full=True):
+    if not jack.IsStarted():
+        return getStoppedStats()
+
+    dspLoad = float(jack.GetLoad())
+    xruns   = int(jack.GetXruns())
+
+    if full or last is None or not last.started:
+        realtime   = bool(jack.IsRealtime())
+        bufferSize = int(jack.GetBufferSize())
+        sampleRate = int(jack.GetSampleRate())
+        latency    = float(jack.GetLatency())
+    else:
+        realtime   = last.realtime
+        bufferSize = last.bufferSize
+        sampleRate = last.sampleRate
+        latency    = last.latency
+
+    return JackStats(time(), True, realtime, dspLoad, xruns, bufferSize, sampleRate, latency)
+
+# ---------------------------------------------------------------------------------------------------------------------
@@ -6,80 +6,216 @@
 # Imports (Global)
 
 import os
+import re
 
-from PyQt6.QtCore import pyqtSignal, pyqtSlot, Qt, QFile, QIODevice, QMutex, QMutexLocker, QSettings, QStringConverter, QTextStream, QThread
-from PyQt6.QtGui import QIcon, QPalette, QSyntaxHighlighter
-from PyQt6.QtWidgets import QDialog
+from bisect import bisect_right
+
+from PyQt6.QtCore import pyqtSignal, pyqtSlot, Qt, QAbstractListModel, QModelIndex, QPoint, QSettings, QSize, QThread
+from PyQt6.QtGui import QColor, QIcon, QKeySequence, QPalette, QShortcut
+from PyQt6.QtWidgets import QApplication, QDialog, QStyle, QStyledItemDelegate, QStyleOptionViewItem
 
 # ---------------------------------------------------------------------------------------------------------------------
 # Imports (Custom Stuff)
 
 import ui_logs
 
+from filewatch import createFileWatcher
+from logtext import A2J_HIGHLIGHT_RULES, JACK_HIGHLIGHT_RULES, LOG_CONNECT, LOG_DISCONNECT, LOG_ERROR, LOG_NORMAL, LOG_SEPARATOR, LOG_WARNING
+from logtext import LogIndex
+from profiling import startThreadProfile, stopThreadProfile
+
 # ---------------------------------------------------------------------------------------------------------------------
-# Fix log text output (get rid of terminal colors stuff)
+# Log model, lines are only read from the index when the view asks for them
+# When filtering by kind, rows map to the matching lines through an array of line numbers.
+
+class LogModel(QAbstractListModel):
+    # (kind, column where the highlight starts), precomputed while indexing
+    HighlightRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent, index):
+        QAbstractListModel.__init__(self, parent)
+
+        self.fIndex      = index
+        self.fGeneration = None
+        self.fLineCount  = 0
+        self.fMaxLength  = 0
+        self.fFilter     = None # set of LOG_* kinds to show, or None for all
+        self.fRows       = None # line of each row, when filtering
+
+    # sync with the index, returns True if the longest line changed
+    def refresh(self):
+        generation, lineCount, maxLength = self.fIndex.getState()
+
+        if generation != self.fGeneration:
+            self.beginResetModel()
+            self.fGeneration = generation
+            self.fLineCount  = lineCount
+            self.updateRows()
+            self.endResetModel()
+
+        elif lineCount > self.fLineCount:
+            if self.fFilter is None:
+                self.beginInsertRows(QModelIndex(), self.fLineCount, lineCount - 1)
+                self.fLineCount = lineCount
+                self.endInsertRows()
+            else:
+                rows = self.fIndex.getLinesOfKinds(self.fFilter, self.fLineCount, lineCount)
+                self.fLineCount = lineCount
 
-def fixLogText(text):
-    return text.replace("[1m[31m", "").replace("[1m[33m", "").replace("[31m", "").replace("[33m", "").replace("[0m", "")
+                if rows:
+                    self.beginInsertRows(QModelIndex(), len(self.fRows), len(self.fRows) + len(rows) - 1)
+                    self.fRows.extend(rows)
+                    self.endInsertRows()
 
-# ---------------------------------------------------------------------------------------------------------------------
-# Syntax Highlighter for JACK
+        if maxLength == self.fMaxLength:
+            return False
 
-class SyntaxHighlighter_JACK(QSyntaxHighlighter):
-    def __init__(self, parent):
-        QSyntaxHighlighter.__init__(self, parent)
-
-        self.fPalette = parent.palette()
-
-    def highlightBlock(self, text):
-        if ": ERROR: " in text:
-            self.setFormat(text.find(" ERROR: "), len(text), Qt.GlobalColor.red)
-        elif ": WARNING: " in text:
-            self.setFormat(text.find(" WARNING: "), len(text), Qt.GlobalColor.darkRed)
-        elif ": ------------------" in text:
-            self.setFormat(text.find(" ------------------"), len(text), self.fPalette.color(QPalette.ColorGroup.Active, QPalette.ColorRole.Mid))
-        elif ": Connecting " in text:
-            self.setFormat(text.find(" Connecting "), len(text), self.fPalette.color(QPalette.ColorGroup.Active, QPalette.ColorRole.Link))
-        elif ": Disconnecting " in text:
-            self.setFormat(text.find(" Disconnecting "), len(text), self.fPalette.color(QPalette.ColorGroup.Active, QPalette.ColorRole.LinkVisited))
-        #elif (": New client " in text):
-            #self.setFormat(text.find(" New client "), len(text), self.fPalette.color(QPalette.ColorGroup.Active, QPalette.ColorRole.Link))
+        self.fMaxLength = maxLength
+        return True
+
+    def updateRows(self):
+        if self.fFilter is None:
+            self.fRows = None
+        else:
+            self.fRows = self.fIndex.getLinesOfKinds(self.fFilter, 0, self.fLineCount)
+
+    def getFilter(self):
+        return self.fFilter
+
+    def setFilter(self, kinds):
+        self.beginResetModel()
+        self.fFilter = kinds or None
+        self.updateRows()
+        self.endResetModel()
+
+    def getMaxLength(self):
+        return self.fMaxLength
+
+    def getGeneration(self):
+        return self.fGeneration
+
+    def getLineCount(self):
+        return self.fLineCount
+
+    def getIndex(self):
+        return self.fIndex
+
+    def rowToLine(self, row):
+        return row if self.fRows is None else self.fRows[row]
+
+    # row of a line, or of the closest visible line before it (-1 if none)
+    def lineToRow(self, line):
+        if self.fRows is None:
+            return min(line, self.fLineCount - 1)
+
+        return bisect_right(self.fRows, line) - 1
+
+    def getLine(self, row):
+        return self.fIndex.getLine(self.rowToLine(row))
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+
+        return self.fLineCount if self.fRows is None else len(self.fRows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.getLine(index.row())
+
+        if role == self.HighlightRole:
+            return self.fIndex.getHighlight(self.rowToLine(index.row()))
+
+        return None
 
 # ---------------------------------------------------------------------------------------------------------------------
-# Syntax Highlighter for A2J
+# Log line painting, with highlight from the matching rule up to the end of the line (like a syntax highlighter)
+# Kind and start of the highlight come from the index, painting does no string scanning.
 
-class SyntaxHighlighter_A2J(QSyntaxHighlighter):
+class LogItemDelegate(QStyledItemDelegate):
     def __init__(self, parent):
-        QSyntaxHighlighter.__init__(self, parent)
-
-        self.fPalette = parent.palette()
-
-    def highlightBlock(self, text):
-        if ": error: " in text:
-            self.setFormat(text.find(" error: "), len(text), Qt.GlobalColor.red)
-        elif ": WARNING: " in text:
-            self.setFormat(text.find(" WARNING: "), len(text), Qt.GlobalColor.darkRed)
-        elif ": ----------------------------" in text:
-            self.setFormat(text.find("----------------------------"), len(text), self.fPalette.color(QPalette.ColorGroup.Active, QPalette.ColorRole.Mid))
-        elif ": port created: " in text:
-            self.setFormat(text.find(" port created: "), len(text), self.fPalette.color(QPalette.ColorGroup.Active, QPalette.ColorRole.Link))
-        elif ": port deleted: " in text:
-            self.setFormat(text.find(" port deleted: "), len(text), self.fPalette.color(QPalette.ColorGroup.Active, QPalette.ColorRole.LinkVisited))
+        QStyledItemDelegate.__init__(self, parent)
+
+        palette = parent.palette()
+
+        self.fColors = {
+            LOG_ERROR: QColor(Qt.GlobalColor.red),
+            LOG_WARNING: QColor(Qt.GlobalColor.darkRed),
+            LOG_SEPARATOR: palette.color(QPalette.ColorGroup.Active, QPalette.ColorRole.Mid),
+            LOG_CONNECT: palette.color(QPalette.ColorGroup.Active, QPalette.ColorRole.Link),
+            LOG_DISCONNECT: palette.color(QPalette.ColorGroup.Active, QPalette.ColorRole.LinkVisited),
+        }
+        self.fItemSize = QSize(0, parent.fontMetrics().height() + 2)
+
+    def getItemSize(self):
+        return self.fItemSize
+
+    def setItemWidth(self, width):
+        self.fItemSize = QSize(width, self.fItemSize.height())
+
+    def sizeHint(self, option, index):
+        return self.fItemSize
+
+    def paint(self, painter, option, index):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+
+        text = opt.text
+        opt.text = ""
+
+        widget = opt.widget
+        style  = widget.style() if widget is not None else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, widget)
+
+        if not text:
+            return
+
+        # text is drawn unclipped, items can be narrower than the longest line until the next layout
+        margin  = style.pixelMetric(QStyle.PixelMetric.PM_FocusFrameHMargin, None, widget) + 1
+        metrics = opt.fontMetrics
+        x = opt.rect.left() + margin
+        y = opt.rect.top() + (opt.rect.height() - metrics.height()) // 2 + metrics.ascent()
+
+        if opt.state & QStyle.StateFlag.State_Selected:
+            kind   = LOG_NORMAL
+            normal = opt.palette.color(QPalette.ColorRole.HighlightedText)
+        else:
+            kind, offset = index.data(LogModel.HighlightRole)
+            normal = opt.palette.color(QPalette.ColorRole.Text)
+
+        painter.save()
+        painter.setFont(opt.font)
+        painter.setPen(normal)
+
+        if kind == LOG_NORMAL:
+            painter.drawText(x, y, text)
+        else:
+            painter.drawText(x, y, text[:offset])
+            painter.setPen(self.fColors[kind])
+            painter.drawText(x + metrics.horizontalAdvance(text[:offset]), y, text[offset:])
+
+        painter.restore()
 
 # ---------------------------------------------------------------------------------------------------------------------
 # Lock-less file read thread
+#
+# Blocks on inotify until one of the logs changes (or purge/close is requested), so new lines show up right away and
+# an idle logs window uses no CPU. Falls back to polling where inotify is not available.
+# Only indexes the logs, reading lines is up to the views.
 
 class LogsReadThread(QThread):
-    MAX_INITIAL_SIZE = 2*1024*1024 # 2Mb
+    POLL_INTERVAL = 200 # ms, without inotify
 
     updateLogs = pyqtSignal()
 
     def __init__(self, parent):
         QThread.__init__(self, parent)
 
-        self.fCloseNow   = False
-        self.fPurgeLogs  = False
-        self.fRealParent = parent
+        self.fCloseNow  = False
+        self.fPurgeLogs = False
 
         # -------------------------------------------------------------
         # Take some values from Logs Window
@@ -87,80 +223,64 @@ class LogsReadThread(QThread):
         self.LOG_FILE_JACK = LogsW.LOG_FILE_JACK
         self.LOG_FILE_A2J  = LogsW.LOG_FILE_A2J
 
-        # -------------------------------------------------------------
-        # Init logs
-
-        if self.LOG_FILE_JACK is not None:
-            self.fLogFileJACK = QFile(self.LOG_FILE_JACK)
-            self.fLogFileJACK.open(QIODevice.OpenModeFlag.ReadOnly)
-            self.fLogStreamJACK = QTextStream(self.fLogFileJACK)
-            self.fLogStreamJACK.setEncoding(QStringConverter.Encoding.Utf8)
-
-            if self.fLogFileJACK.size() > self.MAX_INITIAL_SIZE:
-                self.fLogStreamJACK.seek(self.fLogFileJACK.size() - self.MAX_INITIAL_SIZE)
-
-        if self.LOG_FILE_A2J is not None:
-            self.fLogFileA2J = QFile(self.LOG_FILE_A2J)
-            self.fLogFileA2J.open(QIODevice.OpenModeFlag.ReadOnly)
-            self.fLogStreamA2J = QTextStream(self.fLogFileA2J)
-            self.fLogStreamA2J.setEncoding(QStringConverter.Encoding.Utf8)
-
-            if self.fLogFileA2J.size() > self.MAX_INITIAL_SIZE:
-                self.fLogStreamA2J.seek(self.fLogFileA2J.size() - self.MAX_INITIAL_SIZE)
+        self.fIndexes = [index for index in (parent.fLogJACK, parent.fLogA2J) if index is not None]
+        self.fWatcher = createFileWatcher([path for path in (self.LOG_FILE_JACK, self.LOG_FILE_A2J) if path])
 
     def closeNow(self):
         self.fCloseNow = True
 
+        if self.fWatcher is not None:
+            self.fWatcher.wakeUp()
+
     def purgeLogs(self):
         self.fPurgeLogs = True
 
+        if self.fWatcher is not None:
+            self.fWatcher.wakeUp()
+
     def run(self):
+        profile = startThreadProfile()
+
         # -------------------------------------------------------------
-        # Read logs and set text in main thread
+        # Index new lines and let the main thread know
 
         while not self.fCloseNow:
-            if self.fPurgeLogs:
-                if self.LOG_FILE_JACK:
-                    self.fLogStreamJACK.flush()
-                    self.fLogFileJACK.close()
-                    self.fLogFileJACK.open(QIODevice.OpenModeFlag.WriteOnly)
-                    self.fLogFileJACK.close()
-                    self.fLogFileJACK.open(QIODevice.OpenModeFlag.ReadOnly)
-
-                if self.LOG_FILE_A2J:
-                    self.fLogStreamA2J.flush()
-                    self.fLogFileA2J.close()
-                    self.fLogFileA2J.open(QIODevice.OpenModeFlag.WriteOnly)
-                    self.fLogFileA2J.close()
-                    self.fLogFileA2J.open(QIODevice.OpenModeFlag.ReadOnly)
+            changed = pending = False
 
+            if self.fPurgeLogs:
                 self.fPurgeLogs = False
+                changed = True
 
-            else:
-                if self.LOG_FILE_JACK:
-                    textJACK = fixLogText(self.fLogStreamJACK.readAll()).strip()
-                else:
-                    textJACK = ""
+                for index in self.fIndexes:
+                    index.purge()
 
-                if self.LOG_FILE_A2J:
-                    textA2J = fixLogText(self.fLogStreamA2J.readAll()).strip()
-                else:
-                    textA2J = ""
+            for index in self.fIndexes:
+                indexChanged, indexPending = index.update()
+                changed = changed or indexChanged
+                pending = pending or indexPending
 
-                self.fRealParent.setLogsText(textJACK, textA2J)
+            if changed:
                 self.updateLogs.emit()
 
-            if not self.fCloseNow:
-                self.msleep(200)
+            if self.fCloseNow:
+                break
+
+            # big logs get indexed in chunks, keep going
+            if pending:
+                continue
+
+            if self.fWatcher is None:
+                self.msleep(self.POLL_INTERVAL)
+            else:
+                self.fWatcher.wait()
 
         # -------------------------------------------------------------
-        # Close logs before closing thread
+        # Close watcher before closing thread
 
-        if self.LOG_FILE_JACK:
-            self.fLogFileJACK.close()
+        if self.fWatcher is not None:
+            self.fWatcher.close()
 
-        if self.LOG_FILE_A2J:
-            self.fLogFileA2J.close()
+        stopThreadProfile(profile)
 
 # ---------------------------------------------------------------------------------------------------------------------
 # Logs Window
@@ -189,10 +309,9 @@ class LogsW(QDialog):
         self.loadSettings()
 
         self.fFirstRun = True
-        self.fTextLock = QMutex()
 
-        self.fTextJACK = ""
-        self.fTextA2J  = ""
+        # (model, row count, filter, text) of the last search without results
+        self.fSearchFailed = None
 
         # -------------------------------------------------------------
         # Set-up GUI
@@ -216,60 +335,232 @@ class LogsW(QDialog):
         # -------------------------------------------------------------
         # Init logs viewers
 
-        if self.LOG_FILE_JACK:
-            self.fSyntaxJACK = SyntaxHighlighter_JACK(self.ui.pte_jack)
-            self.fSyntaxJACK.setDocument(self.ui.pte_jack.document())
+        self.fLogJACK = LogIndex(self.LOG_FILE_JACK, JACK_HIGHLIGHT_RULES) if self.LOG_FILE_JACK else None
+        self.fLogA2J  = LogIndex(self.LOG_FILE_A2J, A2J_HIGHLIGHT_RULES) if self.LOG_FILE_A2J else None
 
-        if self.LOG_FILE_A2J:
-            self.fSyntaxA2J = SyntaxHighlighter_A2J(self.ui.pte_a2j)
-            self.fSyntaxA2J.setDocument(self.ui.pte_a2j.document())
+        # list of (view, model, delegate)
+        self.fViewers = []
+
+        if self.fLogJACK is not None:
+            self.fViewers.append(self.setupViewer(self.ui.lv_jack, self.fLogJACK))
+
+        if self.fLogA2J is not None:
+            self.fViewers.append(self.setupViewer(self.ui.lv_a2j, self.fLogA2J))
 
         # -------------------------------------------------------------
-        # Init file read thread
+        # File read thread, started on show and stopped on close
 
-        self.fReadThread = LogsReadThread(self)
-        self.fReadThread.start(QThread.Priority.IdlePriority)
+        self.fReadThread = None
 
         # -------------------------------------------------------------
         # Set-up connections
 
         self.ui.b_purge.clicked.connect(self.slot_purgeLogs)
-        self.fReadThread.updateLogs.connect(self.slot_updateLogs)
+
+        self.ui.cb_errors.toggled.connect(self.slot_filterChanged)
+        self.ui.cb_warnings.toggled.connect(self.slot_filterChanged)
+        self.ui.cb_connections.toggled.connect(self.slot_filterChanged)
+
+        self.ui.le_search.textChanged.connect(self.slot_searchChanged)
+        self.ui.le_search.returnPressed.connect(self.slot_findNext)
+        self.ui.b_find_next.clicked.connect(self.slot_findNext)
+        self.ui.b_find_prev.clicked.connect(self.slot_findPrevious)
+
+        QShortcut(QKeySequence(QKeySequence.StandardKey.Copy), self, self.slot_copyLines)
+        QShortcut(QKeySequence(QKeySequence.StandardKey.Find), self, self.slot_focusSearch)
+        QShortcut(QKeySequence(QKeySequence.StandardKey.FindNext), self, self.slot_findNext)
+        QShortcut(QKeySequence(QKeySequence.StandardKey.FindPrevious), self, self.slot_findPrevious)
 
         # -------------------------------------------------------------
 
-    def setLogsText(self, textJACK, textA2J):
-        QMutexLocker(self.fTextLock)
+    # (re)open the logs and start reading, the window might be shown again after being closed
+    def startReading(self):
+        for index in (self.fLogJACK, self.fLogA2J):
+            if index is not None:
+                index.reopen()
+
+        self.fFirstRun   = True
+        self.fReadThread = LogsReadThread(self)
+
+        # start only after updateLogs is connected
+        self.fReadThread.updateLogs.connect(self.slot_updateLogs)
+        self.fReadThread.start(QThread.Priority.IdlePriority)
+
+    def stopReading(self):
+        if self.fReadThread.isRunning():
+            self.fReadThread.closeNow()
+
+            if not self.fReadThread.wait(2000):
+                self.fReadThread.terminate()
 
-        self.fTextJACK = textJACK
-        self.fTextA2J  = textA2J
+        self.fReadThread.deleteLater()
+        self.fReadThread = None
+
+        for index in (self.fLogJACK, self.fLogA2J):
+            if index is not None:
+                index.close()
+
+    def setupViewer(self, view, index):
+        model    = LogModel(self, index)
+        delegate = LogItemDelegate(view)
+
+        view.setModel(model)
+        view.setItemDelegate(delegate)
+
+        return (view, model, delegate)
 
     @pyqtSlot()
     def slot_updateLogs(self):
-        QMutexLocker(self.fTextLock)
+        for view, model, delegate in self.fViewers:
+            scrollBar = view.verticalScrollBar()
+            atBottom  = self.fFirstRun or scrollBar.value() == scrollBar.maximum()
 
-        if self.fFirstRun:
-            self.ui.pte_jack.clear()
-            self.ui.pte_a2j.clear()
+            if model.refresh():
+                # the horizontal scroll range follows the longest line
+                delegate.setItemWidth(view.fontMetrics().averageCharWidth() * model.getMaxLength() + 8)
+                view.setGridSize(delegate.getItemSize())
 
-        if self.LOG_FILE_JACK and self.fTextJACK:
-            self.ui.pte_jack.appendPlainText(self.fTextJACK)
+            if atBottom and model.rowCount() != 0:
+                view.scrollTo(model.index(model.rowCount() - 1), view.ScrollHint.PositionAtBottom)
 
-        if self.LOG_FILE_A2J and self.fTextA2J:
-            self.ui.pte_a2j.appendPlainText(self.fTextA2J)
+        self.fFirstRun = False
 
-        if self.fFirstRun:
-            self.ui.pte_jack.horizontalScrollBar().setValue(0)
-            self.ui.pte_jack.verticalScrollBar().setValue(self.ui.pte_jack.verticalScrollBar().maximum())
-            self.ui.pte_a2j.horizontalScrollBar().setValue(0)
-            self.ui.pte_a2j.verticalScrollBar().setValue(self.ui.pte_a2j.verticalScrollBar().maximum())
-            self.fFirstRun = False
+    # (view, model, delegate) of the current tab
+    def getCurrentViewer(self):
+        for viewer in self.fViewers:
+            if viewer[0].isVisible():
+                return viewer
+
+        return None
+
+    # -----------------------------------------------------------------
+    # Filter
+
+    @pyqtSlot()
+    def slot_filterChanged(self):
+        kinds = set()
+
+        if self.ui.cb_errors.isChecked():
+            kinds.add(LOG_ERROR)
+        if self.ui.cb_warnings.isChecked():
+            kinds.add(LOG_WARNING)
+        if self.ui.cb_connections.isChecked():
+            kinds.update((LOG_CONNECT, LOG_DISCONNECT))
+
+        for view, model, delegate in self.fViewers:
+            current = view.currentIndex()
+            line    = model.rowToLine(current.row()) if current.isValid() else -1
+
+            model.setFilter(kinds)
+
+            # stay around the same line if there was one, otherwise show the most recent ones
+            row = model.lineToRow(line) if line >= 0 else -1
+
+            if row >= 0:
+                view.setCurrentIndex(model.index(row))
+                view.scrollTo(model.index(row), view.ScrollHint.PositionAtCenter)
+            else:
+                view.scrollToBottom()
+
+    # -----------------------------------------------------------------
+    # Search
+
+    def findText(self, backwards, skipCurrent):
+        viewer = self.getCurrentViewer()
+        text   = self.ui.le_search.text()
+
+        if viewer is None or not text:
+            self.setSearchFailed(False)
+            return
+
+        view, model, delegate = viewer
+        rowCount = model.rowCount()
+
+        if rowCount == 0:
+            return
+
+        index     = model.getIndex()
+        kinds     = model.getFilter()
+        lineCount = model.getLineCount()
+        regex     = re.compile(re.escape(text.encode("utf-8")), re.IGNORECASE)
+
+        # a text not found anywhere, or a longer one containing it, can only be in lines added since
+        failed = self.fSearchFailed
+        if failed is not None and failed[:3] == (model, model.getGeneration(), kinds) and failed[3] in text:
+            if failed[4] >= lineCount:
+                return
+
+            found = index.findLine(regex, failed[4], False, kinds)
+
+        else:
+            current = view.currentIndex()
+            row = current.row() if current.isValid() else max(0, view.indexAt(QPoint(0, 0)).row())
+
+            if skipCurrent:
+                row = (row + (-1 if backwards else 1)) % rowCount
+
+            start = model.rowToLine(row)
+            found = index.findLine(regex, start, backwards, kinds)
+
+            # wrap around, up to where the search started
+            if found < 0:
+                found = index.findLine(regex, model.rowToLine(rowCount - 1 if backwards else 0), backwards, kinds, start)
+
+        if found < 0:
+            self.fSearchFailed = (model, model.getGeneration(), kinds, text, lineCount)
+            self.setSearchFailed(True)
+            return
+
+        self.setSearchFailed(False)
+
+        row = model.index(model.lineToRow(found))
+        view.setCurrentIndex(row)
+        view.scrollTo(row, view.ScrollHint.PositionAtCenter)
+
+    def setSearchFailed(self, failed):
+        palette = self.ui.le_search.palette()
+        palette.setColor(QPalette.ColorRole.Text, QColor(Qt.GlobalColor.red) if failed else self.palette().color(QPalette.ColorRole.Text))
+        self.ui.le_search.setPalette(palette)
+
+        if not failed:
+            self.fSearchFailed = None
+
+    @pyqtSlot()
+    def slot_searchChanged(self):
+        self.findText(False, False)
+
+    @pyqtSlot()
+    def slot_findNext(self):
+        self.findText(False, True)
+
+    @pyqtSlot()
+    def slot_findPrevious(self):
+        self.findText(True, True)
+
+    @pyqtSlot()
+    def slot_focusSearch(self):
+        self.ui.le_search.setFocus()
+        self.ui.le_search.selectAll()
+
+    # -----------------------------------------------------------------
+
+    @pyqtSlot()
+    def slot_copyLines(self):
+        viewer = self.getCurrentViewer()
+
+        if viewer is None:
+            return
+
+        view, model, delegate = viewer
+        rows = sorted(index.row() for index in view.selectionModel().selectedIndexes())
+
+        if rows:
+            QApplication.clipboard().setText("\n".join(model.getLine(row) for row in rows))
 
     @pyqtSlot()
     def slot_purgeLogs(self):
-        self.fReadThread.purgeLogs()
-        self.ui.pte_jack.clear()
-        self.ui.pte_a2j.clear()
+        if self.fReadThread is not None:
+            self.fReadThread.purgeLogs()
 
     def loadSettings(self):
         settings = QSettings("falkTX", "J2SC-Logs")
@@ -279,14 +570,17 @@ class LogsW(QDialog):
         settings = QSettings("falkTX", "J2SC-Logs")
         settings.setValue("Geometry", self.saveGeometry())
 
+    def showEvent(self, event):
+        if self.fReadThread is None:
+            self.startReading()
+
+        QDialog.showEvent(self, event)
+
     def closeEvent(self, event):
         self.saveSettings()
 
-        if self.fReadThread.isRunning():
-            self.fReadThread.closeNow()
-
-            if not self.fReadThread.wait(2000):
-                self.fReadThread.terminate()
+        if self.fReadThread is not None:
+            self.stopReading()
 
         QDialog.closeEvent(self, event)
 
@@ -297,8 +591,12 @@ if __name__ == '__main__':
     # Additional imports
     import sys
     from PyQt6.QtWidgets import QApplication
+    from profiling import startProfiling, stopProfiling
     from shared import VERSION, setUpSignals
 
+    # Profile the whole session with --profile [DIR]
+    startProfiling("j2sc-logs")
+
     # App initialization
     app = QApplication(sys.argv)
     app.setApplicationName("J2SC-Logs")
@@ -312,4 +610,6 @@ if __name__ == '__main__':
     gui.show()
 
     # App-Loop
-    sys.exit(app.exec())
+    ret = app.exec()
+    stopProfiling()
+    sys.exit(ret)
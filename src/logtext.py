@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+import os
+import re
+
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from mmap import mmap, ACCESS_READ
+from threading import Lock
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Terminal escape sequences stripping
+#
+# jackdbus and a2jmidid color their messages, which end up in the log files as ANSI escape sequences.
+# A single regex pass removes all of them: CSI sequences (ESC [ params intermediates final, which covers SGR colors,
+# cursor movement, erase, etc) and other two-character ESC sequences.
+# Works the same on str and bytes, so logs can be cleaned before decoding.
+
+ANSI_PATTERN = r"\x1b\[[0-?]*[ -/]*[@-~]|\x1b[0-Z\\-~]"
+
+ANSI_REGEX       = re.compile(ANSI_PATTERN)
+ANSI_REGEX_BYTES = re.compile(ANSI_PATTERN.encode("ascii"))
+
+def stripAnsi(text):
+    if isinstance(text, str):
+        return ANSI_REGEX.sub("", text)
+
+    return ANSI_REGEX_BYTES.sub(b"", text)
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Log line highlighting
+#
+# Each rule is (text to look for, where the highlight starts, kind), first match wins.
+# The highlight goes from its start to the end of the line, the start has to be part of the text looked for.
+
+LOG_NORMAL     = 0
+LOG_ERROR      = 1
+LOG_WARNING    = 2
+LOG_SEPARATOR  = 3
+LOG_CONNECT    = 4
+LOG_DISCONNECT = 5
+
+JACK_HIGHLIGHT_RULES = (
+    (": ERROR: ", " ERROR: ", LOG_ERROR),
+    (": WARNING: ", " WARNING: ", LOG_WARNING),
+    (": ------------------", " ------------------", LOG_SEPARATOR),
+    (": Connecting ", " Connecting ", LOG_CONNECT),
+    (": Disconnecting ", " Disconnecting ", LOG_DISCONNECT),
+)
+
+A2J_HIGHLIGHT_RULES = (
+    (": error: ", " error: ", LOG_ERROR),
+    (": WARNING: ", " WARNING: ", LOG_WARNING),
+    (": ----------------------------", "----------------------------", LOG_SEPARATOR),
+    (": port created: ", " port created: ", LOG_CONNECT),
+    (": port deleted: ", " port deleted: ", LOG_DISCONNECT),
+)
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Line index over a memory-mapped log file
+#
+# Keeps the start offset of every line in an array('Q'), 8 bytes per line, and only decodes the lines asked for, so the
+# whole log stays reachable no matter its size. update() is meant for the reader thread: it indexes whatever complete
+# lines got appended since the last call (one chunk at a time), and starts over when the file gets replaced or
+# truncated, which bumps the generation. Everything else is for the main thread.
+#
+# Lines are also classified once while indexing, using the highlight rules, into an array('B') of LOG_* kinds (1 byte
+# per line) plus an array('H') with the column where the highlight starts. Rules are matched with one regex pass per
+# chunk, so neither filtering by kind nor painting highlights ever has to look at the text again.
+#
+# Truncating a file while mapped makes reads past the new end crash (SIGBUS), so getLine() checks the file size first,
+# findLine() reads with pread instead, and purge() drops the mapping before truncating.
+
+class LogIndex(object):
+    CHUNK_SIZE = 8*1024*1024 # 8Mb
+
+    SEARCH_WINDOW = 1024*1024 # 1Mb, searched at a time
+
+    def __init__(self, path, rules):
+        self.fPath       = path
+        self.fRules      = [(re.compile(re.escape(match.encode("utf-8"))), match.index(start), kind)
+                            for match, start, kind in reversed(rules)]
+        self.fLock       = Lock()
+        self.fFd         = -1
+        self.fInode      = None
+        self.fMap        = None
+        self.fOffsets    = array('Q', [0]) # start of each line, plus the end of the last one
+        self.fKinds      = array('B')      # LOG_* kind of each line
+        self.fColumns    = array('H')      # column where the highlight of each line starts
+        self.fMaxLength  = 0
+        self.fGeneration = 0
+
+        self.reopen()
+
+    def reopen(self):
+        with self.fLock:
+            self.closeFile()
+
+            try:
+                self.fFd    = os.open(self.fPath, os.O_RDONLY | os.O_CLOEXEC)
+                self.fInode = os.fstat(self.fFd).st_ino
+            except OSError:
+                self.fFd    = -1
+                self.fInode = None
+
+            self.fOffsets    = array('Q', [0])
+            self.fKinds      = array('B')
+            self.fColumns    = array('H')
+            self.fMaxLength  = 0
+            self.fGeneration += 1
+
+    def closeFile(self):
+        if self.fMap is not None:
+            self.fMap.close()
+            self.fMap = None
+
+        if self.fFd >= 0:
+            os.close(self.fFd)
+            self.fFd = -1
+
+    def close(self):
+        with self.fLock:
+            self.closeFile()
+
+    def purge(self):
+        with self.fLock:
+            self.closeFile()
+
+            try:
+                os.truncate(self.fPath, 0)
+            except OSError as error:
+                print("LogIndex::purge() - Failed to truncate '%s': %s" % (self.fPath, error))
+
+        self.reopen()
+
+    # -----------------------------------------------------------------
+    # Reader thread side
+
+    # Returns (changed, pending), pending meaning there is more to index right away
+    def update(self):
+        changed = False
+
+        try:
+            stat = os.stat(self.fPath)
+        except OSError:
+            stat = None
+
+        if stat is None:
+            if self.fFd >= 0:
+                self.reopen()
+                changed = True
+        elif self.fFd < 0 or stat.st_ino != self.fInode or stat.st_size < self.fOffsets[-1]:
+            self.reopen()
+            changed = True
+
+        if self.fFd < 0:
+            return (changed, False)
+
+        start = self.fOffsets[-1]
+        size  = os.fstat(self.fFd).st_size
+
+        if start >= size:
+            return (changed, False)
+
+        data = os.pread(self.fFd, min(self.CHUNK_SIZE, size - start), start)
+        end  = data.rfind(b"\n") + 1
+
+        if end != 0:
+            data    = data[:end - 1]
+            lengths = list(map(len, data.split(b"\n")))
+            offsets = array('Q', accumulate(map((1).__add__, lengths), initial=start))
+            del offsets[0]
+        elif len(data) == self.CHUNK_SIZE:
+            # no newline in a whole chunk, take it as one line
+            lengths = [len(data)]
+            offsets = array('Q', [start + len(data)])
+        else:
+            # wait for the rest of the line
+            return (changed, False)
+
+        kinds, columns = self.classifyLines(data, len(lengths))
+
+        with self.fLock:
+            if self.fMap is not None:
+                self.fMap.close()
+
+            self.fOffsets.extend(offsets)
+            self.fKinds.extend(kinds)
+            self.fColumns.extend(columns)
+            self.fMaxLength = max(self.fMaxLength, max(lengths))
+            self.fMap = mmap(self.fFd, self.fOffsets[-1], access=ACCESS_READ)
+
+        return (True, self.fOffsets[-1] < size)
+
+    # Returns the kind of each of the lines in data, and the column where their highlight starts
+    def classifyLines(self, data, lineCount):
+        kinds   = array('B', bytes(lineCount))
+        columns = array('H', bytes(2 * lineCount))
+        data    = stripAnsi(data)
+        count   = data.count
+        rfind   = data.rfind
+
+        # in reverse, so the first matching rule is the one that stays
+        for regex, delta, kind in self.fRules:
+            line = prev = 0
+            lastLine = -1
+
+            for match in regex.finditer(data):
+                pos   = match.start()
+                line += count(b"\n", prev, pos)
+                prev  = pos
+
+                # first match in the line only
+                if line == lastLine:
+                    continue
+
+                lastLine = line
+                prefix   = data[rfind(b"\n", 0, pos) + 1:pos + delta]
+                column   = len(prefix) if prefix.isascii() else len(prefix.decode("utf-8", "replace"))
+
+                kinds[line]   = kind
+                columns[line] = min(column, 0xFFFF)
+
+        return (kinds, columns)
+
+    # -----------------------------------------------------------------
+    # Main thread side
+
+    # Returns (generation, line count, longest line length in bytes)
+    def getState(self):
+        with self.fLock:
+            return (self.fGeneration, len(self.fOffsets) - 1, self.fMaxLength)
+
+    def getLine(self, line):
+        with self.fLock:
+            if self.fMap is None or line < 0 or line + 1 >= len(self.fOffsets):
+                return ""
+
+            start = self.fOffsets[line]
+            end   = self.fOffsets[line + 1]
+
+            if end > os.fstat(self.fFd).st_size:
+                return ""
+
+            data = self.fMap[start:end]
+
+        return stripAnsi(data.rstrip(b"\r\n")).decode("utf-8", "replace")
+
+    # Returns (kind, column where the highlight starts)
+    # Called for every painted line, so no locking: the arrays only get appended to, or replaced on reopen.
+    def getHighlight(self, line):
+        try:
+            return (self.fKinds[line], self.fColumns[line])
+        except IndexError:
+            return (LOG_NORMAL, 0)
+
+    # Returns the lines in [first, last) whose kind is one of kinds
+    def getLinesOfKinds(self, kinds, first, last):
+        with self.fLock:
+            data = self.fKinds[first:last].tobytes()
+
+        mask  = data.translate(bytes(1 if kind in kinds else 0 for kind in range(256)))
+        lines = array('Q')
+        pos   = mask.find(1)
+
+        while pos >= 0:
+            lines.append(first + pos)
+            pos = mask.find(1, pos + 1)
+
+        return lines
+
+    # Returns lines [first, last) as they are shown (without escape sequences), or None if the file shrank.
+    # Read with pread instead of from the mapping, so a truncated file can't crash us. Called with the lock held.
+    def readStrippedLines(self, first, last):
+        start = self.fOffsets[first]
+        end   = self.fOffsets[last]
+        data  = os.pread(self.fFd, end - start, start)
+
+        if len(data) != end - start:
+            return None
+
+        return stripAnsi(data)
+
+    # Returns the first line matching regex (a bytes pattern) starting at line, going forwards or backwards, or -1.
+    # The search ends right before the stop line, or at the start or end of the file if stop is -1.
+    # When kinds is given, only lines of those kinds are considered.
+    # Text is searched a window of lines at a time, as shown, so matches spanning a color change are found too.
+    def findLine(self, regex, line, backwards=False, kinds=None, stop=-1):
+        with self.fLock:
+            offsets   = self.fOffsets
+            lineCount = len(offsets) - 1
+
+            if self.fFd < 0 or line < 0 or line >= lineCount:
+                return -1
+
+            if backwards:
+                end  = max(0, stop + 1)
+                last = line + 1
+
+                while last > end:
+                    first = max(end, min(last - 1, bisect_right(offsets, max(0, offsets[last] - self.SEARCH_WINDOW)) - 1))
+                    data  = self.readStrippedLines(first, last)
+
+                    if data is None:
+                        return -1
+
+                    for match in reversed(list(regex.finditer(data))):
+                        found = first + data.count(b"\n", 0, match.start())
+
+                        if kinds is None or self.fKinds[found] in kinds:
+                            return found
+
+                    last = first
+
+                return -1
+
+            end   = lineCount if stop < 0 else min(stop, lineCount)
+            first = line
+
+            while first < end:
+                last = min(end, max(first + 1, bisect_right(offsets, offsets[first] + self.SEARCH_WINDOW) - 1))
+                data = self.readStrippedLines(first, last)
+
+                if data is None:
+                    return -1
+
+                found = first
+                pos = prev = 0
+
+                while True:
+                    match = regex.search(data, pos)
+
+                    if match is None:
+                        break
+
+                    found += data.count(b"\n", prev, match.start())
+                    prev   = match.start()
+
+                    if kinds is None or self.fKinds[found] in kinds:
+                        return found
+
+                    # skip to the next line
+                    pos = data.find(b"\n", prev) + 1
+
+                    if pos == 0:
+                        break
+
+                first = last
+
+            return -1
+
+# ---------------------------------------------------------------------------------------------------------------------
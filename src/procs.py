@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+import os
+import select
+
+from signal import SIGKILL, SIGTERM
+from subprocess import getoutput
+from time import monotonic
+
+try:
+    from signal import pidfd_send_signal
+except ImportError:
+    pidfd_send_signal = None
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Process scanning, done in-process by reading /proc directly (no need to spawn `ps`)
+
+PROC_PATH = "/proc"
+
+def getProcIndex(uid=None):
+    if uid is None:
+        uid = os.getuid()
+
+    if not os.path.isdir(os.path.join(PROC_PATH, "self")):
+        return getProcIndexFallback(uid)
+
+    procIndex = {}
+
+    with os.scandir(PROC_PATH) as entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+
+            try:
+                if entry.stat().st_uid != uid:
+                    continue
+                with open(os.path.join(entry.path, "comm"), "rb") as fd:
+                    name = fd.read().rstrip(b"\n").decode("utf-8", errors="replace")
+            except OSError:
+                # process went away while scanning, or no permission
+                continue
+
+            procIndex.setdefault(name, []).append(int(entry.name))
+
+    return procIndex
+
+def getProcIndexFallback(uid):
+    procIndex = {}
+
+    for line in getoutput("ps -u %i -o pid= -o comm=" % uid).split("\n"):
+        pidAndName = line.split(None, 1)
+        if len(pidAndName) != 2 or not pidAndName[0].isdigit():
+            continue
+        procIndex.setdefault(pidAndName[1], []).append(int(pidAndName[0]))
+
+    return procIndex
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Parallel process termination
+#
+# All target PIDs are resolved once and signaled right away. We then wait on all of them at the same time through
+# pidfds (which become readable when the process exits), escalating to SIGKILL for any process that is still around
+# after its deadline. Total time is the time the slowest process takes to exit, there are no fixed sleeps.
+# Kernels or Python builds without pidfd support fall back to checking with kill(pid, 0) every 10ms.
+
+TERM_DEADLINE = 2.0
+KILL_DEADLINE = 1.0
+
+class TermProcess(object):
+    __slots__ = [
+        'name',
+        'pid',
+        'pidfd',
+        'deadline',
+        'killed',
+    ]
+
+def sendSignal(proc, sig):
+    if proc.pidfd is not None and pidfd_send_signal is not None:
+        pidfd_send_signal(proc.pidfd, sig)
+    else:
+        os.kill(proc.pid, sig)
+
+def isProcAlive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+# deadline can be a number (in seconds) or a dict of process name -> seconds.
+# Returns a list of (name, pid, result, seconds), result being "terminated", "killed", "gone" or "timeout".
+def terminateProcs(names, sig=SIGTERM, deadline=TERM_DEADLINE, uid=None):
+    startTime = monotonic()
+    procIndex = getProcIndex(uid)
+    ownPid    = os.getpid()
+    poller    = select.poll()
+    pending   = {}
+    report    = []
+
+    def finish(proc, result):
+        del pending[proc.pid]
+        if proc.pidfd is not None:
+            poller.unregister(proc.pidfd)
+            os.close(proc.pidfd)
+        report.append((proc.name, proc.pid, result, monotonic() - startTime))
+
+    for name in names:
+        for pid in procIndex.get(name, ()):
+            if pid == ownPid:
+                continue
+
+            proc = TermProcess()
+            proc.name   = name
+            proc.pid    = pid
+            proc.killed = bool(sig == SIGKILL)
+
+            try:
+                proc.pidfd = os.pidfd_open(pid)
+            except ProcessLookupError:
+                report.append((name, pid, "gone", 0.0))
+                continue
+            except (AttributeError, OSError):
+                proc.pidfd = None
+
+            if proc.killed:
+                proc.deadline = startTime + KILL_DEADLINE
+            elif isinstance(deadline, dict):
+                proc.deadline = startTime + deadline.get(name, TERM_DEADLINE)
+            else:
+                proc.deadline = startTime + deadline
+
+            pending[pid] = proc
+
+            if proc.pidfd is not None:
+                poller.register(proc.pidfd, select.POLLIN)
+
+            try:
+                sendSignal(proc, sig)
+            except ProcessLookupError:
+                finish(proc, "gone")
+            except PermissionError:
+                finish(proc, "timeout")
+
+    while pending:
+        now = monotonic()
+
+        for proc in list(pending.values()):
+            if proc.deadline > now:
+                continue
+            if proc.killed:
+                finish(proc, "timeout")
+                continue
+            proc.killed   = True
+            proc.deadline = now + KILL_DEADLINE
+            try:
+                sendSignal(proc, SIGKILL)
+            except ProcessLookupError:
+                finish(proc, "terminated")
+
+        if not pending:
+            break
+
+        pidfdToProc = dict((proc.pidfd, proc) for proc in pending.values() if proc.pidfd is not None)
+        timeout     = min(proc.deadline for proc in pending.values()) - now
+
+        if len(pidfdToProc) != len(pending):
+            timeout = min(timeout, 0.01)
+
+        for fd, event in poller.poll(max(0, int(timeout * 1000 + 0.5))):
+            proc = pidfdToProc.get(fd)
+            if proc is not None and proc.pid in pending:
+                finish(proc, "killed" if proc.killed else "terminated")
+
+        for proc in list(pending.values()):
+            if proc.pidfd is None and not isProcAlive(proc.pid):
+                finish(proc, "killed" if proc.killed else "terminated")
+
+    return report
+
+# ---------------------------------------------------------------------------------------------------------------------
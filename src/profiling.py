@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+import os
+import sys
+
+from threading import Lock
+from time import strftime
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Custom Stuff)
+
+from shared import getDataDir
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Profiling sessions, enabled with "--profile [DIR]"
+#
+# The main thread runs under cProfile for the whole session, and worker threads can add their own profile through
+# startThreadProfile()/stopThreadProfile(), which gets merged in on exit. Allocations from all threads are tracked
+# with tracemalloc. When the session stops, these files get written to DIR (default is the j2sc data dir + profiles):
+#  - NAME-TIMESTAMP.pstats, for use with pstats, snakeviz, etc
+#  - NAME-TIMESTAMP-profile.txt, top functions by cumulative and own time
+#  - NAME-TIMESTAMP-allocations.txt, memory peak and top allocation sites
+
+TRACEMALLOC_FRAMES = 25
+
+REPORT_FUNCTIONS   = 40
+REPORT_ALLOCATIONS = 30
+REPORT_TRACEBACKS  = 10
+
+def getProfileDir(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    if "--profile" not in argv:
+        return None
+
+    index = argv.index("--profile") + 1
+
+    if index < len(argv) and not argv[index].startswith("-"):
+        return argv[index]
+
+    return os.path.join(getDataDir(), "profiles")
+
+class ProfileSession(object):
+    def __init__(self, name, outDir):
+        import cProfile
+
+        self.fName    = name
+        self.fOutDir  = outDir
+        self.fLock    = Lock()
+        self.fMain    = cProfile.Profile()
+        self.fThreads = []
+
+    def start(self):
+        import tracemalloc
+
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        self.fMain.enable()
+
+    def addThreadProfile(self, profile):
+        with self.fLock:
+            self.fThreads.append(profile)
+
+    def stop(self):
+        import pstats
+        import tracemalloc
+
+        self.fMain.disable()
+
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        os.makedirs(self.fOutDir, exist_ok=True)
+        basePath = os.path.join(self.fOutDir, "%s-%s" % (self.fName, strftime("%Y%m%d-%H%M%S")))
+
+        # -------------------------------------------------------------
+        # CPU
+
+        stats = pstats.Stats(self.fMain)
+
+        with self.fLock:
+            for profile in self.fThreads:
+                stats.add(profile)
+
+        stats.dump_stats(basePath + ".pstats")
+
+        with open(basePath + "-profile.txt", "w") as fd:
+            stats.stream = fd
+            fd.write("# %s, main thread plus %i worker thread(s)\n\n" % (self.fName, len(self.fThreads)))
+            stats.sort_stats("cumulative").print_stats(REPORT_FUNCTIONS)
+            stats.sort_stats("tottime").print_stats(REPORT_FUNCTIONS)
+
+        # -------------------------------------------------------------
+        # Memory
+
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+        with open(basePath + "-allocations.txt", "w") as fd:
+            fd.write("# %s, traced memory: %.1f KiB current, %.1f KiB peak\n\n" % (self.fName, current / 1024.0, peak / 1024.0))
+
+            fd.write("# Top %i allocation sites\n\n" % REPORT_ALLOCATIONS)
+            for stat in snapshot.statistics("lineno")[:REPORT_ALLOCATIONS]:
+                fd.write("%s\n" % stat)
+
+            fd.write("\n# Top %i allocation tracebacks\n" % REPORT_TRACEBACKS)
+            for stat in snapshot.statistics("traceback")[:REPORT_TRACEBACKS]:
+                fd.write("\n%i blocks, %.1f KiB\n" % (stat.count, stat.size / 1024.0))
+                fd.write("\n".join(stat.traceback.format(most_recent_first=True)) + "\n")
+
+        print("Profile written to %s.pstats, %s-profile.txt and %s-allocations.txt" % (basePath, basePath, basePath))
+
+gProfileSession = None
+
+# Starts profiling if "--profile" was given, does nothing otherwise
+def startProfiling(name, argv=None):
+    global gProfileSession
+
+    outDir = getProfileDir(argv)
+
+    if outDir is None or gProfileSession is not None:
+        return
+
+    gProfileSession = ProfileSession(name, outDir)
+    gProfileSession.start()
+
+def stopProfiling():
+    global gProfileSession
+
+    if gProfileSession is None:
+        return
+
+    session = gProfileSession
+    gProfileSession = None
+
+    try:
+        session.stop()
+    except OSError as error:
+        print("stopProfiling() - Failed to write profile: %s" % error)
+
+# To be called at the start and end of a worker thread's run()
+def startThreadProfile():
+    if gProfileSession is None:
+        return None
+
+    import cProfile
+
+    profile = cProfile.Profile()
+
+    try:
+        profile.enable()
+    except ValueError:
+        # Python 3.12+ allows only one active profiler, which already covers all threads
+        return None
+
+    return profile
+
+def stopThreadProfile(profile):
+    if profile is None:
+        return
+
+    profile.disable()
+
+    if gProfileSession is not None:
+        gProfileSession.addThreadProfile(profile)
+
+# ---------------------------------------------------------------------------------------------------------------------
@@ -5,6 +5,8 @@
 # ------------------------------------------------------------------------------------------------------------
 # Imports (Global)
 
+import sys
+
 from subprocess import getoutput
 
 from PyQt6.QtCore import pyqtSlot, Qt, QSettings, QTimer
@@ -16,6 +18,13 @@ from PyQt6.QtWidgets import QDialog, QDialogButtonBox, QMessageBox
 
 import ui_settings
 
+from jackcontrol import (
+    JACK_TIMER_SYSTEM_CLOCK, JACK_TIMER_CYCLE_COUNTER, JACK_TIMER_HPET,
+    initBus, needsInit, isResetNeeded, getDriverList,
+    getParameterTree, getParameterValue, getParameterConstraint, setParameterValue, resetParameterValue,
+    commitParameters, engineHasFeature, getEngineParameter, driverHasFeature, invalidateParameterTree,
+)
+
 # ------------------------------------------------------------------------------------------------------------
 # Try Import DBus
 
@@ -25,129 +34,9 @@ except:
     dbus = None
 
 # ------------------------------------------------------------------------------------------------------------
-# Global object
-
-global gJackctl, gResetNeeded
-gJackctl     = None
-gResetNeeded = False
-
-# ------------------------------------------------------------------------------------------------------------
-# enum jack_timer_type_t
+# Set Debug mode
 
-JACK_TIMER_SYSTEM_CLOCK  = 0
-JACK_TIMER_CYCLE_COUNTER = 1
-JACK_TIMER_HPET          = 2
-
-# ------------------------------------------------------------------------------------------------------------
-# Init DBus
-
-def initBus(bus):
-    global gJackctl
-
-    if not bus:
-        gJackctl = None
-        return 1
-
-    try:
-        gJackctl = dbus.Interface(bus.get_object("org.jackaudio.service", "/org/jackaudio/Controller"), "org.jackaudio.Configure")
-        return 0
-    except:
-        gJackctl = None
-        return 1
-
-def needsInit():
-    global gJackctl
-    return bool(gJackctl is None)
-
-def setResetNeeded(yesNo):
-    global gResetNeeded
-    gResetNeeded = yesNo
-
-# ------------------------------------------------------------------------------------------------------------
-# Helper functions
-
-def getBufferSize():
-    return getDriverParameter("period", -1)
-
-def getSampleRate():
-    return getDriverParameter("rate", -1)
-
-def isRealtime():
-    return getEngineParameter("realtime", False)
-
-def setBufferSize(bsize):
-    return setDriverParameter("period", dbus.UInt32(bsize))
-
-def setSampleRate(srate):
-    return setDriverParameter("rate", dbus.UInt32(srate))
-
-# ------------------------------------------------------------------------------------------------------------
-# Helper functions (engine)
-
-def engineHasFeature(feature):
-    if gJackctl is None:
-        return False
-    try:
-        featureList = gJackctl.ReadContainer(["engine"])[1]
-    except:
-        featureList = ()
-    return bool(dbus.String(feature) in featureList)
-
-def getEngineParameter(parameter, fallback):
-    if gJackctl is None or not engineHasFeature(parameter):
-        return fallback
-    else:
-        try:
-            return gJackctl.GetParameterValue(["engine", parameter])[2]
-        except:
-            return fallback
-
-def setEngineParameter(parameter, value, optional=True):
-    if not engineHasFeature(parameter):
-        return False
-    elif optional:
-        paramValueTry = gJackctl.GetParameterValue(["engine", parameter])
-        if paramValueTry is None:
-            return False
-        paramValue = paramValueTry[2]
-        if value != paramValue:
-            return bool(gJackctl.SetParameterValue(["engine", parameter], value))
-        else:
-            return False
-    else:
-        return bool(gJackctl.SetParameterValue(["engine", parameter], value))
-
-# ------------------------------------------------------------------------------------------------------------
-# Helper functions (driver)
-
-def driverHasFeature(feature):
-    if gJackctl is None:
-        return False
-    try:
-        featureList = gJackctl.ReadContainer(["driver"])[1]
-    except:
-        featureList = ()
-    return bool(dbus.String(feature) in featureList)
-
-def getDriverParameter(parameter, fallback):
-    if gJackctl is None or not driverHasFeature(parameter):
-        return fallback
-    else:
-        try:
-            return gJackctl.GetParameterValue(["driver", parameter])[2]
-        except:
-            return fallback
-
-def setDriverParameter(parameter, value, optional=True):
-    if not driverHasFeature(parameter):
-        return False
-    elif optional:
-        if value != gJackctl.GetParameterValue(["driver", parameter])[2]:
-            return bool(gJackctl.SetParameterValue(["driver", parameter], value))
-        else:
-            return False
-    else:
-        return bool(gJackctl.SetParameterValue(["driver", parameter], value))
+DEBUG = bool("-d" in sys.argv or "-debug" in sys.argv or "--debug" in sys.argv)
 
 # ------------------------------------------------------------------------------------------------------------
 # JACK Settings Dialog
@@ -161,16 +50,18 @@ class JackSettingsW(QDialog):
         # -------------------------------------------------------------
         # Check if we've got valid control interface
 
-        global gJackctl
-
-        if gJackctl is None:
+        if needsInit():
             QTimer.singleShot(0, self.slot_closeWithError)
             return
 
+        # parameters may have been changed by someone else since the cache was filled (j2sc-ctl, other clients),
+        # start from fresh values so saving diffs against what this dialog shows
+        invalidateParameterTree()
+
         # -------------------------------------------------------------
         # Align driver text and hide non available ones
 
-        driverList = gJackctl.ReadContainer(["drivers"])[1]
+        driverList = getDriverList()
         fontMetris = QFontMetrics(self.ui.obj_server_driver.font())
         maxWidth   = 75
 
@@ -218,7 +109,7 @@ class JackSettingsW(QDialog):
         # -------------------------------------------------------------
         # Load selected JACK driver
 
-        self.fDriverName = str(gJackctl.GetParameterValue(["engine", "driver"])[2])
+        self.fDriverName = str(getEngineParameter("driver", ""))
         for i in range(self.ui.obj_server_driver.rowCount()):
             if self.ui.obj_server_driver.item(i, 0).text().lower() == self.fDriverName:
                 self.ui.obj_server_driver.setCurrentCell(i, 0)
@@ -252,33 +143,35 @@ class JackSettingsW(QDialog):
     # Server calls
 
     def saveServerSettings(self):
+        changes = []
+
         # always reset server name
         if engineHasFeature("name"):
-            setEngineParameter("name", "default", True)
+            changes.append(("name", dbus.String("default")))
 
         if self.ui.obj_server_realtime.isEnabled():
             value = dbus.Boolean(self.ui.obj_server_realtime.isChecked())
-            setEngineParameter("realtime", value, True)
+            changes.append(("realtime", value))
 
         if self.ui.obj_server_realtime_priority.isEnabled():
             value = dbus.Int32(self.ui.obj_server_realtime_priority.value())
-            setEngineParameter("realtime-priority", value, True)
+            changes.append(("realtime-priority", value))
 
         if self.ui.obj_server_temporary.isEnabled():
             value = dbus.Boolean(self.ui.obj_server_temporary.isChecked())
-            setEngineParameter("temporary", value, True)
+            changes.append(("temporary", value))
 
         if self.ui.obj_server_verbose.isEnabled():
             value = dbus.Boolean(self.ui.obj_server_verbose.isChecked())
-            setEngineParameter("verbose", value, True)
+            changes.append(("verbose", value))
 
         if self.ui.obj_server_alias.isEnabled():
             value = dbus.Boolean(self.ui.obj_server_alias.isChecked())
-            setEngineParameter("alias", value, True)
+            changes.append(("alias", value))
 
         if self.ui.obj_server_client_timeout.isEnabled():
             value = dbus.Int32(int(self.ui.obj_server_client_timeout.currentText()))
-            setEngineParameter("client-timeout", value, True)
+            changes.append(("client-timeout", value))
 
         if self.ui.obj_server_clock_source.isEnabled():
             if self.ui.obj_server_clock_source_system.isChecked():
@@ -301,19 +194,19 @@ class JackSettingsW(QDialog):
                 print("JackSettingsW::saveServerSettings() - Cannot save clock-source value")
 
             if value != None:
-                setEngineParameter("clock-source", value, True)
+                changes.append(("clock-source", value))
 
         if self.ui.obj_server_port_max.isEnabled():
             value = dbus.UInt32(int(self.ui.obj_server_port_max.currentText()))
-            setEngineParameter("port-max", value, True)
+            changes.append(("port-max", value))
 
         if self.ui.obj_server_replace_registry.isEnabled():
             value = dbus.Boolean(self.ui.obj_server_replace_registry.isChecked())
-            setEngineParameter("replace-registry", value, True)
+            changes.append(("replace-registry", value))
 
         if self.ui.obj_server_sync.isEnabled():
             value = dbus.Boolean(self.ui.obj_server_sync.isChecked())
-            setEngineParameter("sync", value, True)
+            changes.append(("sync", value))
 
         if self.ui.obj_server_self_connect_mode.isEnabled():
             if self.ui.obj_server_self_connect_mode_0.isChecked():
@@ -331,17 +224,14 @@ class JackSettingsW(QDialog):
                 print("JackSettingsW::saveServerSettings() - Cannot save self-connect-mode value")
 
             if value != None:
-                setEngineParameter("self-connect-mode", value, True)
-
-    def loadServerSettings(self, reset=False, forceReset=False):
-        global gJackctl
+                changes.append(("self-connect-mode", value))
 
-        settings = gJackctl.ReadContainer(["engine"])
+        return commitParameters("engine", changes)
 
-        for i in range(len(settings[1])):
-            attribute = str(settings[1][i])
+    def loadServerSettings(self, reset=False, forceReset=False):
+        for attribute in getParameterTree("engine").features:
             if reset:
-                valueTry = gJackctl.GetParameterValue(["engine", attribute])
+                valueTry = getParameterValue("engine", attribute)
 
                 if valueTry is None:
                     continue
@@ -349,9 +239,9 @@ class JackSettingsW(QDialog):
                     value = valueTry[1]
 
                 if forceReset and attribute != "driver":
-                    gJackctl.ResetParameterValue(["engine", attribute])
+                    resetParameterValue("engine", attribute)
             else:
-                valueTry = gJackctl.GetParameterValue(["engine", attribute])
+                valueTry = getParameterValue("engine", attribute)
 
                 if valueTry is None:
                     continue
@@ -427,18 +317,17 @@ class JackSettingsW(QDialog):
     # resetIfNeeded: fix alsa parameter re-order bug in JACK 1.9.8 (reset/remove non-used values)
 
     def saveDriverSettings(self, resetIfNeeded):
-        global gJackctl, gResetNeeded
-
-        if resetIfNeeded and not gResetNeeded:
+        if resetIfNeeded and not isResetNeeded():
             resetIfNeeded = False
 
+        changes = []
+
         if self.ui.obj_driver_device.isEnabled():
             value = dbus.String(self.ui.obj_driver_device.currentText().split(" [")[0])
-            if value != gJackctl.GetParameterValue(["driver", "device"])[2]:
-                gJackctl.SetParameterValue(["driver", "device"], value)
+            changes.append(("device", value))
 
         elif resetIfNeeded:
-            gJackctl.ResetParameterValue(["driver", "device"])
+            changes.append(("device", None))
 
         if self.ui.obj_driver_capture.isEnabled():
             if self.fDriverName == "alsa":
@@ -452,10 +341,10 @@ class JackSettingsW(QDialog):
                 print("JackSettingsW::saveDriverSettings() - Cannot save capture value")
 
             if value != None:
-                setDriverParameter("capture", value, True)
+                changes.append(("capture", value))
 
         elif resetIfNeeded:
-            gJackctl.ResetParameterValue(["driver", "capture"])
+            changes.append(("capture", None))
 
         if self.ui.obj_driver_playback.isEnabled():
             if self.fDriverName == "alsa":
@@ -469,46 +358,46 @@ class JackSettingsW(QDialog):
                 print("JackSettingsW::saveDriverSettings() - Cannot save playback value")
 
             if value != None:
-                setDriverParameter("playback", value, True)
+                changes.append(("playback", value))
 
         elif resetIfNeeded:
-            gJackctl.ResetParameterValue(["driver", "playback"])
+            changes.append(("playback", None))
 
         if self.ui.obj_driver_rate.isEnabled():
             value = dbus.UInt32(int(self.ui.obj_driver_rate.currentText()))
-            setDriverParameter("rate", value, True)
+            changes.append(("rate", value))
 
         if self.ui.obj_driver_period.isEnabled():
             value = dbus.UInt32(int(self.ui.obj_driver_period.currentText()))
-            setDriverParameter("period", value, True)
+            changes.append(("period", value))
 
         if self.ui.obj_driver_nperiods.isEnabled():
             value = dbus.UInt32(self.ui.obj_driver_nperiods.value())
-            setDriverParameter("nperiods", value, True)
+            changes.append(("nperiods", value))
 
         if self.ui.obj_driver_hwmon.isEnabled():
             value = dbus.Boolean(self.ui.obj_driver_hwmon.isChecked())
-            setDriverParameter("hwmon", value, True)
+            changes.append(("hwmon", value))
 
         if self.ui.obj_driver_hwmeter.isEnabled():
             value = dbus.Boolean(self.ui.obj_driver_hwmeter.isChecked())
-            setDriverParameter("hwmeter", value, True)
+            changes.append(("hwmeter", value))
 
         if self.ui.obj_driver_duplex.isEnabled():
             value = dbus.Boolean(self.ui.obj_driver_duplex.isChecked())
-            setDriverParameter("duplex", value, True)
+            changes.append(("duplex", value))
 
         if self.ui.obj_driver_hw_alias.isEnabled():
             value = dbus.Boolean(self.ui.obj_driver_hw_alias.isChecked())
-            setDriverParameter("hw-alias", value, True)
+            changes.append(("hw-alias", value))
 
         if self.ui.obj_driver_softmode.isEnabled():
             value = dbus.Boolean(self.ui.obj_driver_softmode.isChecked())
-            setDriverParameter("softmode", value, True)
+            changes.append(("softmode", value))
 
         if self.ui.obj_driver_monitor.isEnabled():
             value = dbus.Boolean(self.ui.obj_driver_monitor.isChecked())
-            setDriverParameter("monitor", value, True)
+            changes.append(("monitor", value))
 
         if self.ui.obj_driver_dither.isEnabled():
             if self.ui.obj_driver_dither.currentIndex() == 0:
@@ -524,27 +413,27 @@ class JackSettingsW(QDialog):
                 print("JackSettingsW::saveDriverSettings() - Cannot save dither value")
 
             if value != None:
-                setDriverParameter("dither", value, True)
+                changes.append(("dither", value))
 
         if self.ui.obj_driver_inchannels.isEnabled():
             value = dbus.UInt32(self.ui.obj_driver_inchannels.value())
-            setDriverParameter("inchannels", value, True)
+            changes.append(("inchannels", value))
 
         if self.ui.obj_driver_outchannels.isEnabled():
             value = dbus.UInt32(self.ui.obj_driver_outchannels.value())
-            setDriverParameter("outchannels", value, True)
+            changes.append(("outchannels", value))
 
         if self.ui.obj_driver_shorts.isEnabled():
             value = dbus.Boolean(self.ui.obj_driver_shorts.isChecked())
-            setDriverParameter("shorts", value, True)
+            changes.append(("shorts", value))
 
         if self.ui.obj_driver_input_latency.isEnabled():
             value = dbus.UInt32(self.ui.obj_driver_input_latency.value())
-            setDriverParameter("input-latency", value, True)
+            changes.append(("input-latency", value))
 
         if self.ui.obj_driver_output_latency.isEnabled():
             value = dbus.UInt32(self.ui.obj_driver_output_latency.value())
-            setDriverParameter("output-latency", value, True)
+            changes.append(("output-latency", value))
 
         if self.ui.obj_driver_midi_driver.isEnabled():
             if self.ui.obj_driver_midi_driver.currentIndex() == 0:
@@ -559,39 +448,41 @@ class JackSettingsW(QDialog):
 
             if value != None:
                 if driverHasFeature("midi"):
-                    setDriverParameter("midi", value, True)
+                    changes.append(("midi", value))
                 else:
-                    setDriverParameter("midi-driver", value, True)
+                    changes.append(("midi-driver", value))
 
         if self.ui.obj_driver_wait.isEnabled():
             value = dbus.UInt32(self.ui.obj_driver_wait.value())
-            setDriverParameter("wait", value, True)
+            changes.append(("wait", value))
 
         if self.ui.obj_driver_verbose.isEnabled():
             value = dbus.UInt32(self.ui.obj_driver_verbose.value())
-            setDriverParameter("verbose", value, True)
+            changes.append(("verbose", value))
 
         if self.ui.obj_driver_snoop.isEnabled():
             value = dbus.Boolean(self.ui.obj_driver_snoop.isChecked())
-            setDriverParameter("snoop", value, True)
+            changes.append(("snoop", value))
 
         if self.ui.obj_driver_channels.isEnabled():
             value = dbus.Int32(self.ui.obj_driver_channels.value())
-            setDriverParameter("channels", value, True)
+            changes.append(("channels", value))
+
+        return commitParameters("driver", changes)
 
     def loadDriverSettings(self, reset=False, forceReset=False):
-        global gJackctl
+        for attribute in getParameterTree("driver").features:
+            valueTry = getParameterValue("driver", attribute)
 
-        settings = gJackctl.ReadContainer(["driver"])
+            if valueTry is None:
+                continue
 
-        for i in range(len(settings[1])):
-            attribute = str(settings[1][i])
             if reset:
-                value = gJackctl.GetParameterValue(["driver", attribute])[1]
+                value = valueTry[1]
                 if forceReset:
-                    gJackctl.ResetParameterValue(["driver", attribute])
+                    resetParameterValue("driver", attribute)
             else:
-                value = gJackctl.GetParameterValue(["driver", attribute])[2]
+                value = valueTry[2]
 
             if attribute == "device":
                 self.setComboBoxValue(self.ui.obj_driver_device, str(value), True)
@@ -733,14 +624,12 @@ class JackSettingsW(QDialog):
 
     @pyqtSlot(int)
     def slot_checkDriverSelection(self, row):
-        global gJackctl
-
         # Save previous settings
         self.saveDriverSettings(False)
 
         # Set new Jack driver
         self.fDriverName = dbus.String(self.ui.obj_server_driver.item(row, 0).text().lower())
-        gJackctl.SetParameterValue(["engine", "driver"], self.fDriverName)
+        setParameterValue("engine", "driver", self.fDriverName)
 
         # Add device list
         self.ui.obj_driver_device.clear()
@@ -750,7 +639,7 @@ class JackSettingsW(QDialog):
                 for dev in dev_list:
                     self.ui.obj_driver_device.addItem(dev)
             else:
-                dev_list = gJackctl.GetParameterConstraint(["driver", "device"])[3]
+                dev_list = getParameterConstraint("driver", "device")[3]
                 for i in range(len(dev_list)):
                     self.ui.obj_driver_device.addItem(dev_list[i][0] + " [%s]" % str(dev_list[i][1]))
 
@@ -852,8 +741,13 @@ class JackSettingsW(QDialog):
 
     @pyqtSlot()
     def slot_saveJackSettings(self):
-        self.saveServerSettings()
-        self.saveDriverSettings(True)
+        changes  = self.saveServerSettings()
+        changes += self.saveDriverSettings(True)
+
+        if DEBUG:
+            for container, parameter, oldValue, newValue in changes:
+                print("JackSettingsW::slot_saveJackSettings() - %s '%s' changed from '%s' to '%s'" % (container, parameter, oldValue,
+                      "default" if newValue is None else newValue))
 
     @pyqtSlot()
     def slot_resetJackSettings(self):
@@ -886,10 +780,13 @@ class JackSettingsW(QDialog):
 
 if __name__ == '__main__':
     # Additional imports
-    import sys
     from PyQt6.QtWidgets import QApplication
+    from profiling import startProfiling, stopProfiling
     from shared import VERSION, setUpSignals
 
+    # Profile the whole session with --profile [DIR]
+    startProfiling("j2sc-settings")
+
     # App initialization
     app = QApplication(sys.argv)
     app.setApplicationName("J2SC-Settings")
@@ -915,4 +812,6 @@ if __name__ == '__main__':
     gui.show()
 
     # App-Loop
-    sys.exit(app.exec())
+    ret = app.exec()
+    stopProfiling()
+    sys.exit(ret)
@@ -5,23 +5,64 @@
 # ---------------------------------------------------------------------------------------------------------------------
 # Imports (Global)
 
-from signal import signal, SIGINT, SIGTERM
+import os
+import socket
 
-from PyQt6.QtWidgets import QApplication
+from signal import set_wakeup_fd, signal, SIGINT, SIGTERM
+
+# NOTE: Qt is only imported when needed, so that non-GUI tools can use this module too
 
 # ---------------------------------------------------------------------------------------------------------------------
 # Set Version
 
 VERSION = "0.0.1"
 
+# ---------------------------------------------------------------------------------------------------------------------
+# Local data directory, for history files and such
+
+def getDataDir():
+    dataDir = os.path.join(os.getenv("XDG_DATA_HOME") or os.path.expanduser("~/.local/share"), "j2sc")
+    os.makedirs(dataDir, exist_ok=True)
+    return dataDir
+
 # ---------------------------------------------------------------------------------------------------------------------
 # Signal handler
+#
+# Python signal handlers only run once the interpreter gets control back, which does not happen while Qt is idle in
+# its event loop. The C-level handler writes to a socket set with set_wakeup_fd(), a QSocketNotifier wakes up the Qt
+# event loop on it, and the Python handler runs right away. No polling timer needed.
+
+gSignalSockets  = None
+gSignalNotifier = None
 
 def setUpSignals():
+    from PyQt6.QtCore import QSocketNotifier
+
+    global gSignalSockets, gSignalNotifier
+
+    readSock, writeSock = socket.socketpair()
+    readSock.setblocking(False)
+    writeSock.setblocking(False)
+    gSignalSockets = (readSock, writeSock)
+
+    set_wakeup_fd(writeSock.fileno())
+
+    gSignalNotifier = QSocketNotifier(readSock.fileno(), QSocketNotifier.Type.Read)
+    gSignalNotifier.activated.connect(readSignalSocket)
+
     signal(SIGINT, signalHandler)
     signal(SIGTERM, signalHandler)
 
+def readSignalSocket():
+    # contents do not matter, getting back into Python is enough for the handlers to run
+    try:
+        while gSignalSockets[0].recv(64):
+            pass
+    except BlockingIOError:
+        pass
+
 def signalHandler(sig, frame):
+    from PyQt6.QtWidgets import QApplication
     QApplication.instance().quit()
 
 # ---------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+import os
+import sys
+import traceback
+
+from threading import Event, Lock, Thread, main_thread
+from time import monotonic
+
+from PyQt6.QtCore import QTimer
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Event-loop stall monitor
+#
+# A timer on the main thread beats every few ms, while a watchdog thread checks how long ago the last beat was.
+# Once the event loop has not serviced the timer for longer than the threshold, the watchdog samples the main thread's
+# Python stack (and keeps sampling once per threshold while the stall lasts). When the loop comes back, the stall is
+# attributed to the call site seen most in those samples, which is the innermost frame from j2sc's own sources.
+# Stalls spent inside C code that does not release the GIL cannot be sampled, those are reported as unknown.
+
+DEFAULT_THRESHOLD = 100 # ms
+
+HEARTBEAT_INTERVAL = 20 # ms
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+UNKNOWN_SITE = "(unknown, no stack sample)"
+
+class StallSite(object):
+    __slots__ = [
+        'count',
+        'totalTime',
+        'maxTime',
+        'stack',
+    ]
+
+    def __init__(self):
+        self.count     = 0
+        self.totalTime = 0.0
+        self.maxTime   = 0.0
+        self.stack     = []
+
+# innermost frame from our own sources, or the innermost frame if there is none
+def getCallSite(stack):
+    for frame in reversed(stack):
+        filename = os.path.abspath(frame.filename)
+        if os.path.dirname(filename) == SOURCE_DIR and os.path.basename(filename) != "stallmon.py":
+            break
+    else:
+        frame = stack[-1]
+
+    return "%s:%i %s()" % (os.path.basename(frame.filename), frame.lineno, frame.name)
+
+class StallMonitor(object):
+    def __init__(self, parent, threshold=DEFAULT_THRESHOLD):
+        self.fThreshold = threshold / 1000.0
+        self.fMainIdent = main_thread().ident
+        self.fLock      = Lock()
+        self.fLastBeat  = monotonic()
+        self.fSamples   = []
+        self.fSites     = {}
+        self.fStalls    = 0
+
+        self.fTimer = QTimer(parent)
+        self.fTimer.setInterval(HEARTBEAT_INTERVAL)
+        self.fTimer.timeout.connect(self.beat)
+
+        self.fStop   = Event()
+        self.fThread = Thread(target=self.run, name="j2sc-stallmon", daemon=True)
+
+    def start(self):
+        self.fLastBeat = monotonic()
+        self.fTimer.start()
+        self.fThread.start()
+
+    def stop(self):
+        self.fTimer.stop()
+        self.fStop.set()
+
+        if self.fThread.is_alive():
+            self.fThread.join(1.0)
+
+    # -----------------------------------------------------------------
+    # Main thread side
+
+    def beat(self):
+        now = monotonic()
+
+        with self.fLock:
+            gap = now - self.fLastBeat
+            samples = self.fSamples
+            self.fLastBeat = now
+            self.fSamples  = []
+
+        if gap >= self.fThreshold:
+            self.recordStall(gap, samples)
+
+    def recordStall(self, duration, samples):
+        siteCounts = {}
+
+        for stack in samples:
+            site = getCallSite(stack)
+            siteCounts[site] = siteCounts.get(site, 0) + 1
+
+        if siteCounts:
+            site  = max(siteCounts, key=siteCounts.get)
+            stack = [s for s in samples if getCallSite(s) == site][-1]
+        else:
+            site  = UNKNOWN_SITE
+            stack = []
+
+        entry = self.fSites.get(site)
+
+        if entry is None:
+            entry = self.fSites[site] = StallSite()
+
+        entry.count     += 1
+        entry.totalTime += duration
+        entry.maxTime    = max(entry.maxTime, duration)
+
+        if stack:
+            entry.stack = traceback.format_list(stack)
+
+        self.fStalls += 1
+
+        print("StallMonitor - event loop stalled for %i ms at %s" % (duration * 1000, site))
+
+    # -----------------------------------------------------------------
+    # Watchdog thread side
+
+    def run(self):
+        while not self.fStop.wait(self.fThreshold / 4):
+            with self.fLock:
+                lastBeat = self.fLastBeat
+                sampleCount = len(self.fSamples)
+
+            # sample when crossing the threshold, then once more per threshold while still stalled
+            if monotonic() - lastBeat < self.fThreshold * (sampleCount + 1):
+                continue
+
+            frame = sys._current_frames().get(self.fMainIdent)
+
+            if frame is None:
+                continue
+
+            stack = traceback.extract_stack(frame)
+            del frame
+
+            with self.fLock:
+                # only keep it if the main thread is still in the same stall
+                if self.fLastBeat == lastBeat:
+                    self.fSamples.append(stack)
+
+    # -----------------------------------------------------------------
+    # Report
+
+    # call sites ranked by total stall time
+    def getReport(self, limit=10, withStacks=True):
+        if not self.fSites:
+            return "No event loop stalls above %i ms" % (self.fThreshold * 1000)
+
+        lines = ["%i event loop stalls above %i ms, worst call sites:" % (self.fStalls, self.fThreshold * 1000)]
+        sites = sorted(self.fSites.items(), key=lambda item: item[1].totalTime, reverse=True)
+
+        for site, entry in sites[:limit]:
+            lines.append("%8i ms total, %4i stalls, %6i ms max - %s" % (entry.totalTime * 1000, entry.count, entry.maxTime * 1000, site))
+
+            if withStacks and entry.stack:
+                lines += ["        " + line.rstrip("\n").replace("\n", "\n        ") for line in entry.stack[-8:]]
+
+        return "\n".join(lines)
+
+# ---------------------------------------------------------------------------------------------------------------------
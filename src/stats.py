@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+from array import array
+from threading import Event
+from time import monotonic
+
+from PyQt6.QtCore import pyqtSignal, QThread
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Custom Stuff)
+
+from jackcontrol import getStoppedStats, readJackStats
+from profiling import startThreadProfile, stopThreadProfile
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Try Import DBus
+
+try:
+    import dbus
+    import dbus.bus
+    import dbus.mainloop
+except:
+    dbus = None
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Fixed-size history of stats samples
+#
+# Backed by preallocated arrays used as a ring buffer, so memory use stays the same no matter how long JACK runs.
+
+class JackStatsHistory(object):
+    def __init__(self, size=3600):
+        self.fSize        = size
+        self.fTimes       = array('d', [0.0]) * size
+        self.fLoads       = array('f', [0.0]) * size
+        self.fXruns       = array('L', [0]) * size
+        self.fBufferSizes = array('L', [0]) * size
+        self.fWritePos    = 0
+        self.fCount       = 0
+
+    def __len__(self):
+        return self.fCount
+
+    def clear(self):
+        self.fWritePos = 0
+        self.fCount    = 0
+
+    def append(self, stats):
+        pos = self.fWritePos
+        self.fTimes[pos]       = stats.time
+        self.fLoads[pos]       = stats.dspLoad
+        self.fXruns[pos]       = stats.xruns
+        self.fBufferSizes[pos] = stats.bufferSize
+
+        self.fWritePos = (pos + 1) % self.fSize
+
+        if self.fCount < self.fSize:
+            self.fCount += 1
+
+    # index 0 is the oldest sample, -1 the newest one
+    # returns (time, dspLoad, xruns, bufferSize)
+    def getSample(self, index):
+        if index < 0:
+            index += self.fCount
+        if index < 0 or index >= self.fCount:
+            raise IndexError("sample index out of range")
+
+        pos = (self.fWritePos - self.fCount + index) % self.fSize
+        return (self.fTimes[pos], self.fLoads[pos], self.fXruns[pos], self.fBufferSizes[pos])
+
+    # newest `count` samples, oldest first
+    def getLastSamples(self, count):
+        count = min(count, self.fCount)
+        return [self.getSample(i) for i in range(self.fCount - count, self.fCount)]
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Stats sampler thread
+#
+# Uses its own private DBus connection without main loop integration, so blocking calls never touch the GUI thread.
+# Each pass publishes one snapshot through a (queued) signal.
+# Sampling runs fast while values are changing and backs off to a slow rate while idle or stable.
+
+class JackStatsSampler(QThread):
+    MIN_INTERVAL    = 0.25 # seconds
+    MAX_INTERVAL    = 2.0
+    HIDDEN_INTERVAL = 30.0
+    FULL_INTERVAL   = 2.0
+    LOAD_THRESHOLD  = 1.0  # DSP load percentage
+
+    statsChanged = pyqtSignal(object)
+
+    def __init__(self, parent):
+        QThread.__init__(self, parent)
+
+        self.fCloseNow = False
+        self.fHidden   = False
+        self.fWakeUp   = Event()
+        self.fInterval = self.MIN_INTERVAL
+        self.fLastFull = 0.0
+        self.fStats    = None
+
+    def getStats(self):
+        return self.fStats
+
+    def closeNow(self):
+        self.fCloseNow = True
+        self.fWakeUp.set()
+
+    # Sample at a very low rate while nobody is looking, and resync right away when visible again
+    def setHidden(self, hidden):
+        if self.fHidden == hidden:
+            return
+
+        self.fHidden = hidden
+
+        if not hidden:
+            self.requestUpdate()
+
+    def requestUpdate(self):
+        self.fInterval = self.MIN_INTERVAL
+        self.fLastFull = 0.0
+        self.fWakeUp.set()
+
+    def statsDiffer(self, old, new):
+        if old is None:
+            return True
+        if old.started != new.started or old.xruns != new.xruns or old.bufferSize != new.bufferSize:
+            return True
+        return bool(abs(old.dspLoad - new.dspLoad) >= self.LOAD_THRESHOLD)
+
+    def connectToJack(self, bus):
+        # do not trigger DBus activation, only sample an already running jackdbus
+        if not bus.name_has_owner("org.jackaudio.service"):
+            return None
+
+        return dbus.Interface(bus.get_object("org.jackaudio.service", "/org/jackaudio/Controller", introspect=False),
+                              "org.jackaudio.JackControl")
+
+    def run(self):
+        if dbus is None:
+            return
+
+        bus  = dbus.bus.BusConnection(dbus.bus.BUS_SESSION, mainloop=dbus.mainloop.NULL_MAIN_LOOP)
+        jack = None
+
+        profile = startThreadProfile()
+
+        while not self.fCloseNow:
+            self.fWakeUp.clear()
+
+            try:
+                if jack is None:
+                    jack = self.connectToJack(bus)
+
+                if jack is None:
+                    stats = getStoppedStats()
+                else:
+                    now   = monotonic()
+                    full  = bool(now - self.fLastFull >= self.FULL_INTERVAL)
+                    stats = readJackStats(jack, self.fStats, full)
+
+                    if full:
+                        self.fLastFull = now
+
+            except dbus.DBusException:
+                # jackdbus went away, reconnect on next pass
+                jack  = None
+                stats = getStoppedStats()
+
+            if not stats.started:
+                self.fInterval = self.MAX_INTERVAL
+            elif self.statsDiffer(self.fStats, stats):
+                self.fInterval = self.MIN_INTERVAL
+            else:
+                self.fInterval = min(self.fInterval * 2, self.MAX_INTERVAL)
+
+            self.fStats = stats
+            self.statsChanged.emit(stats)
+
+            if not self.fCloseNow:
+                self.fWakeUp.wait(self.HIDDEN_INTERVAL if self.fHidden else self.fInterval)
+
+        stopThreadProfile(profile)
+        bus.close()
+
+# ---------------------------------------------------------------------------------------------------------------------
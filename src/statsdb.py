@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+import os
+import sqlite3
+
+from array import array
+from math import ceil
+from time import monotonic, time
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Custom Stuff)
+
+from shared import getDataDir
+
+# ---------------------------------------------------------------------------------------------------------------------
+# On-disk JACK stats store
+#
+# Raw samples are kept as-is, and also rolled up into 1 second, 1 minute and 1 hour buckets with min/mean/max/p99
+# DSP load plus xrun counts. Every table is capped to a maximum number of rows, so total size stays bounded
+# (roughly 2 days of raw samples and 1s buckets, 1 month of 1min buckets and 1 year of 1h buckets).
+# Writes are batched and committed every few seconds. A bucket that already has a row (a partial one written when an
+# earlier session closed) gets merged into it: counts are added, min/max combined and means weighted by sample count.
+# p99 can't be merged exactly, the highest of both is kept.
+#
+# Rows returned by query() are (time, samples, loadMin, loadMean, loadMax, loadP99, xruns, newXruns, bufferSize).
+# For raw samples min/mean/max/p99 are all the same value and newXruns is None.
+
+RESOLUTION_RAW = 0
+
+RESOLUTIONS = (1, 60, 3600)
+
+MAX_ROWS = {
+    RESOLUTION_RAW: 345600,
+    1: 172800,
+    60: 44640,
+    3600: 8784,
+}
+
+def getDefaultStorePath():
+    return os.path.join(getDataDir(), "stats.sqlite")
+
+class RollupBucket(object):
+    __slots__ = [
+        'start',
+        'loads',
+        'xruns',
+        'newXruns',
+        'bufferSize',
+    ]
+
+    def __init__(self, start):
+        self.start      = start
+        self.loads      = array('f')
+        self.xruns      = 0
+        self.newXruns   = 0
+        self.bufferSize = 0
+
+    def toRow(self, resolution):
+        loads = sorted(self.loads)
+        count = len(loads)
+        p99   = loads[max(0, int(ceil(count * 0.99)) - 1)]
+        return (resolution, self.start, count, loads[0], sum(loads) / count, loads[-1], p99,
+                self.xruns, self.newXruns, self.bufferSize)
+
+class JackStatsStore(object):
+    COMMIT_INTERVAL = 10.0 # seconds
+    MAX_POINTS      = 2000 # for automatic resolution in query()
+
+    def __init__(self, path=None, readOnly=False):
+        if path is None:
+            path = getDefaultStorePath()
+
+        if readOnly:
+            self.fConn = sqlite3.connect("file:%s?mode=ro" % path, uri=True)
+        else:
+            self.fConn = sqlite3.connect(path)
+            self.fConn.execute("PRAGMA journal_mode=WAL")
+            self.fConn.execute("PRAGMA synchronous=NORMAL")
+            self.fConn.execute("CREATE TABLE IF NOT EXISTS raw (time REAL, load REAL, xruns INTEGER, buffer_size INTEGER)")
+            self.fConn.execute("CREATE INDEX IF NOT EXISTS raw_time ON raw (time)")
+            self.fConn.execute("CREATE TABLE IF NOT EXISTS rollups (resolution INTEGER, start INTEGER, samples INTEGER, "
+                               "load_min REAL, load_mean REAL, load_max REAL, load_p99 REAL, "
+                               "xruns INTEGER, new_xruns INTEGER, buffer_size INTEGER, "
+                               "PRIMARY KEY (resolution, start))")
+            self.fConn.commit()
+
+        self.fBuckets        = {}
+        self.fPendingRaw     = []
+        self.fPendingRollups = []
+        self.fLastXruns      = None
+        self.fLastCommit     = monotonic()
+
+    # -----------------------------------------------------------------
+    # Writing
+
+    def append(self, stats):
+        if self.fLastXruns is None:
+            newXruns = 0
+        elif stats.xruns >= self.fLastXruns:
+            newXruns = stats.xruns - self.fLastXruns
+        else:
+            # xruns were reset, or server restarted
+            newXruns = stats.xruns
+
+        self.fLastXruns = stats.xruns
+        self.fPendingRaw.append((stats.time, stats.dspLoad, stats.xruns, stats.bufferSize))
+
+        for resolution in RESOLUTIONS:
+            start  = int(stats.time // resolution) * resolution
+            bucket = self.fBuckets.get(resolution)
+
+            if bucket is not None and bucket.start != start:
+                self.fPendingRollups.append(bucket.toRow(resolution))
+                bucket = None
+
+            if bucket is None:
+                bucket = RollupBucket(start)
+                self.fBuckets[resolution] = bucket
+
+            bucket.loads.append(stats.dspLoad)
+            bucket.xruns       = stats.xruns
+            bucket.newXruns   += newXruns
+            bucket.bufferSize  = stats.bufferSize
+
+        if monotonic() - self.fLastCommit >= self.COMMIT_INTERVAL:
+            self.commit()
+
+    def commit(self, flushBuckets=False):
+        if flushBuckets:
+            for resolution, bucket in self.fBuckets.items():
+                self.fPendingRollups.append(bucket.toRow(resolution))
+
+        if self.fPendingRaw:
+            self.fConn.executemany("INSERT INTO raw VALUES (?, ?, ?, ?)", self.fPendingRaw)
+            self.fPendingRaw = []
+
+        if self.fPendingRollups:
+            self.fConn.executemany("INSERT INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                                   "ON CONFLICT (resolution, start) DO UPDATE SET "
+                                   "samples = samples + excluded.samples, "
+                                   "load_min = MIN(load_min, excluded.load_min), "
+                                   "load_mean = (load_mean * samples + excluded.load_mean * excluded.samples) / (samples + excluded.samples), "
+                                   "load_max = MAX(load_max, excluded.load_max), "
+                                   "load_p99 = MAX(load_p99, excluded.load_p99), "
+                                   "xruns = excluded.xruns, "
+                                   "new_xruns = new_xruns + excluded.new_xruns, "
+                                   "buffer_size = excluded.buffer_size", self.fPendingRollups)
+            self.fPendingRollups = []
+
+        self.prune()
+        self.fConn.commit()
+        self.fLastCommit = monotonic()
+
+    def prune(self):
+        self.fConn.execute("DELETE FROM raw WHERE rowid <= (SELECT MAX(rowid) FROM raw) - ?", (MAX_ROWS[RESOLUTION_RAW],))
+
+        for resolution in RESOLUTIONS:
+            self.fConn.execute("DELETE FROM rollups WHERE resolution = ? AND start <= "
+                               "(SELECT start FROM rollups WHERE resolution = ? ORDER BY start DESC LIMIT 1 OFFSET ?)",
+                               (resolution, resolution, MAX_ROWS[resolution]))
+
+    def close(self):
+        if self.fConn is None:
+            return
+
+        if self.fBuckets or self.fPendingRaw:
+            self.commit(True)
+
+        self.fConn.close()
+        self.fConn = None
+
+    # -----------------------------------------------------------------
+    # Reading
+
+    # Returns (resolution, rows) for the given time range.
+    # Without a resolution, picks the finest one that fits in MAX_POINTS and still has data for the range.
+    # If none reaches back to startTime, the finest one with any data is used.
+    def query(self, startTime, endTime=None, resolution=None):
+        if endTime is None:
+            endTime = time()
+
+        if resolution is not None:
+            return (resolution, self.queryResolution(startTime, endTime, resolution))
+
+        span = max(endTime - startTime, 0.0)
+        best = None
+
+        for resolution in (RESOLUTION_RAW,) + RESOLUTIONS:
+            # raw samples come at most 4 times per second
+            if span / (resolution or 0.25) > self.MAX_POINTS and resolution != RESOLUTIONS[-1]:
+                continue
+
+            rows = self.queryResolution(startTime, endTime, resolution)
+
+            if not rows:
+                continue
+
+            if rows[0][0] <= startTime + max(resolution, 1):
+                return (resolution, rows)
+
+            if best is None:
+                best = (resolution, rows)
+
+        if best is None:
+            return (RESOLUTIONS[-1], [])
+
+        return best
+
+    def queryResolution(self, startTime, endTime, resolution):
+        if resolution == RESOLUTION_RAW:
+            return self.fConn.execute("SELECT time, 1, load, load, load, load, xruns, NULL, buffer_size FROM raw "
+                                      "WHERE time >= ? AND time <= ? ORDER BY time", (startTime, endTime)).fetchall()
+
+        return self.fConn.execute("SELECT start, samples, load_min, load_mean, load_max, load_p99, xruns, new_xruns, buffer_size "
+                                  "FROM rollups WHERE resolution = ? AND start >= ? AND start <= ? ORDER BY start",
+                                  (resolution, int(startTime // resolution) * resolution, endTime)).fetchall()
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Allow to use this as a standalone tool
+
+if __name__ == '__main__':
+    # Additional imports
+    import argparse
+    import sys
+    from time import localtime, strftime
+
+    parser = argparse.ArgumentParser(description="Show stored JACK stats")
+    parser.add_argument("-s", "--since", type=float, default=1.0, help="hours to look back (default: 1)")
+    parser.add_argument("-r", "--resolution", type=int, choices=(RESOLUTION_RAW,) + RESOLUTIONS,
+                        help="seconds per row, 0 for raw samples (default: automatic)")
+    parser.add_argument("--db", help="database file (default: %s)" % getDefaultStorePath())
+    args = parser.parse_args()
+
+    path = args.db or getDefaultStorePath()
+
+    try:
+        store = JackStatsStore(path, readOnly=True)
+        resolution, rows = store.query(time() - args.since * 3600, resolution=args.resolution)
+    except sqlite3.Error as error:
+        print("%s: cannot read stats from '%s': %s" % (sys.argv[0], path, error), file=sys.stderr)
+        sys.exit(1)
+
+    print("# resolution: %s" % ("raw" if resolution == RESOLUTION_RAW else "%is" % resolution))
+    print("# %-17s %8s %7s %7s %7s %7s %8s %6s %6s" % ("time", "samples", "min", "mean", "max", "p99", "xruns", "new", "bsize"))
+
+    for row in rows:
+        print("%-19s %8i %6.2f%% %6.2f%% %6.2f%% %6.2f%% %8i %6s %6i" % ((strftime("%Y-%m-%d %H:%M:%S", localtime(row[0])),) +
+              row[1:7] + ("-" if row[7] is None else str(row[7]), row[8])))
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+from time import localtime, strftime
+
+from PyQt6.QtCore import pyqtSlot, Qt, QTimer
+from PyQt6.QtWidgets import QDialog, QFileDialog, QTreeWidgetItem
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Custom Stuff)
+
+import ui_dbustrace
+
+from dbustrace import HISTOGRAM_BOUNDS
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Sorts numeric columns by value instead of text
+
+class NumericTreeWidgetItem(QTreeWidgetItem):
+    def __lt__(self, other):
+        column = self.treeWidget().sortColumn()
+
+        try:
+            return float(self.text(column)) < float(other.text(column))
+        except ValueError:
+            return self.text(column) < other.text(column)
+
+def formatHistogram(histogram):
+    labels = ["<%gms" % bound for bound in HISTOGRAM_BOUNDS] + [">%gms" % HISTOGRAM_BOUNDS[-1]]
+    return " ".join("%s:%i" % (labels[i], count) for i, count in enumerate(histogram) if count)
+
+# ---------------------------------------------------------------------------------------------------------------------
+# DBus trace panel, available in debug mode or when tracing to a file with --dbus-trace
+
+class DBusTraceW(QDialog):
+    REFRESH_INTERVAL = 1000 # ms
+
+    def __init__(self, parent, tracer):
+        QDialog.__init__(self, parent)
+        self.ui = ui_dbustrace.Ui_DBusTraceW()
+        self.ui.setupUi(self)
+
+        self.fTracer = tracer
+
+        self.fTimer = QTimer(self)
+        self.fTimer.setInterval(self.REFRESH_INTERVAL)
+        self.fTimer.timeout.connect(self.slot_refresh)
+
+        self.ui.tree_methods.sortByColumn(4, Qt.SortOrder.DescendingOrder)
+        self.ui.tree_origins.sortByColumn(4, Qt.SortOrder.DescendingOrder)
+        self.ui.tree_recent.sortByColumn(0, Qt.SortOrder.DescendingOrder)
+
+        self.ui.b_reset.clicked.connect(self.slot_reset)
+        self.ui.b_save.clicked.connect(self.slot_save)
+
+    def fillStats(self, tree, stats):
+        tree.setSortingEnabled(False)
+        tree.clear()
+
+        for name, entry in stats.items():
+            tree.addTopLevelItem(NumericTreeWidgetItem([
+                name,
+                str(entry["count"]),
+                str(entry["blocking"]),
+                str(entry["errors"]),
+                "%.2f" % entry["totalMs"],
+                "%.2f" % entry["blockingMs"],
+                "%.3f" % (entry["totalMs"] / entry["count"]),
+                "%.3f" % entry["maxMs"],
+                formatHistogram(entry["histogram"]),
+            ]))
+
+        tree.setSortingEnabled(True)
+
+    @pyqtSlot()
+    def slot_refresh(self):
+        methods, origins, recent = self.fTracer.getSnapshot()
+
+        self.fillStats(self.ui.tree_methods, methods)
+        self.fillStats(self.ui.tree_origins, origins)
+
+        tree = self.ui.tree_recent
+        tree.setSortingEnabled(False)
+        tree.clear()
+
+        for when, method, args, durationMs, blocking, caller, origin, error in recent:
+            tree.addTopLevelItem(NumericTreeWidgetItem([
+                strftime("%H:%M:%S", localtime(when)) + ("%.3f" % (when % 1))[1:],
+                method + (" (error)" if error else ""),
+                args,
+                "%.3f" % durationMs,
+                "yes" if blocking else "no",
+                caller,
+                origin,
+            ]))
+
+        tree.setSortingEnabled(True)
+
+        calls    = sum(entry["count"] for entry in methods.values())
+        blocking = sum(entry["blockingMs"] for entry in methods.values())
+        self.ui.label_summary.setText(self.tr("%i calls, %.1f ms blocking the main thread") % (calls, blocking))
+
+    @pyqtSlot()
+    def slot_reset(self):
+        self.fTracer.reset()
+        self.slot_refresh()
+
+    @pyqtSlot()
+    def slot_save(self):
+        path, ignored = QFileDialog.getSaveFileName(self, self.tr("Save DBus Trace"), "j2sc-dbus-trace.json", self.tr("JSON files (*.json)"))
+
+        if path:
+            self.fTracer.dump(path)
+
+    def showEvent(self, event):
+        self.slot_refresh()
+        self.fTimer.start()
+        QDialog.showEvent(self, event)
+
+    def hideEvent(self, event):
+        self.fTimer.stop()
+        QDialog.hideEvent(self, event)
+
+# ---------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2010-2025 Filipe Coelho <falktx@falktx.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+import os
+import sys
+import unittest
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Imports (Custom Stuff)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import ctl
+import jackcontrol
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Stand-in for the org.jackaudio.Configure interface
+#
+# Set and reset reply with nothing, same as jackdbus.
+
+class FakeJackctl(object):
+    def __init__(self):
+        self.fValues = {
+            "engine": { "realtime": [False, True, True] },
+            "driver": { "period": [False, 1024, 1024] },
+        }
+        self.fTypes = { "realtime": 'b', "period": 'u' }
+
+    def ReadContainer(self, path):
+        return (True, list(self.fValues[path[0]]))
+
+    def GetParameterInfo(self, path):
+        return (ord(self.fTypes[path[1]]), path[1], "", "")
+
+    def GetParameterValue(self, path):
+        return tuple(self.fValues[path[0]][path[1]])
+
+    def SetParameterValue(self, path, value):
+        entry = self.fValues[path[0]][path[1]]
+        entry[0] = True
+        entry[2] = value
+
+    def ResetParameterValue(self, path):
+        entry = self.fValues[path[0]][path[1]]
+        entry[0] = False
+        entry[2] = entry[1]
+
+# ---------------------------------------------------------------------------------------------------------------------
+
+class CtlTestCase(unittest.TestCase):
+    def setUp(self):
+        self.fJackctl = FakeJackctl()
+        jackcontrol.gJackctl = self.fJackctl
+        jackcontrol.invalidateParameterTree()
+
+    def tearDown(self):
+        jackcontrol.gJackctl = None
+        jackcontrol.invalidateParameterTree()
+
+    def runCommand(self, argv):
+        args = ctl.getArgParser().parse_args(argv)
+        return args.func(None, args)
+
+    @unittest.skipIf(ctl.dbus is None, "needs dbus-python for the parameter types")
+    def test_set(self):
+        self.assertEqual(self.runCommand(["set", "driver", "period", "256"]), ctl.EXIT_OK)
+        self.assertEqual(self.fJackctl.fValues["driver"]["period"], [True, 1024, 256])
+
+    def test_reset(self):
+        self.fJackctl.fValues["engine"]["realtime"] = [True, True, False]
+
+        self.assertEqual(self.runCommand(["reset", "engine", "realtime"]), ctl.EXIT_OK)
+        self.assertEqual(self.fJackctl.fValues["engine"]["realtime"], [False, True, True])
+
+    def test_reset_unknown(self):
+        self.assertEqual(self.runCommand(["reset", "engine", "nope"]), ctl.EXIT_ERROR)
+
+if __name__ == '__main__':
+    unittest.main()
+
+# ---------------------------------------------------------------------------------------------------------------------